@@ -2,6 +2,6 @@
 AWJ AI Optimization App
 Aplikace pro AI optimalizaci procesů AWJ
 
-STATUS: Připraveno k implementaci
+STATUS: Inverzní surrogate model doporučených parametrů (ml_models.py)
 POZNÁMKA: Základní optimalizace již funguje v calculations/services.py
 """
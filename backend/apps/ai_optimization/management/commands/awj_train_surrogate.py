@@ -0,0 +1,57 @@
+"""
+Management command: trénink inverzního surrogate modelu
+
+Příklady:
+    python manage.py awj_train_surrogate
+    python manage.py awj_train_surrogate --thickness-points 60 --estimators 300
+    python manage.py awj_train_surrogate --output-dir /srv/awj/models
+"""
+
+from django.core.management.base import BaseCommand
+
+from backend.apps.ai_optimization.ml_models import reset_surrogate, surrogate_config, train_surrogate
+
+
+class Command(BaseCommand):
+    help = 'Natrénuje surrogate model doporučených parametrů a uloží ho jako novou verzi'
+
+    def add_arguments(self, parser):
+        config = surrogate_config()
+        parser.add_argument(
+            '--thickness-points', type=int, default=config['THICKNESS_POINTS'],
+            help='Počet tlouštěk (log-grid 0.1-500 mm) na materiál'
+        )
+        parser.add_argument(
+            '--min-speed', type=float, default=config['MIN_SPEED'],
+            help='Minimální rychlost [mm/min] pro cíl min_cost'
+        )
+        parser.add_argument('--estimators', type=int, default=config['ESTIMATORS'], help='Počet stromů')
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument(
+            '--output-dir', default=config['MODEL_DIR'],
+            help='Adresář artefaktů (výchozí AWJ_CALCULATOR["SURROGATE"]["MODEL_DIR"])'
+        )
+
+    def handle(self, *args, **options):
+        def progress(done, total):
+            if done % 100 == 0 or done == total:
+                self.stdout.write(f"  optimalizace {done}/{total}")
+
+        surrogate = train_surrogate(
+            thickness_points=options['thickness_points'],
+            min_speed=options['min_speed'],
+            estimators=options['estimators'],
+            seed=options['seed'],
+            progress=progress,
+        )
+        path = surrogate.save(options['output_dir'])
+        reset_surrogate()
+
+        for target, metrics in surrogate.metadata['metrics'].items():
+            self.stdout.write(
+                f"{target}: {metrics['samples']} bodů, ztráta průměr {metrics['mean_regret']:.2%} "
+                f"/ max {metrics['max_regret']:.2%}, MAE {metrics['mae']}"
+            )
+        self.stdout.write(self.style.SUCCESS(
+            f"Model v{surrogate.version} uložen do {path} ({surrogate.metadata['training_time']} s)"
+        ))
@@ -0,0 +1,482 @@
+"""
+AWJ AI Optimization - Inverse Surrogate
+Inverzní surrogate model: materiál + tloušťka + cíl → doporučené parametry
+
+AWJOptimizationService hledá parametry gridem a lokálním zpřesněním
+(desítky ms na dotaz). Surrogate se natrénuje offline (CPU, scikit-learn)
+na výsledcích optimalizátoru pro vestavěné materiály a materiály z tabulky
+Material a vrací parametry přímo:
+
+- vstupy jsou bezrozměrné příznaky materiálu a tloušťky (logaritmy - modely
+  v services.py jsou mocninné zákony), pro každý cíl jeden ExtraTreesRegressor
+  s více výstupy (tlak, abrazivo, tryska, fokus),
+- při prvním dotazu na (cíl, materiál) se model vyhodnotí jedním voláním na
+  log-gridu tloušťky (TABLE_POINTS bodů) a výsledek se drží v paměti; dotaz je
+  pak jedno půlení intervalu a lineární interpolace (jednotky μs),
+- parametry se ořežou na rozsahy optimalizátoru (včetně limitu tlaku pro
+  křehké materiály) a zaokrouhlí na jeho přesnost.
+
+Artefakty jsou verzované soubory inverse-surrogate-vNNNN.joblib (+ .json
+s metadaty a metrikami z validace) v AWJ_CALCULATOR['SURROGATE']['MODEL_DIR'].
+Model se načte líně jednou za proces (VERSION = None → nejnovější verze).
+
+Surrogate odpovídá jen na dotazy, na které byl trénován (max_speed, min_cost
+se stejnou minimální rychlostí a cenami, materiály s výchozími exponenty
+modelu rychlosti); ostatní dotazy, chybějící model a doporučení porušující
+min_speed spadnou zpět na AWJOptimizationService.
+"""
+
+import bisect
+import json
+import logging
+import math
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from django.conf import settings
+from django.utils import timezone
+
+from backend.apps.calculations.optimizer import AWJOptimizationEngine
+from backend.apps.calculations.services import AWJCalculationService, AWJOptimizationService
+
+logger = logging.getLogger(__name__)
+
+
+TARGETS = ('max_speed', 'min_cost')
+PARAMETERS = AWJOptimizationEngine.VARIABLES
+FEATURES = ('log_thickness', 'log_k', 'log_strength', 'brittle', 'severity')
+
+# Koeficienty modelu rychlosti, které příznaky nepopisují (kalibrované materiály)
+SPEED_EXPONENTS = ('pressure_exponent', 'abrasive_exponent', 'thickness_exponent', 'strength_exponent')
+
+ARTIFACT_PREFIX = 'inverse-surrogate-v'
+ARTIFACT_PATTERN = re.compile(rf'^{ARTIFACT_PREFIX}(\d+)\.joblib$')
+
+# Doména tloušťky [mm] a hustota interpolačních tabulek
+THICKNESS_RANGE = (0.1, 500)
+TABLE_POINTS = 256
+
+
+def surrogate_config() -> Dict:
+    config = {
+        'MODEL_DIR': str(settings.BASE_DIR / 'models' / 'surrogate'),
+        'VERSION': None,
+        'ESTIMATORS': 200,
+        'THICKNESS_POINTS': 40,
+        'MIN_SPEED': 50,
+    }
+    config.update(settings.AWJ_CALCULATOR.get('SURROGATE', {}))
+    return config
+
+
+def material_descriptor(material_type: str) -> Tuple[float, float, bool]:
+    """(k, pevnost, křehký) - vše, čím materiál vstupuje do modelů"""
+    props = AWJCalculationService.material_properties(material_type)
+    brittle = AWJCalculationService.material_kind(material_type) in AWJOptimizationEngine.BRITTLE_MATERIALS
+    return float(props['k']), float(props['strength']), brittle
+
+
+def has_default_speed_model(material_type: str) -> bool:
+    """False pro materiály s kalibrovanými exponenty rychlosti (mimo doménu modelu)"""
+    coefficients = AWJCalculationService.material_coefficients(material_type)
+    return all(coefficients[name] == AWJCalculationService.MODEL_COEFFICIENTS[name] for name in SPEED_EXPONENTS)
+
+
+def features(descriptor: Tuple[float, float, bool], thickness) -> np.ndarray:
+    """Matice příznaků (N x len(FEATURES)) pro materiál a tloušťky"""
+    k, strength, brittle = descriptor
+    log_t = np.log(np.atleast_1d(np.asarray(thickness, dtype=np.float64)))
+    log_k, log_s = math.log(k), math.log(strength)
+    full = np.full_like(log_t, 0.0)
+    # severity ~ log(rychlost) bez vlivu řezných parametrů
+    return np.column_stack([
+        log_t, full + log_k, full + log_s, full + float(brittle), log_k - 0.5 * log_s - 1.2 * log_t
+    ])
+
+
+def target_bounds(target: str) -> Dict[str, Tuple[float, float]]:
+    """Rozsahy, které pro cíl používá AWJOptimizationService"""
+    return dict(AWJOptimizationService.COST_BOUNDS) if target == 'min_cost' else {}
+
+
+def training_prices() -> Dict[str, float]:
+    """Výchozí ceny doplněné o výchozí tarif (stejně jako POST /api/calculations/optimize/)"""
+    from backend.apps.calculations.materials import get_tariff_catalog
+    return {**AWJCalculationService.DEFAULT_PRICES, **get_tariff_catalog().get()}
+
+
+def training_materials() -> List[str]:
+    """Vestavěné typy a materiály z tabulky Material ('material:<id>')"""
+    from backend.apps.calculations.materials import get_material_snapshot
+    return list(AWJCalculationService.MATERIAL_PROPERTIES) + sorted(get_material_snapshot().entries)
+
+
+def build_training_set(
+    materials: Iterable[str],
+    thickness_points: int = 40,
+    min_speed: float = 50,
+    prices: Optional[Dict[str, float]] = None,
+    progress: Optional[Callable[[int, int], None]] = None
+) -> Dict[str, Dict[str, np.ndarray]]:
+    """
+    Výsledky optimalizátoru na log-gridu tloušťky pro všechny materiály a cíle
+
+    Materiály se stejnými konstantami se optimalizují jen jednou, materiály
+    s kalibrovanými exponenty rychlosti se vynechají. Body bez přípustného
+    řešení (min_cost pod min_speed) se vynechají.
+
+    Returns:
+        {cíl: {'X': příznaky, 'Y': parametry, 'descriptor': index materiálu}}
+    """
+    prices = prices or training_prices()
+    descriptors = {}
+    for material_type in materials:
+        if has_default_speed_model(material_type):
+            descriptors.setdefault(material_descriptor(material_type), material_type)
+
+    thicknesses = np.geomspace(*THICKNESS_RANGE, thickness_points)
+    total = len(descriptors) * len(TARGETS) * thickness_points
+    done = 0
+
+    data = {}
+    for target in TARGETS:
+        X, Y, groups = [], [], []
+        for index, (descriptor, material_type) in enumerate(descriptors.items()):
+            for thickness in thicknesses:
+                result = AWJOptimizationService.optimize(
+                    material_type, float(thickness), target=target, min_speed=min_speed, **prices
+                )
+                done += 1
+                if progress is not None:
+                    progress(done, total)
+                if not result:
+                    continue
+                X.append(features(descriptor, thickness)[0])
+                Y.append([result[name] for name in PARAMETERS])
+                groups.append(index)
+        data[target] = {'X': np.array(X), 'Y': np.array(Y, dtype=np.float64), 'descriptor': np.array(groups)}
+    return data
+
+
+class InverseSurrogate:
+    """
+    Natrénované modely pro všechny cíle + metadata artefaktu
+
+    Args:
+        models: {cíl: regresor s predict(X) → N x len(PARAMETERS)}
+        metadata: verze, ceny a min_speed tréninku, metriky validace, ...
+    """
+
+    def __init__(self, models: Dict, metadata: Dict):
+        self.models = models
+        self.metadata = metadata
+        self._tables: Dict[Tuple, Tuple[List[float], List[Tuple[float, ...]]]] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def version(self) -> Optional[int]:
+        return self.metadata.get('version')
+
+    @property
+    def targets(self) -> Tuple[str, ...]:
+        return tuple(self.models)
+
+    def supports(self, target: str, min_speed: float, prices: Dict[str, float]) -> Optional[str]:
+        """None, pokud model na dotaz odpovídá; jinak důvod pro návrat k optimalizátoru"""
+        if target not in self.models:
+            return 'unsupported_target'
+        if target == 'min_cost':
+            trained = self.metadata.get('prices', {})
+            if not math.isclose(min_speed, self.metadata.get('min_speed', 0)):
+                return 'min_speed_mismatch'
+            if any(not math.isclose(prices[name], trained.get(name, math.nan)) for name in prices):
+                return 'prices_mismatch'
+        return None
+
+    # --- Predikce ---------------------------------------------------------
+
+    def _table(self, material_type: str, target: str):
+        """Parametry předpočítané na log-gridu tloušťky (ořezané na rozsahy)"""
+        descriptor = material_descriptor(material_type)
+        key = (target, descriptor)
+        table = self._tables.get(key)
+        if table is not None:
+            return table
+
+        with self._lock:
+            table = self._tables.get(key)
+            if table is None:
+                grid = np.linspace(*np.log(THICKNESS_RANGE), TABLE_POINTS)
+                values = self.models[target].predict(features(descriptor, np.exp(grid)))
+                engine = AWJOptimizationEngine(material_type, thickness=1.0, bounds=target_bounds(target))
+                values = np.clip(values, engine.lower, engine.upper)
+                table = (grid.tolist(), [tuple(row) for row in values.tolist()])
+                self._tables[key] = table
+        return table
+
+    def predict(self, material_type: str, thickness: float, target: str = 'max_speed') -> Dict[str, float]:
+        """Doporučené parametry (zaokrouhlené jako výstup optimalizátoru)"""
+        grid, values = self._table(material_type, target)
+        x = min(max(math.log(thickness), grid[0]), grid[-1])
+        i = min(max(bisect.bisect_right(grid, x) - 1, 0), len(grid) - 2)
+        w = (x - grid[i]) / (grid[i + 1] - grid[i])
+        lo, hi = values[i], values[i + 1]
+
+        params = {
+            name: round(lo[j] + w * (hi[j] - lo[j]), AWJOptimizationEngine.PRECISION[name])
+            for j, name in enumerate(PARAMETERS)
+        }
+        # Tryska musí být užší než fokusační trubice
+        if params['nozzle_diameter'] >= params['focus_diameter']:
+            step = 10 ** -AWJOptimizationEngine.PRECISION['nozzle_diameter']
+            params['nozzle_diameter'] = round(params['focus_diameter'] - step, 2)
+        return params
+
+    def recommend(
+        self, material_type: str, thickness: float, target: str = 'max_speed', **engine_options
+    ) -> Dict:
+        """
+        Parametry + očekávaná rychlost a náklady ve formátu AWJOptimizationService
+
+        engine_options: mesh_size a ceny (jako pro AWJOptimizationEngine)
+        """
+        params = self.predict(material_type, thickness, target)
+        results = AWJCalculationService.perform_full_calculation({
+            'material_type': material_type,
+            'thickness': thickness,
+            **engine_options,
+            **params,
+        })
+        return {
+            **params,
+            'expected_speed': results['cutting_speed'],
+            'expected_cost': results['cost_per_meter'],
+        }
+
+    # --- Artefakty --------------------------------------------------------
+
+    @staticmethod
+    def available_versions(model_dir) -> List[int]:
+        path = Path(model_dir)
+        if not path.is_dir():
+            return []
+        return sorted(
+            int(match.group(1)) for match in map(ARTIFACT_PATTERN.match, (p.name for p in path.iterdir()))
+            if match
+        )
+
+    @staticmethod
+    def artifact_path(model_dir, version: int) -> Path:
+        return Path(model_dir) / f'{ARTIFACT_PREFIX}{version:04d}.joblib'
+
+    def save(self, model_dir) -> Path:
+        """Uloží model jako novou verzi (joblib + JSON s metadaty)"""
+        import joblib
+
+        Path(model_dir).mkdir(parents=True, exist_ok=True)
+        versions = self.available_versions(model_dir)
+        self.metadata['version'] = (versions[-1] + 1) if versions else 1
+
+        path = self.artifact_path(model_dir, self.version)
+        joblib.dump({'models': self.models, 'metadata': self.metadata}, path, compress=3)
+        path.with_suffix('.json').write_text(json.dumps(self.metadata, indent=2, ensure_ascii=False))
+        return path
+
+    @classmethod
+    def load(cls, model_dir, version: Optional[int] = None) -> Optional['InverseSurrogate']:
+        """Načte verzi (None = nejnovější); None, pokud v adresáři žádný model není"""
+        import joblib
+
+        if version is None:
+            versions = cls.available_versions(model_dir)
+            if not versions:
+                return None
+            version = versions[-1]
+
+        artifact = joblib.load(cls.artifact_path(model_dir, int(version)))
+        return cls(artifact['models'], artifact['metadata'])
+
+
+def _regret(target: str, predicted: Dict, optimal: Dict) -> float:
+    """Relativní ztráta cílové veličiny oproti optimalizátoru (0 = stejně dobré)"""
+    if target == 'max_speed':
+        return max(0.0, 1 - predicted['expected_speed'] / optimal['expected_speed'])
+    return max(0.0, predicted['expected_cost'] / optimal['expected_cost'] - 1)
+
+
+def train_surrogate(
+    materials: Optional[Iterable[str]] = None,
+    thickness_points: int = 40,
+    min_speed: float = 50,
+    estimators: int = 200,
+    holdout: float = 0.2,
+    seed: int = 0,
+    progress: Optional[Callable[[int, int], None]] = None
+) -> InverseSurrogate:
+    """
+    Natrénuje surrogate na výsledcích AWJOptimizationService
+
+    Část bodů (holdout) se nejdřív odloží pro validaci - metriky (MAE
+    parametrů, průměrná a maximální ztráta cílové veličiny, podíl porušení
+    min_speed) se uloží do metadat. Výsledný model se pak natrénuje na všech
+    bodech.
+    """
+    from sklearn import __version__ as sklearn_version
+    from sklearn.ensemble import ExtraTreesRegressor
+
+    materials = list(materials) if materials is not None else training_materials()
+    prices = training_prices()
+    started = time.perf_counter()
+    data = build_training_set(materials, thickness_points, min_speed, prices, progress)
+
+    def fit(X, Y):
+        model = ExtraTreesRegressor(n_estimators=estimators, random_state=seed, n_jobs=1)
+        return model.fit(X, Y)
+
+    rng = np.random.default_rng(seed)
+    descriptors = {}
+    for material_type in materials:
+        if has_default_speed_model(material_type):
+            descriptors.setdefault(material_descriptor(material_type), material_type)
+    material_of = list(descriptors.values())
+
+    models, metrics = {}, {}
+    for target, columns in data.items():
+        X, Y = columns['X'], columns['Y']
+        test = rng.random(len(X)) < holdout
+        if test.any() and (~test).any():
+            validation = InverseSurrogate({target: fit(X[~test], Y[~test])}, {})
+            errors, regrets, violations = [], [], 0
+            for row in np.flatnonzero(test):
+                material_type = material_of[columns['descriptor'][row]]
+                thickness = float(math.exp(X[row, 0]))
+                options = {'mesh_size': 80, **prices}
+                predicted = validation.recommend(material_type, thickness, target, **options)
+                optimal = AWJCalculationService.perform_full_calculation({
+                    'material_type': material_type, 'thickness': thickness, **options,
+                    **dict(zip(PARAMETERS, Y[row])),
+                })
+                optimal = {'expected_speed': optimal['cutting_speed'], 'expected_cost': optimal['cost_per_meter']}
+                errors.append([abs(predicted[name] - Y[row, j]) for j, name in enumerate(PARAMETERS)])
+                regrets.append(_regret(target, predicted, optimal))
+                violations += target == 'min_cost' and predicted['expected_speed'] < min_speed
+            metrics[target] = {
+                'samples': int(len(X)),
+                'holdout': int(test.sum()),
+                'mae': dict(zip(PARAMETERS, np.round(np.mean(errors, axis=0), 4).tolist())),
+                'mean_regret': round(float(np.mean(regrets)), 4),
+                'max_regret': round(float(np.max(regrets)), 4),
+                'min_speed_violations': round(violations / len(regrets), 4),
+            }
+        models[target] = fit(X, Y)
+
+    metadata = {
+        'version': None,
+        'created_at': timezone.now().isoformat(),
+        'sklearn_version': sklearn_version,
+        'features': list(FEATURES),
+        'parameters': list(PARAMETERS),
+        'targets': list(models),
+        'materials': len(descriptors),
+        'thickness_points': thickness_points,
+        'thickness_range': list(THICKNESS_RANGE),
+        'min_speed': min_speed,
+        'prices': prices,
+        'estimators': estimators,
+        'training_time': round(time.perf_counter() - started, 1),
+        'metrics': metrics,
+    }
+    return InverseSurrogate(models, metadata)
+
+
+_surrogate = None
+_surrogate_loaded = False
+_surrogate_lock = threading.Lock()
+
+
+def get_surrogate() -> Optional[InverseSurrogate]:
+    """
+    Model procesu podle AWJ_CALCULATOR['SURROGATE'] (načte se jednou)
+
+    Returns:
+        None, pokud v MODEL_DIR žádný model není nebo ho nelze načíst
+    """
+    global _surrogate, _surrogate_loaded
+
+    if not _surrogate_loaded:
+        with _surrogate_lock:
+            if not _surrogate_loaded:
+                config = surrogate_config()
+                try:
+                    _surrogate = InverseSurrogate.load(config['MODEL_DIR'], config['VERSION'])
+                except Exception:
+                    logger.exception("Nelze načíst surrogate model z %s", config['MODEL_DIR'])
+                    _surrogate = None
+                _surrogate_loaded = True
+    return _surrogate
+
+
+def reset_surrogate() -> None:
+    """Zapomene načtený model (další get_surrogate() načte aktuální verzi)"""
+    global _surrogate, _surrogate_loaded
+    with _surrogate_lock:
+        _surrogate, _surrogate_loaded = None, False
+
+
+def recommend_parameters(
+    material_type: str,
+    thickness: float,
+    target: str = 'max_speed',
+    min_speed: float = 50,
+    **engine_options
+) -> Dict:
+    """
+    Doporučené parametry ze surrogate modelu, jinak z AWJOptimizationService
+
+    engine_options: mesh_size a ceny; chybějící ceny se doplní výchozími
+    (jako v AWJOptimizationEngine).
+
+    Returns:
+        {'source': 'surrogate' | 'optimizer', 'fallback_reason', 'model_version',
+         'parameters': výsledek ve formátu AWJOptimizationService}
+
+    Raises:
+        ValueError: Neznámý cíl (z AWJOptimizationService)
+    """
+    prices = {**AWJCalculationService.DEFAULT_PRICES, **engine_options}
+    prices = {name: float(prices[name]) for name in AWJCalculationService.DEFAULT_PRICES}
+
+    surrogate = None
+    if not settings.AWJ_CALCULATOR.get('ENABLE_AI_OPTIMIZATION', True):
+        reason = 'disabled'
+    else:
+        surrogate = get_surrogate()
+        reason = 'model_missing' if surrogate is None else surrogate.supports(target, min_speed, prices)
+        if reason is None and not has_default_speed_model(material_type):
+            reason = 'calibrated_material'
+
+    if reason is None:
+        result = surrogate.recommend(material_type, thickness, target, **engine_options)
+        if target == 'min_cost' and result['expected_speed'] < min_speed:
+            reason = 'min_speed_violated'
+        else:
+            return {
+                'source': 'surrogate',
+                'fallback_reason': None,
+                'model_version': surrogate.version,
+                'parameters': result,
+            }
+
+    result = AWJOptimizationService.optimize(
+        material_type, thickness, target=target, min_speed=min_speed, **engine_options
+    )
+    return {
+        'source': 'optimizer',
+        'fallback_reason': reason,
+        'model_version': surrogate.version if surrogate is not None else None,
+        'parameters': result,
+    }
@@ -0,0 +1,60 @@
+"""
+AWJ AI Optimization - Serializers
+"""
+
+from rest_framework import serializers
+
+from backend.apps.calculations.materials import (
+    cost_parameters, get_abrasive_catalog, get_material_snapshot, get_tariff_catalog, material_key
+)
+from backend.apps.calculations.services import AWJOptimizationService
+
+
+class RecommendationSerializer(serializers.Serializer):
+    """Dotaz na doporučené parametry (surrogate model, jinak optimalizátor)"""
+
+    material_type = serializers.ChoiceField(choices=[
+        'steel', 'aluminum', 'titanium', 'granite',
+        'glass', 'ceramic', 'composite'
+    ], default='steel')
+    thickness = serializers.FloatField(min_value=0.1, max_value=500)
+    target = serializers.ChoiceField(choices=AWJOptimizationService.TARGETS, default='max_speed')
+    min_speed = serializers.FloatField(min_value=0, default=50)
+
+    material_id = serializers.IntegerField(
+        required=False, allow_null=True,
+        help_text="Materiál z databáze - doporučení pro jeho konstanty"
+    )
+    abrasive_id = serializers.IntegerField(
+        required=False, allow_null=True,
+        help_text="Abrazivo z databáze - mesh a cena za kg"
+    )
+    tariff = serializers.CharField(
+        required=False, allow_null=True,
+        help_text="Název tarifu (ceny vody, energie a abraziva), jinak výchozí tarif"
+    )
+
+    def validate_material_id(self, value):
+        if value is not None and get_material_snapshot().get(material_key(value)) is None:
+            raise serializers.ValidationError(f"Materiál {value} neexistuje")
+        return value
+
+    def validate_abrasive_id(self, value):
+        if value is not None and get_abrasive_catalog().get(value) is None:
+            raise serializers.ValidationError(f"Abrazivo {value} neexistuje")
+        return value
+
+    def validate_tariff(self, value):
+        if value is not None and get_tariff_catalog().get(value) is None:
+            raise serializers.ValidationError(f"Tarif {value} neexistuje")
+        return value
+
+    def validate(self, data):
+        if data.get('material_id') is not None:
+            data['material_type'] = material_key(data.pop('material_id'))
+        else:
+            data.pop('material_id', None)
+
+        # Ceny a mesh pro optimalizátor i očekávané náklady doporučení
+        data['engine_options'] = cost_parameters(data.pop('tariff', None), data.pop('abrasive_id', None))
+        return data
@@ -0,0 +1,17 @@
+"""
+AWJ AI Optimization - URL Configuration
+"""
+
+from django.urls import path, include
+from rest_framework.routers import SimpleRouter
+from . import views
+
+# SimpleRouter - kořen API už poskytuje router aplikace calculations
+router = SimpleRouter()
+router.register(r'ai-optimization', views.SurrogateViewSet, basename='ai-optimization')
+
+app_name = 'ai_optimization'
+
+urlpatterns = [
+    path('', include(router.urls)),
+]
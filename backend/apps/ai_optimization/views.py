@@ -0,0 +1,75 @@
+"""
+AWJ AI Optimization - API Views
+"""
+
+import time
+
+from rest_framework import viewsets, status
+from rest_framework.decorators import action
+from rest_framework.permissions import AllowAny, IsAuthenticatedOrReadOnly
+from rest_framework.response import Response
+
+from .ml_models import get_surrogate, recommend_parameters
+from .serializers import RecommendationSerializer
+
+
+class SurrogateViewSet(viewsets.ViewSet):
+    """
+    Doporučené parametry z inverzního surrogate modelu
+
+    POST /api/ai-optimization/recommend/ - parametry pro materiál, tloušťku a cíl
+    GET /api/ai-optimization/model/ - metadata načteného modelu
+    """
+
+    permission_classes = [IsAuthenticatedOrReadOnly]
+
+    @action(detail=False, methods=['post'])
+    def recommend(self, request):
+        """
+        Body:
+        {
+            "material_type": "steel",  // nebo "material_id": 3
+            "thickness": 10,
+            "target": "max_speed" | "min_cost" | "pareto",
+            "min_speed": 50,  // pro min_cost
+            "abrasive_id": 2,  // volitelné
+            "tariff": "dilna-2024"  // volitelné
+        }
+
+        source = "surrogate" nebo "optimizer" (s fallback_reason), parametry
+        ve stejném formátu jako POST /api/calculations/optimize/.
+        """
+        serializer = RecommendationSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        data = serializer.validated_data
+
+        start_time = time.perf_counter()
+        try:
+            recommendation = recommend_parameters(
+                data['material_type'], data['thickness'], target=data['target'],
+                min_speed=data['min_speed'], **data['engine_options']
+            )
+        except ValueError as exc:
+            return Response({'error': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        elapsed = time.perf_counter() - start_time
+
+        return Response({
+            'success': True,
+            'material_type': data['material_type'],
+            'thickness': data['thickness'],
+            'target': data['target'],
+            'source': recommendation['source'],
+            'fallback_reason': recommendation['fallback_reason'],
+            'model_version': recommendation['model_version'],
+            'optimized_parameters': recommendation['parameters'],
+            'recommendation_time_us': round(elapsed * 1e6, 1),
+        })
+
+    @action(detail=False, methods=['get'], permission_classes=[AllowAny])
+    def model(self, request):
+        """Metadata a validační metriky načteného modelu"""
+        surrogate = get_surrogate()
+        if surrogate is None:
+            return Response({'available': False})
+        return Response({'available': True, **surrogate.metadata})
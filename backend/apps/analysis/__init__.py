@@ -2,5 +2,5 @@
 AWJ Analysis App
 Aplikace pro analýzu sil při řezání AWJ
 
-STATUS: Připraveno k implementaci
+STATUS: Průběhy sil a řezu po hloubce (services.py), API /api/analysis/profile/
 """
@@ -0,0 +1,36 @@
+"""
+AWJ Analysis App - Serializers
+"""
+
+from rest_framework import serializers
+
+from backend.apps.calculations.serializers import QuickCalculationSerializer
+
+from .services import AXES, SERIES, analysis_config
+
+
+class ProfileOptionsSerializer(serializers.Serializer):
+    """Hustota průběhu, decimace a výběr průběhů"""
+
+    resolution = serializers.IntegerField(min_value=2, required=False, help_text="Počet bodů gridu hloubky")
+    max_points = serializers.IntegerField(
+        min_value=3, required=False, help_text="Nejvýše úseků po decimaci (2 krajní body + vnitřní úseky)"
+    )
+    axis = serializers.ChoiceField(choices=AXES, default='depth')
+    series = serializers.MultipleChoiceField(choices=SERIES, required=False)
+
+    def validate_resolution(self, value):
+        limit = analysis_config()['MAX_RESOLUTION']
+        if value > limit:
+            raise serializers.ValidationError(f"Maximální rozlišení je {limit} bodů")
+        return value
+
+    def validate_max_points(self, value):
+        limit = analysis_config()['MAX_POINTS']
+        if value > limit:
+            raise serializers.ValidationError(f"Maximální počet bodů odpovědi je {limit}")
+        return value
+
+
+class ProfileSerializer(ProfileOptionsSerializer, QuickCalculationSerializer):
+    """Vstupy výpočtu (jako quick_calculate) + volby průběhu"""
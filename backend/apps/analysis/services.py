@@ -0,0 +1,217 @@
+"""
+AWJ Analysis App - Force Profile Service
+Průběhy sil, šířky řezu a rýhování po hloubce řezu
+
+Z výsledku výpočtu (calculations/services.py) se odvodí paprsek a jeho
+průběh po hloubce z ∈ [0, tloušťka] na gridu zvolené hustoty (NumPy pole):
+
+- paprsek: rychlost vody v_w = C_V · sqrt(2p/ρ), po smíšení s abrazivem
+  (zachování hybnosti) v_j = ṁ_w · v_w / (ṁ_w + ṁ_a), síla dopadu F = ṁ_w · v_w
+- energie paprsku klesá lineárně s hloubkou až do hloubky h, kterou paprsek
+  při rychlosti posuvu u prořízne; z modelu rychlosti V ~ t^-c je
+  h = t · (V(t) / u)^(1/c) - pro dělicí rychlost (bez omezení 2-5000 mm/min)
+  h = t, při omezení na 5000 mm/min h > t. v(z) = v_j · sqrt(1 - z/h)
+- zpoždění paprsku (jet lag) z doby průniku do hloubky z při rychlosti
+  posuvu u: δ(z) = d_f · (1 - sqrt(1 - z/h)), úhel vlečení θ = atan(dδ/dz)
+- axiální a tečná síla: F_a = ṁ · v(z) · cos θ, F_t = ṁ · v(z) · sin θ
+- šířka řezu klesá se zbývající energií od průměru fokusační trubice
+  na polovinu: w(z) = d_f · (1 + sqrt(1 - z/h)) / 2
+- rýhování: v hloubce z zbývá paprsku kapacita h - z, což odpovídá řezu
+  plným paprskem rychlostí u_eq = u · (h / (h - z))^c;
+  drsnost Ra(z) je model drsnosti při u_eq (omezený na 20 μm)
+- čas: doba, za kterou čelo řezu dosáhne hloubky z, τ(z) = δ(z) / u
+
+Pod hloubkou h (neprořízne) jsou rychlost, síly a šířka nulové.
+Průběhy lze pro graf zmenšit min/max decimací (decimate) - obálka
+zachová extrémy i pro milionové průběhy.
+"""
+
+import math
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+from django.conf import settings
+
+from backend.apps.calculations.services import AWJCalculationService
+
+
+SERIES = (
+    'jet_velocity', 'axial_force', 'tangential_force', 'kerf_width',
+    'jet_lag', 'drag_angle', 'surface_roughness', 'time',
+)
+AXES = ('depth', 'time')
+
+# Hranice hladké zóny: drsnost nejvýše SMOOTH_ZONE_FACTOR × drsnost na horní hraně
+SMOOTH_ZONE_FACTOR = 1.5
+
+
+def analysis_config() -> Dict:
+    config = {'MAX_RESOLUTION': 2_000_000, 'DEFAULT_RESOLUTION': 10_000, 'MAX_POINTS': 20_000}
+    config.update(settings.AWJ_CALCULATOR.get('ANALYSIS', {}))
+    return config
+
+
+class ForceProfileService:
+    """Průběhy paprsku a řezu po hloubce pro parametry výpočtu"""
+
+    @classmethod
+    def jet(cls, params: Dict, results: Optional[Dict] = None) -> Dict:
+        """
+        Parametry paprsku (bez průběhu)
+
+        Returns:
+            water_velocity [m/s], jet_velocity [m/s], mass_flow [kg/s], jet_force [N],
+            jet_power [kW], max_depth [mm], cutting_speed [mm/min], thickness_exponent
+        """
+        service = AWJCalculationService
+        results = results or service.perform_full_calculation(params)
+        material = service._material_columns(params.get('material_type', 'steel'), 1)
+        separation_speed = float(service._cutting_speed_kernel(
+            material, float(params['thickness']), float(params['pressure']), float(params.get('abrasive_flow', 8)),
+            float(params.get('nozzle_diameter', 0.33)), float(params.get('focus_diameter', 1.0)), clamp=False
+        )[0])
+        model_speed = min(max(separation_speed, 2), 5000)  # bez zaokrouhlení - dělicí rychlost dá h = t přesně
+        exponent = material['thickness_exponent']
+
+        water_mass_flow = results['water_flow'] * service.WATER_DENSITY / 60000  # l/min -> kg/s
+        abrasive_mass_flow = params.get('abrasive_flow', 8) / 1000  # g/s -> kg/s
+        water_velocity = service.C_VELOCITY * math.sqrt(2 * params['pressure'] * 1e6 / service.WATER_DENSITY)
+        mass_flow = water_mass_flow + abrasive_mass_flow
+        jet_velocity = water_mass_flow * water_velocity / mass_flow
+
+        return {
+            'water_velocity': water_velocity,
+            'jet_velocity': jet_velocity,
+            'mass_flow': mass_flow,
+            'jet_force': water_mass_flow * water_velocity,
+            'jet_power': 0.5 * mass_flow * jet_velocity ** 2 / 1000,
+            'max_depth': params['thickness'] * (separation_speed / model_speed) ** (1 / exponent),
+            'cutting_speed': results['cutting_speed'],
+            'thickness_exponent': exponent,
+        }
+
+    @classmethod
+    def profile(cls, params: Dict, resolution: int = 10_000) -> Dict:
+        """
+        Průběhy po hloubce řezu
+
+        Args:
+            params: Vstupy výpočtu (jako perform_full_calculation)
+            resolution: Počet bodů gridu hloubky
+
+        Returns:
+            depth (pole), series {název: pole}, summary, results (výpočet)
+        """
+        results = AWJCalculationService.perform_full_calculation(params)
+        jet = cls.jet(params, results)
+        focus_diameter = params.get('focus_diameter', 1.0)
+        max_depth = jet['max_depth']
+        speed_mm_s = jet['cutting_speed'] / 60
+
+        depth = np.linspace(0.0, float(params['thickness']), int(resolution))
+        remaining = np.clip(1 - depth / max_depth, 0.0, 1.0)
+        root = np.sqrt(remaining)
+        cut = depth <= max_depth
+
+        jet_velocity = jet['jet_velocity'] * root
+        jet_lag = focus_diameter * (1 - root)
+        drag_angle = np.arctan2(focus_diameter, 2 * max_depth * root)  # atan(dδ/dz)
+        momentum = jet['mass_flow'] * jet_velocity
+
+        with np.errstate(divide='ignore'):
+            equivalent_speed = jet['cutting_speed'] / remaining ** jet['thickness_exponent']
+        material = AWJCalculationService._material_columns(params.get('material_type', 'steel'), depth.size)
+        roughness = AWJCalculationService._surface_roughness_kernel(
+            material, equivalent_speed, float(params.get('abrasive_flow', 8)), float(params.get('mesh_size', 80))
+        )
+
+        series = {
+            'jet_velocity': jet_velocity,  # m/s
+            'axial_force': momentum * np.cos(drag_angle),  # N
+            'tangential_force': momentum * np.sin(drag_angle),  # N
+            'kerf_width': np.where(cut, focus_diameter * (1 + root) / 2, 0.0),  # mm
+            'jet_lag': jet_lag,  # mm
+            'drag_angle': np.degrees(drag_angle),  # °
+            'surface_roughness': roughness,  # μm
+            'time': jet_lag / speed_mm_s,  # s
+        }
+
+        rough = np.flatnonzero(roughness > SMOOTH_ZONE_FACTOR * roughness[0])
+        through_cut = params['thickness'] <= max_depth
+        summary = {
+            'jet_force': round(jet['jet_force'], 3),
+            'jet_velocity': round(jet['jet_velocity'], 1),
+            'water_velocity': round(jet['water_velocity'], 1),
+            'jet_power': round(jet['jet_power'], 3),
+            'max_depth': round(max_depth, 3),
+            'through_cut': bool(through_cut),
+            'kerf_top_width': round(float(series['kerf_width'][0]), 4),
+            'kerf_bottom_width': round(float(series['kerf_width'][-1]), 4),
+            'kerf_taper': round(float(series['kerf_width'][0] - series['kerf_width'][-1]) / 2, 4),
+            'bottom_jet_lag': round(float(jet_lag[-1]), 4),
+            'smooth_zone_depth': round(float(depth[rough[0]] if rough.size else depth[-1]), 4),
+        }
+
+        return {'depth': depth, 'series': series, 'summary': summary, 'results': results}
+
+
+def decimate(axis: np.ndarray, series: Dict[str, np.ndarray], max_points: int) -> Dict:
+    """
+    Min/max decimace průběhů na nejvýše max_points úseků
+
+    Každý úsek nese střed osy a minimum a maximum každého průběhu - obálka
+    zachová špičky, které by prosté podvzorkování ztratilo. První a poslední
+    úsek tvoří samotné krajní body, takže osa začíná a končí přesně na
+    krajích průběhu. Kratší průběhy se vrátí celé (min = max = hodnota).
+
+    Returns:
+        {'points', 'buckets', 'decimated', 'axis', 'series': {název: {'min', 'max'}}}
+    """
+    size = len(axis)
+    if size <= max_points:
+        return {
+            'points': size,
+            'buckets': size,
+            'decimated': False,
+            'axis': axis.tolist(),
+            'series': {name: {'min': column.tolist(), 'max': column.tolist()} for name, column in series.items()},
+        }
+
+    inner = max_points - 2
+    starts = np.concatenate(([0], 1 + (np.arange(inner) * (size - 2)) // inner, [size - 1]))
+    ends = np.append(starts[1:], size) - 1
+    return {
+        'points': size,
+        'buckets': max_points,
+        'decimated': True,
+        'axis': ((axis[starts] + axis[ends]) / 2).tolist(),
+        'series': {
+            name: {
+                'min': np.minimum.reduceat(column, starts).tolist(),
+                'max': np.maximum.reduceat(column, starts).tolist(),
+            }
+            for name, column in series.items()
+        },
+    }
+
+
+def profile_response(
+    params: Dict,
+    resolution: int,
+    max_points: int,
+    axis: str = 'depth',
+    names: Optional[Iterable[str]] = None
+) -> Dict:
+    """Průběhy pro API - vybrané průběhy po ose depth nebo time, decimované"""
+    profile = ForceProfileService.profile(params, resolution)
+    series = profile['series']
+    axis_values = profile['depth'] if axis == 'depth' else series['time']
+    selected = {name: series[name] for name in (names or SERIES) if not (axis == 'time' and name == 'time')}
+
+    return {
+        'axis': axis,
+        'resolution': int(resolution),
+        'summary': profile['summary'],
+        'results': profile['results'],
+        'profile': decimate(axis_values, selected, max_points),
+    }
@@ -0,0 +1,17 @@
+"""
+AWJ Analysis App - URL Configuration
+"""
+
+from django.urls import path, include
+from rest_framework.routers import SimpleRouter
+from . import views
+
+# SimpleRouter - kořen API už poskytuje router aplikace calculations
+router = SimpleRouter()
+router.register(r'analysis', views.ForceAnalysisViewSet, basename='analysis')
+
+app_name = 'analysis'
+
+urlpatterns = [
+    path('', include(router.urls)),
+]
@@ -0,0 +1,94 @@
+"""
+AWJ Analysis App - API Views
+"""
+
+import time
+
+from rest_framework import viewsets, status
+from rest_framework.decorators import action
+from rest_framework.permissions import IsAuthenticatedOrReadOnly
+from rest_framework.response import Response
+
+from backend.apps.calculations.materials import material_key
+from backend.apps.calculations.models import AWJCalculation
+
+from .serializers import ProfileOptionsSerializer, ProfileSerializer
+from .services import SERIES, analysis_config, profile_response
+
+
+class ForceAnalysisViewSet(viewsets.ViewSet):
+    """
+    Analýza sil a průběhů po hloubce řezu
+
+    POST /api/analysis/profile/ - průběhy pro vstupy výpočtu nebo uložený výpočet
+    """
+
+    permission_classes = [IsAuthenticatedOrReadOnly]
+
+    @action(detail=False, methods=['post'])
+    def profile(self, request):
+        """
+        Body (vstupy jako quick_calculate, nebo "calculation": id uloženého výpočtu):
+        {
+            "material_type": "steel",
+            "thickness": 20,
+            "pressure": 380,
+            "resolution": 1000000,  // bodů gridu hloubky
+            "max_points": 2000,  // úseků min/max decimace v odpovědi
+            "axis": "depth" | "time",
+            "series": ["axial_force", "kerf_width"]  // volitelné, výchozí všechny
+        }
+        """
+        start_time = time.perf_counter()
+
+        if request.data.get('calculation') is not None:
+            serializer = ProfileOptionsSerializer(data=request.data)
+            if not serializer.is_valid():
+                return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+            params = self._calculation_parameters(request, request.data['calculation'])
+            if params is None:
+                return Response(
+                    {'error': f"Výpočet {request.data['calculation']} neexistuje"},
+                    status=status.HTTP_404_NOT_FOUND
+                )
+        else:
+            serializer = ProfileSerializer(data=request.data)
+            if not serializer.is_valid():
+                return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+            params = serializer.validated_data
+
+        options = serializer.validated_data
+        config = analysis_config()
+        names = [name for name in SERIES if name in options.get('series', SERIES)]
+        response = profile_response(
+            params,
+            resolution=options.get('resolution', config['DEFAULT_RESOLUTION']),
+            max_points=options.get('max_points', min(2000, config['MAX_POINTS'])),
+            axis=options['axis'],
+            names=names,
+        )
+        response['calculation_time_ms'] = round((time.perf_counter() - start_time) * 1000, 2)
+        return Response({'success': True, **response})
+
+    @staticmethod
+    def _calculation_parameters(request, calculation_id):
+        """Vstupy uloženého výpočtu (přihlášený uživatel jen své výpočty)"""
+        calculations = AWJCalculation.objects.select_related('abrasive')
+        if request.user.is_authenticated:
+            calculations = calculations.filter(user=request.user)
+        try:
+            calculation = calculations.filter(pk=int(calculation_id)).first()
+        except (TypeError, ValueError):
+            return None
+        if calculation is None:
+            return None
+
+        return {
+            'material_type': material_key(calculation.material_id) if calculation.material_id else 'steel',
+            'thickness': calculation.thickness,
+            'pressure': calculation.pressure,
+            'nozzle_diameter': calculation.nozzle_diameter,
+            'focus_diameter': calculation.focus_diameter,
+            'abrasive_flow': calculation.abrasive_flow,
+            'mesh_size': calculation.abrasive.mesh_size if calculation.abrasive else 80,
+        }
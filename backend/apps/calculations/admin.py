@@ -4,7 +4,11 @@ Administrace pro AWJ výpočty
 """
 
 from django.contrib import admin
-from .models import Material, AbrasiveMaterial, AWJCalculation, CalculationHistory, OptimizationPreset
+from .models import (
+    Material, AbrasiveMaterial, AWJCalculation, CalculationHistory,
+    OptimizationPreset, CalculationJob, CalculationDailyStatistics, TariffProfile,
+    MaterialCalibration
+)
 
 
 @admin.register(Material)
@@ -22,12 +26,21 @@ class AbrasiveMaterialAdmin(admin.ModelAdmin):
     ordering = ['mesh_size']
 
 
+@admin.register(TariffProfile)
+class TariffProfileAdmin(admin.ModelAdmin):
+    list_display = ['name', 'water_cost_per_m3', 'power_cost_per_kwh', 'abrasive_cost_per_kg', 'is_default']
+    list_filter = ['is_default']
+    search_fields = ['name']
+    ordering = ['name']
+
+
 @admin.register(AWJCalculation)
 class AWJCalculationAdmin(admin.ModelAdmin):
     list_display = [
         'id', 'user', 'material', 'thickness', 'pressure',
         'cutting_speed', 'cost_per_meter', 'created_at'
     ]
+    list_select_related = ['user', 'material']
     list_filter = ['material', 'created_at']
     search_fields = ['notes']
     readonly_fields = [
@@ -58,22 +71,53 @@ class AWJCalculationAdmin(admin.ModelAdmin):
                 'extended_results'
             )
         }),
+        ('Naměřené výsledky', {
+            'fields': ('measured_speed', 'measured_roughness', 'measured_depth')
+        }),
         ('Metadata', {
             'fields': ('calculation_time', 'created_at', 'updated_at')
         }),
     )
 
 
+@admin.register(MaterialCalibration)
+class MaterialCalibrationAdmin(admin.ModelAdmin):
+    list_display = ['material', 'samples', 'is_active', 'created_at']
+    list_select_related = ['material']
+    list_filter = ['is_active', 'material']
+    readonly_fields = ['coefficients', 'metrics', 'samples', 'created_at']
+    ordering = ['-created_at']
+
+
 @admin.register(CalculationHistory)
 class CalculationHistoryAdmin(admin.ModelAdmin):
     list_display = ['id', 'calculation', 'timestamp', 'changed_by']
+    list_select_related = ['calculation__material']
     list_filter = ['changed_by', 'timestamp']
     ordering = ['-timestamp']
 
 
 @admin.register(OptimizationPreset)
 class OptimizationPresetAdmin(admin.ModelAdmin):
-    list_display = ['name', 'target', 'success_rate', 'usage_count', 'created_at']
+    list_display = [
+        'name', 'target', 'min_thickness', 'max_thickness', 'success_rate', 'usage_count', 'created_at'
+    ]
     list_filter = ['target']
     search_fields = ['name', 'description']
     ordering = ['-success_rate']
+
+
+@admin.register(CalculationJob)
+class CalculationJobAdmin(admin.ModelAdmin):
+    list_display = ['id', 'kind', 'status', 'progress', 'user', 'created_at', 'finished_at']
+    list_filter = ['kind', 'status']
+    ordering = ['-created_at']
+    readonly_fields = ['created_at', 'started_at', 'finished_at']
+
+
+@admin.register(CalculationDailyStatistics)
+class CalculationDailyStatisticsAdmin(admin.ModelAdmin):
+    list_display = ['date', 'material', 'user', 'calculations', 'updated_at']
+    list_filter = ['material', 'date']
+    list_select_related = ['material', 'user']
+    ordering = ['-date']
@@ -12,5 +12,9 @@ class CalculationsConfig(AppConfig):
 
     def ready(self):
         """Inicializace při startu aplikace"""
-        # Import signálů pokud budou potřeba
-        pass
+        # Signály pro inkrementální rollup statistik, snapshot materiálů a index presetů
+        from . import rollups, materials, presets  # noqa: F401
+
+        # Obnova úloh thread backendu přerušených restartem (při prvním požadavku)
+        from .jobs import schedule_recovery
+        schedule_recovery()
@@ -0,0 +1,254 @@
+"""
+AWJ Calculations App - Benchmarks
+Reprodukovatelné benchmarky výpočetních a optimalizačních cest
+
+Každý případ se měří přes timeit: počet volání na kolo určí autorange()
+(kolo trvá alespoň 0.2 s), pak se provede `repeat` kol a reportuje se
+minimum a medián času na volání. Vstupy jsou generované s pevným seedem.
+
+Spuštění: python manage.py awj_benchmark (viz management/commands)
+"""
+
+import itertools
+import json
+import platform
+import statistics
+import timeit
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+from django.conf import settings
+from django.test.utils import override_settings
+
+from .serializers import QuickCalculationSerializer, BatchCalculationSerializer
+from .services import AWJCalculationService
+
+
+BATCH_SIZES = (1, 10, 100, 1_000, 10_000, 100_000, 1_000_000)
+
+QUICK_PARAMS = {
+    'material_type': 'steel',
+    'thickness': 10.0,
+    'pressure': 380.0,
+    'nozzle_diameter': 0.33,
+    'focus_diameter': 1.0,
+    'abrasive_flow': 8.0,
+    'mesh_size': 80,
+}
+
+
+class BenchmarkCase:
+    """Jeden měřený případ; rows = počet variant zpracovaných jedním voláním"""
+
+    def __init__(self, name: str, setup: Callable[[], Callable[[], object]], rows: int = 1, repeat: int = 5):
+        self.name = name
+        self.setup = setup
+        self.rows = rows
+        self.repeat = repeat
+
+
+def _batch_columns(size: int, seed: int = 0) -> Dict[str, np.ndarray]:
+    rng = np.random.default_rng(seed)
+    materials = np.array(list(AWJCalculationService.MATERIAL_PROPERTIES), dtype=object)
+    return {
+        'material_type': rng.choice(materials, size),
+        'thickness': rng.uniform(0.1, 500, size),
+        'pressure': rng.uniform(100, 400, size),
+        'nozzle_diameter': rng.uniform(0.2, 0.5, size),
+        'focus_diameter': rng.uniform(0.6, 1.5, size),
+        'abrasive_flow': rng.uniform(1, 20, size),
+        'mesh_size': rng.choice([50, 80, 120], size),
+    }
+
+
+def _variations(size: int, seed: int = 0) -> List[Dict]:
+    rng = np.random.default_rng(seed)
+    pressures = rng.uniform(100, 400, size).round(1).tolist()
+    thicknesses = rng.uniform(1, 100, size).round(1).tolist()
+    return [{'pressure': p, 'thickness': t} for p, t in zip(pressures, thicknesses)]
+
+
+def _quick_payloads(count: int = 4096, seed: int = 0) -> List[Dict]:
+    """
+    Různé vstupy quick_calculate - každé volání je miss v cache výsledků
+
+    count je větší než výchozí RESULT_CACHE['MAX_ENTRIES'], takže cyklus
+    přes payloady LRU cache nikdy nezasáhne.
+    """
+    rng = np.random.default_rng(seed)
+    # Tloušťky se liší o víc než přesnost klíče cache (KEY_PRECISION)
+    thicknesses = rng.permutation(np.arange(count)) * 0.05 + 1.0
+    pressures = rng.uniform(100, 400, count).round(1)
+    return [
+        {**QUICK_PARAMS, 'thickness': round(float(t), 2), 'pressure': float(p)}
+        for t, p in zip(thicknesses, pressures)
+    ]
+
+
+def _api_client():
+    from django.contrib.auth.models import User
+    from rest_framework.test import APIClient
+
+    client = APIClient()
+    # Neuložený uživatel - endpointy bez zápisu do DB nepotřebují databázi
+    client.force_authenticate(user=User(username='benchmark'))
+    return client
+
+
+def _endpoint(path: str, payload):
+    """payload je jeden dictionary, nebo seznam, přes který se volání cyklí"""
+    def setup():
+        client = _api_client()
+        payloads = itertools.cycle(payload if isinstance(payload, list) else [payload])
+
+        def call():
+            response = client.post(path, next(payloads), format='json')
+            assert response.status_code == 200, response.status_code
+        return call
+    return setup
+
+
+def _optimizer(method: str, **kwargs):
+    def setup():
+        from .optimizer import AWJOptimizationEngine
+
+        def call():
+            engine = AWJOptimizationEngine(material_type='steel', thickness=50)
+            return getattr(engine, method)(**kwargs)
+        return call
+    return setup
+
+
+def default_cases(max_batch: int = 1_000_000) -> List[BenchmarkCase]:
+    cases = [
+        BenchmarkCase(
+            'service.single_call',
+            lambda: lambda: AWJCalculationService.perform_full_calculation(QUICK_PARAMS)
+        ),
+    ]
+
+    for size in BATCH_SIZES:
+        if size > max_batch:
+            continue
+        cases.append(BenchmarkCase(
+            f'service.batch_{size}',
+            lambda size=size: (lambda columns: lambda: AWJCalculationService.perform_full_calculation_batch(
+                columns
+            ))(_batch_columns(size)),
+            rows=size,
+            repeat=3 if size >= 100_000 else 5
+        ))
+
+    cases += [
+        BenchmarkCase('optimizer.max_speed', _optimizer('maximize_speed'), repeat=3),
+        BenchmarkCase('optimizer.min_cost', _optimizer('minimize_cost', min_speed=50), repeat=3),
+        BenchmarkCase('optimizer.pareto', _optimizer('pareto_front'), repeat=3),
+        BenchmarkCase(
+            'serializer.quick_calculation',
+            lambda: lambda: QuickCalculationSerializer(data=QUICK_PARAMS).is_valid(raise_exception=True)
+        ),
+        BenchmarkCase(
+            'serializer.batch_1000',
+            lambda: (lambda payload: lambda: BatchCalculationSerializer(data=payload).is_valid(
+                raise_exception=True
+            ))({'base_parameters': QUICK_PARAMS, 'variations': _variations(1000)}),
+            rows=1001
+        ),
+        BenchmarkCase(
+            'endpoint.quick_calculate',
+            _endpoint('/api/calculations/quick_calculate/', _quick_payloads())
+        ),
+        BenchmarkCase(
+            'endpoint.quick_calculate_cached',
+            _endpoint('/api/calculations/quick_calculate/', QUICK_PARAMS)
+        ),
+        BenchmarkCase(
+            'endpoint.batch_calculate_1000',
+            _endpoint('/api/calculations/batch_calculate/', {
+                'base_parameters': QUICK_PARAMS,
+                'variations': _variations(1000),
+                'response_format': 'columnar',
+            }),
+            rows=1001,
+            repeat=3
+        ),
+    ]
+    return cases
+
+
+def measure(case: BenchmarkCase) -> Dict:
+    """Změří jeden případ, vrátí časy na volání [s] a propustnost"""
+    function = case.setup()
+    function()  # warm-up
+
+    timer = timeit.Timer(function)
+    number, _ = timer.autorange()
+    rounds = [total / number for total in timer.repeat(repeat=case.repeat, number=number)]
+
+    median = statistics.median(rounds)
+    return {
+        'name': case.name,
+        'rows': case.rows,
+        'number': number,
+        'repeat': case.repeat,
+        'min_s': min(rounds),
+        'median_s': median,
+        'rows_per_s': case.rows / median if median else None,
+    }
+
+
+def run_benchmarks(cases: List[BenchmarkCase], name_filter: Optional[str] = None, report=None) -> Dict:
+    """Spustí případy (volitelně jen ty, jejichž název obsahuje name_filter)"""
+    results = []
+    hosts = [*settings.ALLOWED_HOSTS, 'testserver']
+    with override_settings(ALLOWED_HOSTS=hosts):
+        for case in cases:
+            if name_filter and name_filter not in case.name:
+                continue
+            result = measure(case)
+            results.append(result)
+            if report:
+                report(result)
+
+    return {
+        'environment': {
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'machine': platform.machine(),
+            'processor': platform.processor(),
+        },
+        'results': results,
+    }
+
+
+def compare_with_baseline(current: Dict, baseline: Dict, threshold: float = 0.2) -> List[Dict]:
+    """
+    Porovná medián času na volání s baseline
+
+    Returns:
+        Seznam regresí (případy pomalejší než baseline o více než threshold)
+    """
+    reference = {result['name']: result for result in baseline.get('results', [])}
+    regressions = []
+
+    for result in current['results']:
+        previous = reference.get(result['name'])
+        if not previous:
+            continue
+        ratio = result['median_s'] / previous['median_s']
+        result['baseline_median_s'] = previous['median_s']
+        result['ratio'] = round(ratio, 3)
+        if ratio > 1 + threshold:
+            regressions.append(result)
+
+    return regressions
+
+
+def load_json(path: str) -> Dict:
+    with open(path, encoding='utf-8') as handle:
+        return json.load(handle)
+
+
+def save_json(path: str, data: Dict) -> None:
+    with open(path, 'w', encoding='utf-8') as handle:
+        json.dump(data, handle, indent=2)
@@ -0,0 +1,236 @@
+"""
+AWJ Calculations App - Result Cache
+Cache výsledků perform_full_calculation pro real-time výpočty (quick_calculate)
+
+Klíč tvoří vstupy normalizované na pevnou přesnost, takže např. 10 a 10.0
+nebo drobný šum z posuvníků vedou na stejný záznam. Výpočet se provádí
+s normalizovanými vstupy, aby výsledek v cache odpovídal klíči.
+
+Backendy:
+- 'inprocess' - omezená LRU/TTL cache v paměti procesu
+- 'django'    - Django cache framework (sdílená mezi gunicorn workery,
+                např. přes Redis nebo Memcached)
+
+TTL 0 (nebo None) znamená u obou backendů "bez expirace".
+"""
+
+import copy
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from django.conf import settings
+
+from .services import AWJCalculationService
+
+
+# Přesnost normalizace vstupů [počet desetinných míst]
+KEY_PRECISION = {
+    'thickness': 2,
+    'pressure': 1,
+    'nozzle_diameter': 3,
+    'focus_diameter': 3,
+    'focus_length': 1,
+    'abrasive_flow': 2,
+    'mesh_size': 0,
+    'abrasive_cost_per_kg': 2,
+    'water_cost_per_m3': 2,
+    'power_cost_per_kwh': 2,
+}
+
+DEFAULTS = {
+    'nozzle_diameter': 0.33,
+    'focus_diameter': 1.0,
+    'focus_length': 76,
+    'abrasive_flow': 8,
+    'mesh_size': 80,
+    **AWJCalculationService.DEFAULT_PRICES,
+}
+
+
+def normalize_parameters(params: Dict) -> Dict:
+    """Vrátí vstupy výpočtu zaokrouhlené na KEY_PRECISION (bez ostatních klíčů)"""
+    normalized = {'material_type': params.get('material_type', 'steel')}
+    for name, digits in KEY_PRECISION.items():
+        value = params.get(name, DEFAULTS.get(name))
+        normalized[name] = int(round(value)) if digits == 0 else round(float(value), digits)
+    return normalized
+
+
+def make_key(normalized: Dict, material: Optional[Dict] = None) -> str:
+    """
+    Stabilní textový klíč pro normalizované vstupy
+
+    material: konstanty materiálu z DB ('material:<id>') - změna konstant
+    tak vede na nový klíč místo zastaralého výsledku
+    """
+    raw = '|'.join(f'{name}={normalized[name]!r}' for name in sorted(normalized))
+    if material:
+        raw += '|' + '|'.join(f'material.{name}={material[name]!r}' for name in sorted(material))
+    return 'awj:calc:v1:' + hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+
+class InProcessResultCache:
+    """Omezená LRU cache s TTL v paměti procesu"""
+
+    name = 'inprocess'
+
+    def __init__(self, max_entries: int = 1024, ttl: Optional[float] = 300):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[Dict]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at is None or expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return copy.deepcopy(value)
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def set(self, key: str, value: Dict) -> None:
+        expires_at = time.monotonic() + self.ttl if self.ttl else None
+        with self._lock:
+            self._entries[key] = (expires_at, copy.deepcopy(value))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'backend': self.name,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'size': len(self._entries),
+                'max_entries': self.max_entries,
+                'hit_rate': round(self.hits / total, 4) if total else 0.0,
+            }
+
+
+class DjangoResultCache:
+    """
+    Backend nad Django cache frameworkem
+
+    Počítadla hits/misses jsou lokální pro proces, vyřazování záznamů
+    řídí samotný cache server (evictions proto nejsou známé).
+    """
+
+    name = 'django'
+
+    def __init__(self, alias: str = 'default', ttl: Optional[float] = 300):
+        self.alias = alias
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def _cache(self):
+        from django.core.cache import caches
+        return caches[self.alias]
+
+    def get(self, key: str) -> Optional[Dict]:
+        value = self._cache.get(key)
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def set(self, key: str, value: Dict) -> None:
+        # Django chápe timeout=0 jako okamžitou expiraci, None jako "bez expirace"
+        self._cache.set(key, value, timeout=self.ttl or None)
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'backend': self.name,
+                'alias': self.alias,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': None,
+                'hit_rate': round(self.hits / total, 4) if total else 0.0,
+            }
+
+
+BACKENDS = {
+    InProcessResultCache.name: InProcessResultCache,
+    DjangoResultCache.name: DjangoResultCache,
+}
+
+_result_cache = None
+_result_cache_lock = threading.Lock()
+
+
+def get_result_cache():
+    """Vrátí (a při prvním volání vytvoří) cache podle AWJ_CALCULATOR['RESULT_CACHE']"""
+    global _result_cache
+
+    if _result_cache is None:
+        with _result_cache_lock:
+            if _result_cache is None:
+                config = settings.AWJ_CALCULATOR.get('RESULT_CACHE', {})
+                backend = config.get('BACKEND', InProcessResultCache.name)
+                if backend not in BACKENDS:
+                    raise ValueError(f"Neznámý backend cache výsledků: {backend}")
+
+                if backend == DjangoResultCache.name:
+                    _result_cache = DjangoResultCache(
+                        alias=config.get('ALIAS', 'default'),
+                        ttl=config.get('TTL', 300)
+                    )
+                else:
+                    _result_cache = InProcessResultCache(
+                        max_entries=config.get('MAX_ENTRIES', 1024),
+                        ttl=config.get('TTL', 300)
+                    )
+
+    return _result_cache
+
+
+def cached_full_calculation(params: Dict) -> Tuple[Dict, bool]:
+    """
+    perform_full_calculation s cache výsledků
+
+    Returns:
+        (výsledky, True pokud byly nalezeny v cache)
+    """
+    cache = get_result_cache()
+    normalized = normalize_parameters(params)
+    material_type = normalized['material_type']
+    material = None
+    if material_type not in AWJCalculationService.MATERIAL_PROPERTIES:
+        material = AWJCalculationService.material_properties(material_type)
+    key = make_key(normalized, material)
+
+    results = cache.get(key)
+    if results is not None:
+        return results, True
+
+    results = AWJCalculationService.perform_full_calculation(normalized)
+    cache.set(key, results)
+    return results, False
@@ -0,0 +1,303 @@
+"""
+AWJ Calculations App - Model Calibration
+Kalibrace koeficientů modelů z naměřených výsledků (AWJCalculation.measured_*)
+
+Modely v services.py jsou mocninné zákony, v logaritmech jsou lineární:
+
+- rychlost: ln(V / (60 · korekce trysek)) = ln(k · σ^-d) + a·ln P + b·ln m - c·ln t
+- drsnost:  ln(Ra / 2) = ln(rf) + e_v·ln V - e_m·ln m - e_mesh·ln mesh
+- hloubka:  ln(h · V^0.5 / (P^1.5 · m^0.8)) = ln(depth_factor · k)
+
+Pro každý materiál se řeší lineární nejmenší čtverce. Tabulka výpočtů se čte
+po blocích (iterator) a z každého bloku se vektorizovaně přičtou normální
+rovnice XᵀX, Xᵀy, yᵀy po materiálech - paměť nezávisí na počtu výpočtů
+a chyby před/po kalibraci se spočítají ze stejných součtů bez druhého
+průchodu. Exponenty jsou regularizované (ridge) k současným hodnotám, aby
+data s malým rozptylem vstupů (např. jediný tlak) exponenty nerozházela;
+exponent pevnosti d nejde pro jeden materiál (konstantní σ) určit a zůstává.
+
+Nafitované sady se ukládají jako MaterialCalibration; aktivní sada se načte
+do snapshotu materiálů (materials.py) a výpočty 'material:<id>' ji použijí.
+Vestavěné typy ('steel', ...) zůstávají beze změny.
+"""
+
+import logging
+from collections import defaultdict
+from itertools import islice
+from typing import Callable, Dict, Iterable, Optional
+
+import numpy as np
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+
+from .materials import get_material_snapshot, material_key
+from .models import AWJCalculation, MaterialCalibration
+from .services import AWJCalculationService
+
+logger = logging.getLogger(__name__)
+
+
+# Sloupce čtené z tabulky výpočtů (pořadí = pořadí ve values_list)
+COLUMNS = (
+    'material_id', 'thickness', 'pressure', 'nozzle_diameter', 'focus_diameter', 'abrasive_flow',
+    'abrasive__mesh_size', 'cutting_speed', 'measured_speed', 'measured_roughness', 'measured_depth',
+)
+
+# Kalibrované modely: exponenty regresorů (pořadí sloupců X za absolutním členem)
+MODELS = {
+    'speed': ('pressure_exponent', 'abrasive_exponent', 'thickness_exponent'),
+    'roughness': ('roughness_speed_exponent', 'roughness_abrasive_exponent', 'roughness_mesh_exponent'),
+    'depth': (),
+}
+
+
+def calibration_config() -> Dict:
+    config = {'CHUNK_SIZE': 20000, 'MIN_SAMPLES': 20, 'RIDGE': 1.0}
+    config.update(settings.AWJ_CALCULATOR.get('CALIBRATION', {}))
+    return config
+
+
+def _design(model: str, chunk: Dict[str, np.ndarray]):
+    """
+    Regresory a cíl modelu pro blok výpočtů
+
+    Returns:
+        (maska použitých řádků, X (N x 1+p), y (N))
+    """
+    # Drsnost a hloubka se vztahují ke skutečné rychlosti, pokud je známa
+    speed = np.where(chunk['measured_speed'] > 0, chunk['measured_speed'], chunk['cutting_speed'])
+    with np.errstate(divide='ignore', invalid='ignore'):
+        log_p = np.log(chunk['pressure'])
+        log_m = np.log(chunk['abrasive_flow'])
+        log_v = np.log(speed)
+
+        if model == 'speed':
+            correction = 1 + 0.1 * (chunk['focus_diameter'] / chunk['nozzle_diameter'] - 3.0)
+            mask = (chunk['measured_speed'] > 0) & (correction > 0)
+            X = [log_p, log_m, -np.log(chunk['thickness'])]
+            y = np.log(chunk['measured_speed']) - np.log(60 * correction)
+        elif model == 'roughness':
+            mask = (chunk['measured_roughness'] > 0) & (speed > 0)
+            X = [log_v, -log_m, -np.log(chunk['mesh_size'])]
+            y = np.log(chunk['measured_roughness']) - np.log(2.0)
+        else:
+            mask = (chunk['measured_depth'] > 0) & (speed > 0)
+            X = []
+            y = np.log(chunk['measured_depth']) - 1.5 * log_p - 0.8 * log_m + 0.5 * log_v
+
+    mask &= (chunk['pressure'] > 0) & (chunk['abrasive_flow'] > 0) & (chunk['thickness'] > 0)
+    X = np.column_stack([np.ones(int(mask.sum()))] + [column[mask] for column in X])
+    return mask, X, y[mask]
+
+
+class NormalEquations:
+    """Průběžné součty XᵀX, Xᵀy, yᵀy a počet řádků jedné skupiny"""
+
+    def __init__(self, size: int):
+        self.xtx = np.zeros((size, size))
+        self.xty = np.zeros(size)
+        self.yty = 0.0
+        self.n = 0
+
+    def sse(self, beta: np.ndarray) -> float:
+        """Součet čtverců reziduí pro koeficienty beta (ze součtů)"""
+        return float(self.yty - 2 * beta @ self.xty + beta @ self.xtx @ beta)
+
+    def solve(self, prior: np.ndarray, ridge: float) -> np.ndarray:
+        """Ridge řešení; absolutní člen regularizovaný není"""
+        penalty = np.full(len(prior), float(ridge))
+        penalty[0] = 0.0
+        return np.linalg.solve(self.xtx + np.diag(penalty), self.xty + penalty * prior)
+
+
+def _accumulate(sums: Dict, groups: np.ndarray, X: np.ndarray, y: np.ndarray, size: int) -> None:
+    """Přičte blok k normálním rovnicím po skupinách (bincount místo smyčky přes řádky)"""
+    if not len(y):
+        return
+    keys, inverse = np.unique(groups, return_inverse=True)
+    count = len(keys)
+    xtx = np.empty((count, size, size))
+    for i in range(size):
+        for j in range(i, size):
+            xtx[:, i, j] = xtx[:, j, i] = np.bincount(inverse, weights=X[:, i] * X[:, j], minlength=count)
+    xty = np.stack([np.bincount(inverse, weights=X[:, i] * y, minlength=count) for i in range(size)], axis=1)
+    yty = np.bincount(inverse, weights=y * y, minlength=count)
+    n = np.bincount(inverse, minlength=count)
+
+    for g, key in enumerate(keys.tolist()):
+        equations = sums.get(key)
+        if equations is None:
+            equations = sums[key] = NormalEquations(size)
+        equations.xtx += xtx[g]
+        equations.xty += xty[g]
+        equations.yty += yty[g]
+        equations.n += int(n[g])
+
+
+def _chunks(queryset, chunk_size: int) -> Iterable[Dict[str, np.ndarray]]:
+    rows = queryset.values_list(*COLUMNS).iterator(chunk_size=chunk_size)
+    while True:
+        block = list(islice(rows, chunk_size))
+        if not block:
+            return
+        array = np.array(block, dtype=np.float64)  # None -> nan
+        chunk = {name: array[:, i] for i, name in enumerate(COLUMNS)}
+        mesh_size = chunk.pop('abrasive__mesh_size')
+        chunk['mesh_size'] = np.where(np.isnan(mesh_size), 80.0, mesh_size)  # bez abraziva jako výpočet
+        yield chunk
+
+
+def collect_normal_equations(
+    queryset=None,
+    chunk_size: Optional[int] = None,
+    progress: Optional[Callable[[float], None]] = None
+) -> Dict[str, Dict[int, NormalEquations]]:
+    """
+    Normální rovnice všech modelů po materiálech jedním průchodem tabulkou
+
+    Returns:
+        {model: {material_id: NormalEquations}}
+    """
+    chunk_size = chunk_size or calibration_config()['CHUNK_SIZE']
+    if queryset is None:
+        queryset = AWJCalculation.objects.all()
+    queryset = queryset.filter(material__isnull=False).filter(
+        Q(measured_speed__isnull=False) | Q(measured_roughness__isnull=False) | Q(measured_depth__isnull=False)
+    ).order_by()
+
+    total = queryset.count() if progress else 0
+    done = 0
+    sums = {model: {} for model in MODELS}
+    for chunk in _chunks(queryset, chunk_size):
+        for model, exponents in MODELS.items():
+            mask, X, y = _design(model, chunk)
+            _accumulate(sums[model], chunk['material_id'][mask].astype(np.int64), X, y, 1 + len(exponents))
+        done += len(chunk['material_id'])
+        if progress and total:
+            progress(min(done / total, 1.0))
+    return sums
+
+
+def _prior(model: str, coefficients: Dict) -> np.ndarray:
+    """Současné koeficienty materiálu ve tvaru beta modelu"""
+    if model == 'speed':
+        intercept = np.log(coefficients['k']) - coefficients['strength_exponent'] * np.log(coefficients['strength'])
+    elif model == 'roughness':
+        intercept = np.log(coefficients['roughness_factor'])
+    else:
+        intercept = np.log(coefficients['depth_factor'] * coefficients['k'])
+    return np.array([intercept] + [coefficients[name] for name in MODELS[model]])
+
+
+def fit_material(equations: Dict[str, NormalEquations], coefficients: Dict, min_samples: int, ridge: float):
+    """
+    Nafituje modely jednoho materiálu
+
+    Args:
+        equations: {model: NormalEquations} materiálu
+        coefficients: Současné koeficienty (AWJCalculationService.material_coefficients)
+
+    Returns:
+        (nafitované koeficienty, metriky {model: ...})
+    """
+    fitted, metrics = {}, {}
+    for model in MODELS:
+        sums = equations.get(model)
+        samples = sums.n if sums is not None else 0
+        if samples < min_samples:
+            metrics[model] = {'samples': samples, 'status': 'insufficient_samples'}
+            continue
+
+        prior = _prior(model, coefficients)
+        beta = sums.solve(prior, ridge)
+        if model == 'depth':
+            # hloubka sdílí k s rychlostí - faktor se vztáhne k nově nafitovanému k
+            k = fitted.get('k', coefficients['k'])
+            values = {'depth_factor': float(np.exp(beta[0]) / k)}
+        else:
+            if np.any(beta[1:] <= 0):
+                metrics[model] = {'samples': samples, 'status': 'rejected', 'exponents': beta[1:].round(4).tolist()}
+                continue
+            values = dict(zip(MODELS[model], beta[1:].tolist()))
+            if model == 'speed':
+                values['k'] = float(np.exp(beta[0]) * coefficients['strength'] ** coefficients['strength_exponent'])
+            else:
+                values['roughness_factor'] = float(np.exp(beta[0]))
+
+        fitted.update({name: round(value, 6) for name, value in values.items()})
+        metrics[model] = {
+            'samples': samples,
+            'status': 'fitted',
+            # RMSE v log prostoru ≈ relativní chyba modelu
+            'rmse_log_before': round(float(np.sqrt(max(sums.sse(prior), 0.0) / samples)), 6),
+            'rmse_log_after': round(float(np.sqrt(max(sums.sse(beta), 0.0) / samples)), 6),
+        }
+    return fitted, metrics
+
+
+def calibrate(
+    material_ids: Optional[Iterable[int]] = None,
+    since=None,
+    activate: bool = True,
+    dry_run: bool = False,
+    progress: Optional[Callable[[float], None]] = None
+) -> Dict:
+    """
+    Kalibrace materiálů z naměřených výsledků
+
+    Nová sada se uloží pro každý materiál, u kterého se podařilo nafitovat
+    aspoň jeden model; s activate nahradí dosud aktivní sadu (nafitované
+    modely přepíšou jen své koeficienty, ostatní zůstanou z aktivní sady).
+
+    Args:
+        material_ids: Jen vybrané materiály (výchozí všechny)
+        since: Jen výpočty vytvořené od data
+        dry_run: Nic neukládat, jen vrátit výsledky
+
+    Returns:
+        {'materials': {id: {'coefficients', 'metrics', 'calibration_id'}}, 'calibrated': počet}
+    """
+    config = calibration_config()
+    queryset = AWJCalculation.objects.all()
+    if material_ids is not None:
+        queryset = queryset.filter(material_id__in=list(material_ids))
+    if since is not None:
+        queryset = queryset.filter(created_at__date__gte=since)
+
+    sums = collect_normal_equations(queryset, config['CHUNK_SIZE'], progress)
+    by_material = defaultdict(dict)
+    for model, groups in sums.items():
+        for material_id, equations in groups.items():
+            by_material[material_id][model] = equations
+
+    snapshot = get_material_snapshot()
+    results, calibrated = {}, 0
+    for material_id, equations in sorted(by_material.items()):
+        key = material_key(material_id)
+        if snapshot.get(key) is None:
+            continue
+        current = AWJCalculationService.material_coefficients(key)
+        fitted, metrics = fit_material(equations, current, config['MIN_SAMPLES'], config['RIDGE'])
+        result = {'coefficients': fitted, 'metrics': metrics, 'calibration_id': None}
+        results[material_id] = result
+        if not fitted or dry_run:
+            continue
+
+        with transaction.atomic():
+            active = MaterialCalibration.objects.filter(material_id=material_id, is_active=True)
+            previous = active.values_list('coefficients', flat=True).first() or {}
+            if activate:
+                active.update(is_active=False)
+            calibration = MaterialCalibration.objects.create(
+                material_id=material_id,
+                coefficients={**previous, **fitted},
+                metrics=metrics,
+                samples=max(m['samples'] for m in metrics.values()),
+                is_active=activate,
+            )
+        result['calibration_id'] = calibration.pk
+        calibrated += 1
+
+    logger.info("Kalibrace: %s materiálů nafitováno z %s", calibrated, len(results))
+    return {'materials': results, 'calibrated': calibrated}
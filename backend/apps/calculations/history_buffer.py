@@ -0,0 +1,225 @@
+"""
+AWJ Calculations App - Write-behind History Buffer
+Odložený zápis výsledků quick_calculate do historie (AWJCalculation)
+
+Request jen přidá záznam do paměťového bufferu a vrátí odpověď. Vlákno
+na pozadí buffer vyprázdní jedním bulk_create, jakmile:
+- počet záznamů dosáhne MAX_SIZE,
+- od posledního zápisu uplyne FLUSH_INTERVAL sekund,
+- proces končí (atexit).
+
+Buffer je per proces. Při pádu procesu se ztratí nejvýše záznamy
+z posledního intervalu; pokud zápisy nestíhají, záznamy nad MAX_PENDING
+se zahodí (a započítají do 'dropped') - request nikdy nečeká na DB.
+"""
+
+import atexit
+import logging
+import os
+import threading
+from typing import Dict, List, Optional
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+
+from .materials import MATERIAL_KEY_PREFIX, is_material_key, material_key
+from .models import AWJCalculation, Material, AbrasiveMaterial
+from .rollups import record_calculations, rollups_config
+
+logger = logging.getLogger(__name__)
+
+
+def history_buffer_config() -> Dict:
+    config = {'ENABLED': True, 'MAX_SIZE': 500, 'FLUSH_INTERVAL': 2.0, 'MAX_PENDING': 50000}
+    config.update(settings.AWJ_CALCULATOR.get('HISTORY_BUFFER', {}))
+    return config
+
+
+class HistoryWriteBuffer:
+    """
+    Paměťový buffer záznamů historie s periodickým bulk_create
+
+    Args:
+        max_size: Počet záznamů, po kterém se buffer hned vyprázdní
+        flush_interval: Nejdelší doba [s] mezi zápisy
+        max_pending: Horní mez záznamů čekajících na zápis
+    """
+
+    def __init__(self, max_size: int = 500, flush_interval: float = 2.0, max_pending: int = 50000):
+        self.max_size = max_size
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+
+        self._records: List[Dict] = []
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._pid = None
+
+        self.written = 0
+        self.dropped = 0
+        self.flushes = 0
+
+    def add(self, record: Dict) -> bool:
+        """
+        Přidá záznam (hodnoty polí AWJCalculation + material_type, abrasive_id)
+
+        Returns:
+            False, pokud byl záznam zahozen kvůli plnému bufferu
+        """
+        self._ensure_thread()
+        with self._lock:
+            if len(self._records) >= self.max_pending:
+                self.dropped += 1
+                return False
+            self._records.append(record)
+            full = len(self._records) >= self.max_size
+
+        if full:
+            self._wakeup.set()
+        return True
+
+    def _ensure_thread(self) -> None:
+        # Vlákno nepřežije fork (gunicorn --preload) - spustí se znovu v potomkovi
+        if self._thread is not None and self._pid == os.getpid() and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is not None and self._pid == os.getpid() and self._thread.is_alive():
+                return
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name='awj-history-buffer', daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("Zápis historie výpočtů selhal")
+            finally:
+                close_old_connections()
+
+    def flush(self) -> int:
+        """Zapíše všechny čekající záznamy, vrátí jejich počet"""
+        with self._flush_lock:
+            with self._lock:
+                records, self._records = self._records, []
+            if not records:
+                return 0
+
+            instances = self._build_instances(records)
+            batch_size = settings.AWJ_CALCULATOR.get('BULK_CREATE_BATCH_SIZE', 1000)
+            with transaction.atomic():
+                created = AWJCalculation.objects.bulk_create(instances, batch_size=batch_size)
+                if rollups_config()['INCREMENTAL']:
+                    record_calculations(created)
+
+            self.written += len(created)
+            self.flushes += 1
+            return len(created)
+
+    @staticmethod
+    def _build_instances(records: List[Dict]) -> List[AWJCalculation]:
+        """
+        Materiály a abraziva se dohledají jedním dotazem na celý blok
+
+        Cizí klíč se vyplní jen pro materiál z databáze ('material:<id>')
+        a abrazivo zvolené v požadavku (abrasive_id). Vestavěný typ nebo
+        pouhý mesh neodpovídá žádnému konkrétnímu záznamu - zůstane NULL.
+        """
+        ids = {
+            int(r['material_type'][len(MATERIAL_KEY_PREFIX):])
+            for r in records if is_material_key(r['material_type'])
+        }
+        materials = {
+            material_key(material.pk): material
+            for material in Material.objects.filter(pk__in=ids)
+        } if ids else {}
+        abrasive_ids = {r['abrasive_id'] for r in records if r.get('abrasive_id') is not None}
+        abrasives = AbrasiveMaterial.objects.in_bulk(abrasive_ids) if abrasive_ids else {}
+
+        instances = []
+        for record in records:
+            fields = dict(record)
+            fields['material'] = materials.get(fields.pop('material_type'))
+            fields['abrasive'] = abrasives.get(fields.pop('abrasive_id', None))
+            instances.append(AWJCalculation(**fields))
+        return instances
+
+    def stats(self) -> Dict:
+        with self._lock:
+            pending = len(self._records)
+        return {
+            'pending': pending,
+            'written': self.written,
+            'dropped': self.dropped,
+            'flushes': self.flushes,
+            'max_size': self.max_size,
+            'flush_interval': self.flush_interval,
+        }
+
+
+_history_buffer = None
+_history_buffer_lock = threading.Lock()
+
+
+def get_history_buffer() -> HistoryWriteBuffer:
+    """Vrátí (a při prvním volání vytvoří) buffer podle AWJ_CALCULATOR['HISTORY_BUFFER']"""
+    global _history_buffer
+
+    if _history_buffer is None:
+        with _history_buffer_lock:
+            if _history_buffer is None:
+                config = history_buffer_config()
+                _history_buffer = HistoryWriteBuffer(
+                    max_size=config['MAX_SIZE'],
+                    flush_interval=config['FLUSH_INTERVAL'],
+                    max_pending=config['MAX_PENDING'],
+                )
+                atexit.register(_flush_on_exit)
+    return _history_buffer
+
+
+def _flush_on_exit() -> None:
+    if _history_buffer is None:
+        return
+    try:
+        _history_buffer.flush()
+    except Exception:
+        logger.exception("Zápis historie výpočtů při ukončení procesu selhal")
+
+
+def save_quick_calculation(parameters: Dict, results: Dict, user=None, calculation_time: float = None) -> bool:
+    """
+    Uloží výsledek quick_calculate do historie
+
+    Přes write-behind buffer, nebo synchronně při HISTORY_BUFFER['ENABLED'] = False.
+    """
+    record = {
+        'user_id': user.pk if user is not None and user.is_authenticated else None,
+        'material_type': parameters['material_type'],
+        'abrasive_id': parameters.get('abrasive_id'),
+        'thickness': parameters['thickness'],
+        'pressure': parameters['pressure'],
+        'nozzle_diameter': parameters.get('nozzle_diameter', 0.33),
+        'focus_diameter': parameters.get('focus_diameter', 1.0),
+        'focus_length': parameters.get('focus_length', 76),
+        'abrasive_flow': parameters.get('abrasive_flow', 8),
+        'water_flow': results['water_flow'],
+        'hydraulic_power': results['hydraulic_power'],
+        'cutting_speed': results['cutting_speed'],
+        'cut_depth': results['cut_depth'],
+        'surface_roughness': results['surface_roughness'],
+        'cost_per_meter': results['cost_per_meter'],
+        'extended_results': results.get('extended', {}),
+        'calculation_time': calculation_time,
+    }
+
+    if not history_buffer_config()['ENABLED']:
+        HistoryWriteBuffer._build_instances([record])[0].save()
+        return True
+
+    return get_history_buffer().add(record)
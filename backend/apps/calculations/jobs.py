@@ -0,0 +1,327 @@
+"""
+AWJ Calculations App - Asynchronous Jobs
+Asynchronní výpočetní úlohy (optimalizace, velké batch výpočty, kalibrace)
+
+Úloha se uloží jako CalculationJob a předá backendu:
+- 'thread' - ThreadPoolExecutor v procesu serveru, nepotřebuje broker
+             (NumPy během výpočtů uvolňuje GIL, úlohy běží paralelně)
+- 'celery' - Celery worker (viz backend/core/celery.py a tasks.py)
+
+Průběh a zrušení jsou kooperativní: handler volá progress() mezi bloky
+výpočtu, který zapíše průběh a při požadavku na zrušení vyhodí JobCancelled.
+
+Trvanlivé jsou jen úlohy Celery (drží je broker). Úlohy thread backendu
+zaniknou s procesem; po restartu je obnoví recover_jobs() (automaticky při
+prvním požadavku procesu, nebo příkazem awj_recover_jobs).
+"""
+
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+from django.conf import settings
+from django.core.signals import request_started
+from django.db import DatabaseError, close_old_connections, transaction
+from django.utils import timezone
+
+from .models import CalculationJob
+from .services import AWJCalculationService, AWJOptimizationService
+
+logger = logging.getLogger(__name__)
+
+
+class JobCancelled(Exception):
+    """Úloha byla zrušena uživatelem"""
+
+
+def jobs_config() -> Dict:
+    return settings.AWJ_CALCULATOR.get('JOBS', {})
+
+
+def _concatenate_results(chunks: List[Dict]) -> Dict:
+    """Spojí struct-of-arrays výsledky jednotlivých bloků"""
+    if len(chunks) == 1:
+        return chunks[0]
+
+    results = {
+        key: np.concatenate([chunk[key] for chunk in chunks])
+        for key in chunks[0] if key != 'extended'
+    }
+    results['extended'] = {
+        key: np.concatenate([chunk['extended'][key] for chunk in chunks])
+        for key in chunks[0]['extended']
+    }
+    return results
+
+
+def evaluate_batch(
+    base_parameters: Dict,
+    variations: List[Dict],
+    columns: Dict,
+    response_format: str = 'records',
+    progress: Optional[Callable[[float], None]] = None,
+    chunk_size: Optional[int] = None
+) -> Dict:
+    """
+    Spočítá batch variant (viz BatchCalculationSerializer) a sestaví odpověď
+
+    Sloupce se vyhodnocují po blocích chunk_size řádků, mezi bloky se volá
+    progress(podíl hotových řádků).
+    """
+    size = len(variations) + 1
+    chunk_size = chunk_size or size
+    columns = {name: np.asarray(column) for name, column in columns.items()}
+
+    chunks = []
+    for start in range(0, size, chunk_size):
+        chunk_columns = {name: column[start:start + chunk_size] for name, column in columns.items()}
+        chunks.append(AWJCalculationService.perform_full_calculation_batch(chunk_columns))
+        if progress:
+            progress(min(start + chunk_size, size) / size)
+
+    batch_results = _concatenate_results(chunks)
+    variant_names = ['base'] + [f'variation_{i+1}' for i in range(len(variations))]
+
+    if response_format == 'columnar':
+        return {
+            'total_variants': size,
+            'variants': variant_names,
+            'parameters': {name: column.tolist() for name, column in columns.items()},
+            'results': AWJCalculationService.batch_results_to_columns(batch_results),
+        }
+
+    records = AWJCalculationService.batch_results_to_records(batch_results)
+    return {
+        'total_variants': size,
+        'results': [
+            {
+                'variant': name,
+                'parameters': {**base_parameters, **variation},
+                'results': variant_results
+            }
+            for name, variation, variant_results in zip(variant_names, [{}] + variations, records)
+        ],
+    }
+
+
+def _run_batch_job(parameters: Dict, progress: Callable[[float], None]) -> Dict:
+    return evaluate_batch(
+        parameters['base_parameters'],
+        parameters['variations'],
+        parameters['columns'],
+        parameters.get('response_format', 'records'),
+        progress=progress,
+        chunk_size=jobs_config().get('CHUNK_SIZE', 5000),
+    )
+
+
+def _run_optimize_job(parameters: Dict, progress: Callable[[float], None]) -> Dict:
+    progress(0.0)
+    return AWJOptimizationService.optimize(**parameters, progress=progress)
+
+
+def _run_calibrate_job(parameters: Dict, progress: Callable[[float], None]) -> Dict:
+    from .calibration import calibrate
+    return calibrate(progress=progress, **parameters)
+
+
+JOB_HANDLERS = {
+    'batch': _run_batch_job,
+    'optimize': _run_optimize_job,
+    'calibrate': _run_calibrate_job,
+}
+
+
+def _update(job_id, **fields) -> None:
+    CalculationJob.objects.filter(pk=job_id).update(**fields)
+
+
+def _finish(job_id, **fields) -> bool:
+    """
+    Zapíše koncový stav běžící úlohy
+
+    Zápis je podmíněný stavem running - úlohu, kterou mezitím označila
+    obnova po restartu jako selhanou nebo která byla zrušena, nepřepíše.
+    """
+    return bool(CalculationJob.objects.filter(
+        pk=job_id, status=CalculationJob.STATUS_RUNNING
+    ).update(finished_at=timezone.now(), **fields))
+
+
+def execute_job(job_id) -> None:
+    """Provede úlohu (volá backend ve vlákně / Celery worker)"""
+    close_old_connections()
+    try:
+        try:
+            job = CalculationJob.objects.get(pk=job_id)
+        except CalculationJob.DoesNotExist:
+            logger.warning("Úloha %s neexistuje", job_id)
+            return
+
+        if job.is_finished:
+            return
+        if job.cancel_requested:
+            CalculationJob.objects.filter(pk=job_id, status=CalculationJob.STATUS_PENDING).update(
+                status=CalculationJob.STATUS_CANCELLED, finished_at=timezone.now()
+            )
+            return
+
+        started = CalculationJob.objects.filter(
+            pk=job_id, status=CalculationJob.STATUS_PENDING
+        ).update(status=CalculationJob.STATUS_RUNNING, started_at=timezone.now())
+        if not started:
+            return
+
+        def progress(fraction: float) -> None:
+            # Zrušená nebo mezitím ukončená úloha (obnova po restartu) už nepokračuje
+            state = CalculationJob.objects.filter(pk=job_id).values_list(
+                'status', 'cancel_requested'
+            ).first()
+            if state is None or state[1] or state[0] != CalculationJob.STATUS_RUNNING:
+                raise JobCancelled()
+            _update(job_id, progress=round(fraction * 100, 1))
+
+        try:
+            result = JOB_HANDLERS[job.kind](job.parameters, progress)
+        except JobCancelled:
+            _finish(job_id, status=CalculationJob.STATUS_CANCELLED)
+        except Exception as exc:
+            logger.exception("Úloha %s selhala", job_id)
+            _finish(job_id, status=CalculationJob.STATUS_FAILED, error=str(exc))
+        else:
+            _finish(job_id, status=CalculationJob.STATUS_SUCCEEDED, result=result, progress=100.0)
+    finally:
+        close_old_connections()
+
+
+class ThreadJobBackend:
+    """Backend bez brokeru - úlohy běží v ThreadPoolExecutor procesu serveru"""
+
+    name = 'thread'
+
+    def __init__(self, max_workers: int = 2):
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='awj-job')
+
+    def submit(self, job_id) -> None:
+        self.executor.submit(execute_job, job_id)
+
+
+class CeleryJobBackend:
+    """Backend předávající úlohy Celery workerům"""
+
+    name = 'celery'
+
+    def submit(self, job_id) -> None:
+        from .tasks import run_calculation_job
+        run_calculation_job.delay(str(job_id))
+
+
+_job_backend = None
+_job_backend_lock = threading.Lock()
+
+
+def get_job_backend():
+    """Vrátí (a při prvním volání vytvoří) backend podle AWJ_CALCULATOR['JOBS']"""
+    global _job_backend
+
+    if _job_backend is None:
+        with _job_backend_lock:
+            if _job_backend is None:
+                config = jobs_config()
+                backend = config.get('BACKEND', ThreadJobBackend.name)
+                if backend == CeleryJobBackend.name:
+                    _job_backend = CeleryJobBackend()
+                elif backend == ThreadJobBackend.name:
+                    _job_backend = ThreadJobBackend(max_workers=config.get('MAX_WORKERS', 2))
+                else:
+                    raise ValueError(f"Neznámý backend úloh: {backend}")
+
+    return _job_backend
+
+
+def submit_job(kind: str, parameters: Dict, user=None) -> CalculationJob:
+    """Uloží úlohu a po commitu transakce ji předá backendu"""
+    if kind not in JOB_HANDLERS:
+        raise ValueError(f"Neznámý typ úlohy: {kind}")
+
+    job = CalculationJob.objects.create(kind=kind, parameters=parameters, user=user)
+    transaction.on_commit(lambda: get_job_backend().submit(job.pk))
+    return job
+
+
+def cancel_job(job: CalculationJob) -> CalculationJob:
+    """Požádá o zrušení; čekající úloha se zruší okamžitě"""
+    if job.is_finished:
+        return job
+
+    CalculationJob.objects.filter(pk=job.pk).update(cancel_requested=True)
+    CalculationJob.objects.filter(pk=job.pk, status=CalculationJob.STATUS_PENDING).update(
+        status=CalculationJob.STATUS_CANCELLED, finished_at=timezone.now()
+    )
+    job.refresh_from_db()
+    return job
+
+
+def recover_jobs(stale_after: Optional[float] = None) -> Dict:
+    """
+    Obnoví úlohy thread backendu přerušené restartem serveru
+
+    Čekající úlohy se znovu předají backendu - execute_job je spustí jen
+    jednou díky podmíněnému přechodu pending -> running, opakované předání
+    je tak neškodné. Běžící úlohy spuštěné před více než stale_after
+    sekundami (výchozí JOBS['STALE_AFTER']) se označí jako selhané.
+
+    Returns:
+        Počty znovu předaných a selhaných úloh
+    """
+    if stale_after is None:
+        stale_after = jobs_config().get('STALE_AFTER', 3600)
+
+    failed = CalculationJob.objects.filter(
+        status=CalculationJob.STATUS_RUNNING,
+        started_at__lt=timezone.now() - timedelta(seconds=stale_after)
+    ).update(
+        status=CalculationJob.STATUS_FAILED,
+        error='Úloha byla přerušena restartem serveru',
+        finished_at=timezone.now()
+    )
+
+    pending = list(CalculationJob.objects.filter(
+        status=CalculationJob.STATUS_PENDING
+    ).values_list('pk', flat=True))
+    backend = get_job_backend()
+    for job_id in pending:
+        backend.submit(job_id)
+
+    if failed or pending:
+        logger.warning("Obnova úloh: %s znovu předáno, %s přerušeno", len(pending), failed)
+    return {'resubmitted': len(pending), 'failed': failed}
+
+
+RECOVERY_DISPATCH_UID = 'awj_recover_jobs'
+
+
+def _recover_on_first_request(**kwargs) -> None:
+    request_started.disconnect(dispatch_uid=RECOVERY_DISPATCH_UID)
+    try:
+        recover_jobs()
+    except DatabaseError:
+        logger.exception("Obnova úloh po restartu selhala")
+
+
+def schedule_recovery() -> None:
+    """
+    Naplánuje recover_jobs() na první požadavek procesu (thread backend)
+
+    Volá se z AppConfig.ready(), kde se do databáze přistupovat nemá;
+    příkazy manage.py tak obnovu nespouští.
+    """
+    config = jobs_config()
+    if config.get('BACKEND', ThreadJobBackend.name) != ThreadJobBackend.name:
+        return
+    if not config.get('RECOVER_ON_STARTUP', True):
+        return
+    request_started.connect(_recover_on_first_request, dispatch_uid=RECOVERY_DISPATCH_UID)
@@ -0,0 +1,75 @@
+"""
+Management command: benchmarky výpočetních a optimalizačních cest
+
+Příklady:
+    python manage.py awj_benchmark --output bench.json
+    python manage.py awj_benchmark --save-baseline benchmarks/baseline.json
+    python manage.py awj_benchmark --baseline benchmarks/baseline.json --threshold 0.2
+
+Časy jsou závislé na stroji - benchmarks/baseline.json platí jen pro prostředí
+uvedené v jeho "environment" (viz docs/modules/calculations_performance.md).
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from backend.apps.calculations.benchmarks import (
+    default_cases, run_benchmarks, compare_with_baseline, load_json, save_json
+)
+
+
+class Command(BaseCommand):
+    help = 'Změří propustnost výpočtů, optimalizátorů, serializerů a endpointů'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--filter', help='Spustit jen případy obsahující tento text')
+        parser.add_argument(
+            '--max-batch', type=int, default=1_000_000,
+            help='Největší měřená velikost batch výpočtu'
+        )
+        parser.add_argument('--output', help='Uložit výsledky jako JSON')
+        parser.add_argument('--baseline', help='Porovnat s baseline JSON')
+        parser.add_argument('--save-baseline', help='Uložit výsledky jako novou baseline')
+        parser.add_argument(
+            '--threshold', type=float, default=0.2,
+            help='Povolené zpomalení vůči baseline (0.2 = 20 %%)'
+        )
+
+    def _report(self, result):
+        rows = f"  {result['rows_per_s']:>14,.0f} řádků/s" if result['rows'] > 1 else ''
+        self.stdout.write(
+            f"{result['name']:<32} median {result['median_s'] * 1e3:>10.3f} ms"
+            f"  min {result['min_s'] * 1e3:>10.3f} ms{rows}"
+        )
+
+    def handle(self, *args, **options):
+        current = run_benchmarks(
+            default_cases(max_batch=options['max_batch']),
+            name_filter=options['filter'],
+            report=self._report
+        )
+
+        regressions = []
+        if options['baseline']:
+            baseline = load_json(options['baseline'])
+            if baseline.get('environment') != current['environment']:
+                self.stderr.write(
+                    f"Baseline pochází z jiného prostředí ({baseline.get('environment')}), "
+                    "porovnání je jen orientační"
+                )
+            regressions = compare_with_baseline(current, baseline, threshold=options['threshold'])
+
+        if options['output']:
+            save_json(options['output'], current)
+        if options['save_baseline']:
+            save_json(options['save_baseline'], current)
+            self.stdout.write(f"Baseline uložena do {options['save_baseline']}")
+
+        if regressions:
+            for result in regressions:
+                self.stderr.write(
+                    f"REGRESE {result['name']}: {result['ratio']:.2f}x pomalejší než baseline"
+                )
+            raise CommandError(f"{len(regressions)} případů překročilo práh {options['threshold']:.0%}")
+
+        if options['baseline']:
+            self.stdout.write(self.style.SUCCESS('Bez regresí vůči baseline'))
@@ -0,0 +1,55 @@
+"""
+Management command: kalibrace koeficientů modelů z naměřených výsledků
+
+Příklady:
+    python manage.py awj_calibrate
+    python manage.py awj_calibrate --material 3 --material 5 --days 90
+    python manage.py awj_calibrate --dry-run
+"""
+
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from backend.apps.calculations.calibration import calibrate
+
+
+class Command(BaseCommand):
+    help = 'Nafituje koeficienty modelů rychlosti, drsnosti a hloubky z naměřených výsledků výpočtů'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--material', type=int, action='append', dest='materials',
+            help='Id materiálu (lze opakovat, výchozí všechny)'
+        )
+        parser.add_argument(
+            '--days', type=int, default=None,
+            help='Jen výpočty z posledních N dní (výchozí celá historie)'
+        )
+        parser.add_argument('--no-activate', action='store_true', help='Uložit sady neaktivní')
+        parser.add_argument('--dry-run', action='store_true', help='Nic neukládat, jen vypsat výsledky')
+
+    def handle(self, *args, **options):
+        since = None
+        if options['days']:
+            since = timezone.localdate() - timedelta(days=options['days'])
+
+        result = calibrate(
+            material_ids=options['materials'],
+            since=since,
+            activate=not options['no_activate'],
+            dry_run=options['dry_run'],
+        )
+
+        for material_id, material in result['materials'].items():
+            self.stdout.write(f"Materiál {material_id}:")
+            for model, metrics in material['metrics'].items():
+                line = f"  {model}: {metrics['samples']} měření, {metrics['status']}"
+                if metrics['status'] == 'fitted':
+                    line += f", RMSE(log) {metrics['rmse_log_before']} -> {metrics['rmse_log_after']}"
+                self.stdout.write(line)
+            if material['coefficients']:
+                self.stdout.write(f"  koeficienty: {material['coefficients']}")
+
+        self.stdout.write(self.style.SUCCESS(f"Kalibrováno materiálů: {result['calibrated']}"))
@@ -0,0 +1,33 @@
+"""
+Management command: přepočet rollupu statistik výpočtů
+
+Příklady:
+    python manage.py awj_rebuild_statistics
+    python manage.py awj_rebuild_statistics --days 7
+"""
+
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from backend.apps.calculations.rollups import rebuild_statistics
+
+
+class Command(BaseCommand):
+    help = 'Přepočítá denní rollup statistik (CalculationDailyStatistics) z uložených výpočtů'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days', type=int, default=None,
+            help='Přepočítat jen posledních N dní (výchozí celá historie)'
+        )
+
+    def handle(self, *args, **options):
+        since = None
+        if options['days']:
+            since = timezone.localdate() - timedelta(days=options['days'])
+
+        rows = rebuild_statistics(since=since)
+        scope = f"od {since}" if since else "celá historie"
+        self.stdout.write(self.style.SUCCESS(f"Rollup přepočítán ({scope}): {rows} řádků"))
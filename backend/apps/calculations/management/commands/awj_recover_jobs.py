@@ -0,0 +1,30 @@
+"""
+Management command: obnova asynchronních úloh po restartu serveru
+
+Úlohy thread backendu zaniknou s procesem serveru. Příkaz znovu předá
+čekající úlohy a běžící úlohy starší než --stale-after označí jako selhané.
+
+Příklady:
+    python manage.py awj_recover_jobs
+    python manage.py awj_recover_jobs --stale-after 600
+"""
+
+from django.core.management.base import BaseCommand
+
+from backend.apps.calculations.jobs import recover_jobs
+
+
+class Command(BaseCommand):
+    help = 'Obnoví čekající a přerušené asynchronní úlohy (CalculationJob) po restartu'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--stale-after', type=float, default=None,
+            help="Běžící úloha starší než N sekund se považuje za přerušenou (výchozí JOBS['STALE_AFTER'])"
+        )
+
+    def handle(self, *args, **options):
+        counts = recover_jobs(stale_after=options['stale_after'])
+        self.stdout.write(self.style.SUCCESS(
+            f"Znovu předáno {counts['resubmitted']} úloh, přerušeno {counts['failed']}"
+        ))
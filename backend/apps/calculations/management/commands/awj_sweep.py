@@ -0,0 +1,83 @@
+"""
+Management command: paralelní sweep přes prostor AWJ parametrů
+
+Příklady:
+    python manage.py awj_sweep --points 12 --workers 8 --output sweep.npz
+    python manage.py awj_sweep --points 12 --benchmark
+"""
+
+import os
+
+import numpy as np
+from django.core.management.base import BaseCommand
+
+from backend.apps.calculations.sweep import SweepRunner, MATERIAL_TYPES
+
+
+class Command(BaseCommand):
+    help = 'Spustí sweep přes všechny materiály a rozsahy parametrů na více jádrech'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--points', type=int, default=10, help='Počet hodnot na osu parametru')
+        parser.add_argument('--workers', type=int, default=None, help='Počet procesů (výchozí počet CPU)')
+        parser.add_argument('--chunk-size', type=int, default=100_000, help='Řádků na blok práce')
+        parser.add_argument('--materials', nargs='+', default=list(MATERIAL_TYPES), choices=MATERIAL_TYPES)
+        parser.add_argument('--output', help='Uložit vstupy a výsledky do .npz souboru')
+        parser.add_argument(
+            '--benchmark', action='store_true',
+            help='Změřit škálování pro 1, 2, 4, ... workerů a vypsat zrychlení'
+        )
+
+    def _axes(self, points):
+        mesh_points = max(2, points // 3)
+        return {
+            'thickness': np.geomspace(0.1, 500, points),
+            'pressure': np.linspace(100, 600, points),
+            'nozzle_diameter': np.linspace(0.2, 0.5, max(2, points // 2)),
+            'focus_diameter': np.linspace(0.6, 1.5, max(2, points // 2)),
+            'abrasive_flow': np.linspace(1, 20, points),
+            'mesh_size': np.linspace(50, 120, mesh_points).round(),
+        }
+
+    def handle(self, *args, **options):
+        axes = self._axes(options['points'])
+        materials = options['materials']
+        rows = SweepRunner.grid_size(axes, materials)
+        self.stdout.write(f"Sweep: {rows:,} kombinací ({len(materials)} materiálů)")
+
+        if options['benchmark']:
+            self._benchmark(axes, materials, options)
+            return
+
+        runner = SweepRunner(workers=options['workers'], chunk_size=options['chunk_size'])
+        sweep = runner.run_grid(axes, materials)
+        stats = runner.last_stats
+        self.stdout.write(self.style.SUCCESS(
+            f"Hotovo za {stats['wall_time_s']} s "
+            f"({stats['workers']} workerů, {stats['chunks']} bloků, "
+            f"{rows / stats['wall_time_s']:,.0f} řádků/s)"
+        ))
+
+        if options['output']:
+            arrays = {f'param_{k}': v for k, v in sweep['parameters'].items() if k != 'material_type'}
+            arrays['param_material_type'] = sweep['parameters']['material_type'].astype(str)
+            arrays.update({f'result_{k}': v for k, v in sweep['results'].items() if k != 'extended'})
+            arrays.update({f'extended_{k}': v for k, v in sweep['results']['extended'].items()})
+            np.savez_compressed(options['output'], **arrays)
+            self.stdout.write(f"Uloženo do {options['output']}")
+
+    def _benchmark(self, axes, materials, options):
+        max_workers = options['workers'] or os.cpu_count() or 1
+        counts = sorted({1, *[2 ** i for i in range(1, max_workers.bit_length())], max_workers})
+
+        baseline = None
+        for workers in counts:
+            runner = SweepRunner(workers=workers, chunk_size=options['chunk_size'])
+            runner.run_grid(axes, materials)
+            wall = runner.last_stats['wall_time_s']
+            baseline = baseline or wall
+            speedup = baseline / wall
+            self.stdout.write(
+                f"workers={workers:3d}  čas={wall:8.3f} s  "
+                f"zrychlení={speedup:5.2f}x  efektivita={speedup / workers:6.1%}"
+            )
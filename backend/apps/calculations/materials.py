@@ -0,0 +1,349 @@
+"""
+AWJ Calculations App - Material Snapshot
+Materiálové konstanty z tabulky Material, katalog abraziv a tarify pro výpočetní engine
+
+Všechny materiály (resp. abraziva, tarify) se načtou jedním dotazem do
+neměnného snapshotu v paměti procesu; výpočty pak do databáze nesahají.
+Snapshot se zahodí:
+- signálem post_save/post_delete na Material / AbrasiveMaterial / TariffProfile
+  (v tomto procesu),
+- změnou razítka verze ve sdílené Django cache (ostatní procesy, kontrola
+  nejvýše jednou za VERSION_CHECK_INTERVAL sekund).
+
+Do snapshotu materiálů se načtou i aktivní kalibrace (MaterialCalibration,
+viz calibration.py) - jejich koeficienty přepíšou k_factor, surface_factor
+a výchozí exponenty modelů.
+
+Engine adresuje materiály z databáze klíčem 'material:<id>', vestavěné typy
+('steel', 'glass', ...) zůstávají v AWJCalculationService.MATERIAL_PROPERTIES
+a snapshot nepotřebují. Abraziva se adresují svým id, tarify názvem.
+"""
+
+import logging
+import threading
+import time
+from typing import Dict, Optional
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .models import Material, AbrasiveMaterial, TariffProfile, MaterialCalibration
+
+logger = logging.getLogger(__name__)
+
+
+MATERIAL_KEY_PREFIX = 'material:'
+VERSION_CACHE_KEY = 'awj:materials:version'
+ABRASIVE_VERSION_CACHE_KEY = 'awj:abrasives:version'
+TARIFF_VERSION_CACHE_KEY = 'awj:tariffs:version'
+
+
+def material_key(material_id: int) -> str:
+    """Klíč materiálu z databáze pro material_type výpočtů"""
+    return f'{MATERIAL_KEY_PREFIX}{material_id}'
+
+
+def is_material_key(material_type) -> bool:
+    return isinstance(material_type, str) and material_type.startswith(MATERIAL_KEY_PREFIX)
+
+
+def material_snapshot_config() -> Dict:
+    config = {'VERSION_CHECK_INTERVAL': 5.0, 'CACHE_ALIAS': 'default'}
+    config.update(settings.AWJ_CALCULATOR.get('MATERIAL_SNAPSHOT', {}))
+    return config
+
+
+class MaterialSnapshot:
+    """Neměnný snapshot materiálových konstant (klíč 'material:<id>') včetně aktivních kalibrací"""
+
+    def __init__(self, entries: Dict[str, Dict], version):
+        self.entries = entries
+        self.version = version
+
+    @classmethod
+    def load(cls, version=None) -> 'MaterialSnapshot':
+        rows = Material.objects.values(
+            'id', 'name', 'type', 'density', 'tensile_strength', 'k_factor', 'surface_factor'
+        )
+        entries = {
+            material_key(row['id']): {
+                'k': row['k_factor'],
+                'density': row['density'],
+                'strength': row['tensile_strength'],
+                'roughness_factor': row['surface_factor'],
+                'type': row['type'],
+                'name': row['name'],
+            }
+            for row in rows
+        }
+        calibrations = MaterialCalibration.objects.filter(is_active=True).values_list('material_id', 'coefficients')
+        for material_id, coefficients in calibrations:
+            entry = entries.get(material_key(material_id))
+            if entry is not None:
+                entry.update({name: float(value) for name, value in coefficients.items()})
+        return cls(entries, version)
+
+    def get(self, material_type: str) -> Optional[Dict]:
+        return self.entries.get(material_type)
+
+    def __len__(self):
+        return len(self.entries)
+
+
+class AbrasiveCatalog:
+    """Neměnný katalog abraziv (klíč = id AbrasiveMaterial)"""
+
+    def __init__(self, entries: Dict[int, Dict], version):
+        self.entries = entries
+        self.version = version
+
+    @classmethod
+    def load(cls, version=None) -> 'AbrasiveCatalog':
+        rows = AbrasiveMaterial.objects.values('id', 'name', 'type', 'mesh_size', 'cost_per_kg')
+        entries = {
+            row['id']: {
+                'mesh_size': row['mesh_size'],
+                'cost_per_kg': float(row['cost_per_kg']),
+                'type': row['type'],
+                'name': row['name'],
+            }
+            for row in rows
+        }
+        return cls(entries, version)
+
+    def get(self, abrasive_id) -> Optional[Dict]:
+        try:
+            return self.entries.get(int(abrasive_id))
+        except (TypeError, ValueError):
+            return None
+
+    def __len__(self):
+        return len(self.entries)
+
+
+class TariffCatalog:
+    """
+    Neměnný katalog tarifů (klíč = název TariffProfile)
+
+    default je název výchozího tarifu (is_default), nebo None.
+    """
+
+    PRICES = ('abrasive_cost_per_kg', 'water_cost_per_m3', 'power_cost_per_kwh')
+
+    def __init__(self, entries: Dict[str, Dict], default: Optional[str], version):
+        self.entries = entries
+        self.default = default
+        self.version = version
+
+    @classmethod
+    def load(cls, version=None) -> 'TariffCatalog':
+        rows = TariffProfile.objects.values('name', 'is_default', *cls.PRICES).order_by('name')
+        entries, default = {}, None
+        for row in rows:
+            entries[row['name']] = {
+                name: float(row[name]) for name in cls.PRICES if row[name] is not None
+            }
+            if row['is_default'] and default is None:
+                default = row['name']
+        return cls(entries, default, version)
+
+    def get(self, name: Optional[str] = None) -> Optional[Dict]:
+        """Ceny tarifu; bez názvu ceny výchozího tarifu (prázdné, pokud žádný není)"""
+        if name is None:
+            return self.entries.get(self.default, {})
+        return self.entries.get(name)
+
+    def __len__(self):
+        return len(self.entries)
+
+
+class MaterialSnapshotCache:
+    """
+    Drží snapshot procesu a hlídá jeho platnost
+
+    Args:
+        loader: Třída snapshotu s metodou load(version)
+        version_key: Klíč razítka verze ve sdílené cache
+    """
+
+    def __init__(
+        self,
+        check_interval: float = 5.0,
+        cache_alias: str = 'default',
+        loader=MaterialSnapshot,
+        version_key: str = VERSION_CACHE_KEY
+    ):
+        self.loader = loader
+        self.version_key = version_key
+        self.check_interval = check_interval
+        self.cache_alias = cache_alias
+        self._snapshot = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+        self.loads = 0
+
+    def _shared_version(self):
+        try:
+            return caches[self.cache_alias].get(self.version_key, 0)
+        except Exception:
+            logger.exception("Nelze přečíst verzi %s ze sdílené cache", self.version_key)
+            return None
+
+    def get(self):
+        snapshot = self._snapshot
+        now = time.monotonic()
+        if snapshot is not None and now - self._checked_at < self.check_interval:
+            return snapshot
+
+        with self._lock:
+            snapshot = self._snapshot
+            if snapshot is not None and now - self._checked_at < self.check_interval:
+                return snapshot
+
+            version = self._shared_version()
+            if snapshot is None or (version is not None and version != snapshot.version):
+                snapshot = self.loader.load(version)
+                self._snapshot = snapshot
+                self.loads += 1
+            self._checked_at = now
+            return snapshot
+
+    def invalidate(self) -> None:
+        """Zahodí snapshot a posune sdílené razítko verze (pro ostatní procesy)"""
+        with self._lock:
+            self._snapshot = None
+        try:
+            cache = caches[self.cache_alias]
+            cache.add(self.version_key, 0, timeout=None)
+            cache.incr(self.version_key)
+        except Exception:
+            logger.exception("Nelze posunout verzi %s ve sdílené cache", self.version_key)
+
+
+_snapshot_cache = None
+_snapshot_cache_lock = threading.Lock()
+
+
+def get_material_snapshot_cache() -> MaterialSnapshotCache:
+    global _snapshot_cache
+
+    if _snapshot_cache is None:
+        with _snapshot_cache_lock:
+            if _snapshot_cache is None:
+                config = material_snapshot_config()
+                _snapshot_cache = MaterialSnapshotCache(
+                    check_interval=config['VERSION_CHECK_INTERVAL'],
+                    cache_alias=config['CACHE_ALIAS'],
+                )
+    return _snapshot_cache
+
+
+def get_material_snapshot() -> MaterialSnapshot:
+    """Aktuální snapshot materiálů procesu"""
+    return get_material_snapshot_cache().get()
+
+
+@receiver(post_save, sender=Material)
+@receiver(post_delete, sender=Material)
+@receiver(post_save, sender=MaterialCalibration)
+@receiver(post_delete, sender=MaterialCalibration)
+def _invalidate_snapshot(sender, **kwargs):
+    get_material_snapshot_cache().invalidate()
+
+
+_abrasive_cache = None
+
+
+def get_abrasive_catalog_cache() -> MaterialSnapshotCache:
+    global _abrasive_cache
+
+    if _abrasive_cache is None:
+        with _snapshot_cache_lock:
+            if _abrasive_cache is None:
+                config = material_snapshot_config()
+                _abrasive_cache = MaterialSnapshotCache(
+                    check_interval=config['VERSION_CHECK_INTERVAL'],
+                    cache_alias=config['CACHE_ALIAS'],
+                    loader=AbrasiveCatalog,
+                    version_key=ABRASIVE_VERSION_CACHE_KEY,
+                )
+    return _abrasive_cache
+
+
+def get_abrasive_catalog() -> AbrasiveCatalog:
+    """Aktuální katalog abraziv procesu"""
+    return get_abrasive_catalog_cache().get()
+
+
+def abrasive_parameters(abrasive_id) -> Optional[Dict]:
+    """
+    Parametry výpočtu pro abrazivo z katalogu (mesh_size, abrasive_cost_per_kg)
+
+    Returns:
+        None, pokud abrazivo neexistuje
+    """
+    abrasive = get_abrasive_catalog().get(abrasive_id)
+    if abrasive is None:
+        return None
+    return {'mesh_size': abrasive['mesh_size'], 'abrasive_cost_per_kg': abrasive['cost_per_kg']}
+
+
+@receiver(post_save, sender=AbrasiveMaterial)
+@receiver(post_delete, sender=AbrasiveMaterial)
+def _invalidate_abrasive_catalog(sender, **kwargs):
+    get_abrasive_catalog_cache().invalidate()
+
+
+_tariff_cache = None
+
+
+def get_tariff_catalog_cache() -> MaterialSnapshotCache:
+    global _tariff_cache
+
+    if _tariff_cache is None:
+        with _snapshot_cache_lock:
+            if _tariff_cache is None:
+                config = material_snapshot_config()
+                _tariff_cache = MaterialSnapshotCache(
+                    check_interval=config['VERSION_CHECK_INTERVAL'],
+                    cache_alias=config['CACHE_ALIAS'],
+                    loader=TariffCatalog,
+                    version_key=TARIFF_VERSION_CACHE_KEY,
+                )
+    return _tariff_cache
+
+
+def get_tariff_catalog() -> TariffCatalog:
+    """Aktuální katalog tarifů procesu"""
+    return get_tariff_catalog_cache().get()
+
+
+def cost_parameters(tariff: Optional[str] = None, abrasive_id=None) -> Dict:
+    """
+    Ceny (a mesh abraziva) pro výpočet nákladů
+
+    Tarif (bez názvu výchozí tarif) určí ceny vody, energie a abraziva;
+    cena vybraného abraziva má přednost před cenou abraziva z tarifu.
+
+    Raises:
+        LookupError: Neexistující tarif nebo abrazivo
+    """
+    prices = get_tariff_catalog().get(tariff)
+    if prices is None:
+        raise LookupError(f"Tarif {tariff} neexistuje")
+    params = dict(prices)
+
+    if abrasive_id is not None:
+        abrasive = abrasive_parameters(abrasive_id)
+        if abrasive is None:
+            raise LookupError(f"Abrazivo {abrasive_id} neexistuje")
+        params.update(abrasive)
+    return params
+
+
+@receiver(post_save, sender=TariffProfile)
+@receiver(post_delete, sender=TariffProfile)
+def _invalidate_tariff_catalog(sender, **kwargs):
+    get_tariff_catalog_cache().invalidate()
@@ -4,9 +4,11 @@ Databázové modely pro ukládání výpočtů a parametrů
 """
 
 from django.db import models
+from django.db.models.functions import Coalesce
 from django.contrib.auth.models import User
 from django.core.validators import MinValueValidator, MaxValueValidator
 import json
+import uuid
 
 
 class Material(models.Model):
@@ -72,6 +74,66 @@ class AbrasiveMaterial(models.Model):
         return f"{self.name} ({self.mesh_size} mesh)"
 
 
+class TariffProfile(models.Model):
+    """
+    Cenový profil (tarif) pro výpočet nákladů na metr řezu
+
+    Profil se volí v požadavku podle názvu; profil s is_default se použije,
+    pokud požadavek žádný neuvede. Prázdná cena abraziva = cena vybraného
+    abraziva, případně výchozí cena výpočtu.
+    """
+
+    name = models.CharField(max_length=100, unique=True)
+    description = models.TextField(blank=True)
+
+    water_cost_per_m3 = models.DecimalField(
+        max_digits=10, decimal_places=2, default=100, help_text="Cena vody [Kč/m³]"
+    )
+    power_cost_per_kwh = models.DecimalField(
+        max_digits=10, decimal_places=2, default=4, help_text="Cena elektrické energie [Kč/kWh]"
+    )
+    abrasive_cost_per_kg = models.DecimalField(
+        max_digits=10, decimal_places=2, null=True, blank=True, help_text="Cena abraziva [Kč/kg]"
+    )
+    is_default = models.BooleanField(default=False, help_text="Výchozí tarif pro požadavky bez tarifu")
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['name']
+        verbose_name = "Tarif"
+        verbose_name_plural = "Tarify"
+
+    def __str__(self):
+        return self.name
+
+
+class MaterialCalibration(models.Model):
+    """
+    Koeficienty modelů nafitované z naměřených výsledků výpočtů materiálu
+
+    Aktivní (is_active) sada se načte do snapshotu materiálů a přepíše
+    výchozí koeficienty (AWJCalculationService.MODEL_COEFFICIENTS) i k_factor
+    a surface_factor materiálu. Pro materiál je aktivní nejvýše jedna sada.
+    """
+
+    material = models.ForeignKey(Material, on_delete=models.CASCADE, related_name='calibrations')
+    coefficients = models.JSONField(help_text="Nafitované koeficienty (k, exponenty, faktory)")
+    metrics = models.JSONField(default=dict, blank=True, help_text="Počty vzorků a chyby před/po kalibraci")
+    samples = models.IntegerField(default=0, help_text="Počet výpočtů s naměřenými výsledky")
+    is_active = models.BooleanField(default=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        verbose_name = "Kalibrace materiálu"
+        verbose_name_plural = "Kalibrace materiálů"
+
+    def __str__(self):
+        return f"{self.material.name} ({self.created_at:%Y-%m-%d %H:%M})"
+
+
 class AWJCalculation(models.Model):
     """Hlavní model pro uložení výpočtu AWJ parametrů"""
 
@@ -125,6 +187,20 @@ class AWJCalculation(models.Model):
         help_text="Náklady na řez [Kč/m]"
     )
 
+    # Naměřené výsledky z řezu (zpětná vazba pro kalibraci modelů, calibration.py)
+    measured_speed = models.FloatField(
+        null=True, blank=True, validators=[MinValueValidator(0)],
+        help_text="Skutečná řezná rychlost [mm/min]"
+    )
+    measured_roughness = models.FloatField(
+        null=True, blank=True, validators=[MinValueValidator(0)],
+        help_text="Naměřená drsnost Ra [μm]"
+    )
+    measured_depth = models.FloatField(
+        null=True, blank=True, validators=[MinValueValidator(0)],
+        help_text="Naměřená maximální hloubka řezu [mm]"
+    )
+
     # JSON pole pro rozšířené výsledky
     extended_results = models.JSONField(
         null=True, blank=True,
@@ -227,6 +303,14 @@ class OptimizationPreset(models.Model):
         default=list,
         help_text="Seznam typů materiálů vhodných pro tento preset"
     )
+    min_thickness = models.FloatField(
+        null=True, blank=True, validators=[MinValueValidator(0)],
+        help_text="Minimální tloušťka materiálu [mm] (prázdné = bez omezení)"
+    )
+    max_thickness = models.FloatField(
+        null=True, blank=True, validators=[MinValueValidator(0)],
+        help_text="Maximální tloušťka materiálu [mm] (prázdné = bez omezení)"
+    )
 
     # Metadata
     success_rate = models.FloatField(
@@ -246,3 +330,108 @@ class OptimizationPreset(models.Model):
 
     def __str__(self):
         return f"{self.name} ({self.get_target_display()})"
+
+
+class CalculationJob(models.Model):
+    """Asynchronní úloha (optimalizace, velký batch výpočet)"""
+
+    JOB_KINDS = [
+        ('optimize', 'Optimalizace'),
+        ('batch', 'Batch výpočet'),
+        ('calibrate', 'Kalibrace modelů'),
+    ]
+
+    STATUS_PENDING = 'pending'
+    STATUS_RUNNING = 'running'
+    STATUS_SUCCEEDED = 'succeeded'
+    STATUS_FAILED = 'failed'
+    STATUS_CANCELLED = 'cancelled'
+
+    STATUSES = [
+        (STATUS_PENDING, 'Čeká'),
+        (STATUS_RUNNING, 'Běží'),
+        (STATUS_SUCCEEDED, 'Dokončeno'),
+        (STATUS_FAILED, 'Chyba'),
+        (STATUS_CANCELLED, 'Zrušeno'),
+    ]
+
+    FINISHED_STATUSES = (STATUS_SUCCEEDED, STATUS_FAILED, STATUS_CANCELLED)
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, null=True, blank=True)
+    kind = models.CharField(max_length=20, choices=JOB_KINDS)
+    status = models.CharField(max_length=20, choices=STATUSES, default=STATUS_PENDING)
+
+    parameters = models.JSONField(help_text="Vstupní parametry úlohy")
+    result = models.JSONField(null=True, blank=True, help_text="Výsledek úlohy")
+    error = models.TextField(blank=True, help_text="Chybová zpráva")
+
+    progress = models.FloatField(
+        default=0.0,
+        validators=[MinValueValidator(0), MaxValueValidator(100)],
+        help_text="Průběh [%]"
+    )
+    cancel_requested = models.BooleanField(default=False)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        verbose_name = "Výpočetní úloha"
+        verbose_name_plural = "Výpočetní úlohy"
+        indexes = [
+            models.Index(fields=['user', '-created_at']),
+        ]
+
+    def __str__(self):
+        return f"Úloha {self.id} ({self.get_kind_display()}, {self.get_status_display()})"
+
+    @property
+    def is_finished(self):
+        return self.status in self.FINISHED_STATUSES
+
+
+class CalculationDailyStatistics(models.Model):
+    """
+    Denní rollup výpočtů (den × materiál × uživatel)
+
+    Udržuje se inkrementálně při uložení/smazání výpočtu (rollups.py),
+    případně se přepočítá periodickou úlohou. Průměry = součet / počet
+    neprázdných hodnot, stejně jako Avg() nad AWJCalculation.
+    """
+
+    date = models.DateField()
+    material = models.ForeignKey(Material, on_delete=models.SET_NULL, null=True, blank=True)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, null=True, blank=True)
+
+    calculations = models.IntegerField(default=0, help_text="Počet výpočtů")
+    speed_sum = models.FloatField(default=0.0)
+    speed_count = models.IntegerField(default=0)
+    power_sum = models.FloatField(default=0.0)
+    power_count = models.IntegerField(default=0)
+    cost_sum = models.FloatField(default=0.0)
+    cost_count = models.IntegerField(default=0)
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['-date']
+        verbose_name = "Denní statistika výpočtů"
+        verbose_name_plural = "Denní statistiky výpočtů"
+        indexes = [
+            models.Index(fields=['date', 'material', 'user']),
+            models.Index(fields=['user', 'date']),
+        ]
+        constraints = [
+            # Jeden řádek na (den, materiál, uživatel) - NULL (bez materiálu / anonym)
+            # se přes Coalesce počítá jako jedna hodnota, na rozdíl od prostého unique
+            models.UniqueConstraint(
+                'date', Coalesce('material', models.Value(0)), Coalesce('user', models.Value(0)),
+                name='unique_daily_statistics_key'
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.date} - {self.material} ({self.calculations})"
@@ -0,0 +1,387 @@
+"""
+AWJ Calculations App - Optimization Engine
+Optimalizační engine pro AWJ parametry
+
+Postup:
+1. Hrubý vektorizovaný grid přes tlak, tok abraziva, trysku a fokusační trubici
+2. Nejlepší body gridu slouží jako starty lokálního spojitého zpřesnění (SciPy)
+
+Volitelný callback progress(podíl) se volá po gridu a před každým startem
+zpřesnění; výjimka z callbacku (zrušení úlohy) optimalizaci ukončí.
+"""
+
+import time
+import bisect
+import numpy as np
+from scipy.optimize import minimize
+from typing import Callable, Dict, Optional, Tuple
+
+from .services import AWJCalculationService
+
+
+def pareto_front_mask(objectives: np.ndarray) -> np.ndarray:
+    """
+    Maska nedominovaných bodů pro 3 minimalizovaná kritéria
+
+    Sorted-sweep místo párového porovnání O(n²): body se seřadí podle
+    prvního kritéria, takže každý dominující bod je zpracován dřív.
+    Pro zbylá dvě kritéria se udržuje "schodiště" dosud nedominovaných
+    bodů, dotaz i vložení jsou binární vyhledávání. Shodné body se
+    ponechají jen jednou.
+
+    Args:
+        objectives: Pole N x 3 (všechna kritéria se minimalizují)
+
+    Returns:
+        Booleovská maska délky N
+    """
+    objectives = np.asarray(objectives, dtype=np.float64)
+    mask = np.zeros(len(objectives), dtype=bool)
+    if len(objectives) == 0:
+        return mask
+
+    _, first = np.unique(objectives, axis=0, return_index=True)
+    order = first[np.lexsort(objectives[first].T[::-1])]
+
+    # Schodiště: druhé kritérium rostoucí, třetí ostře klesající
+    stair_second, stair_third = [], []
+    for index in order:
+        _, second, third = objectives[index]
+
+        pos = bisect.bisect_right(stair_second, second) - 1
+        if pos >= 0 and stair_third[pos] <= third:
+            continue
+
+        mask[index] = True
+        pos = bisect.bisect_left(stair_second, second)
+        end = pos
+        while end < len(stair_third) and stair_third[end] >= third:
+            end += 1
+        stair_second[pos:end] = [second]
+        stair_third[pos:end] = [third]
+
+    return mask
+
+
+class AWJOptimizationEngine:
+    """
+    Omezená spojitá optimalizace nad vektorizovaným výpočetním modelem
+
+    Proměnné se interně škálují do jednotkové krychle, aby měly konečné
+    diference pro všechny parametry stejnou váhu.
+    """
+
+    VARIABLES = ('pressure', 'abrasive_flow', 'nozzle_diameter', 'focus_diameter')
+
+    DEFAULT_BOUNDS = {
+        'pressure': (100, 600),  # MPa
+        'abrasive_flow': (1, 20),  # g/s
+        'nozzle_diameter': (0.2, 0.5),  # mm
+        'focus_diameter': (0.6, 1.5),  # mm
+    }
+
+    # Přesnost, na kterou se zaokrouhlí výsledné parametry
+    PRECISION = {
+        'pressure': 1,
+        'abrasive_flow': 1,
+        'nozzle_diameter': 2,
+        'focus_diameter': 2,
+    }
+
+    # Pro křehké materiály se doporučuje tlak max 400 MPa (viz QuickCalculationSerializer)
+    BRITTLE_MATERIALS = ('glass', 'ceramic')
+    BRITTLE_MAX_PRESSURE = 400
+
+    def __init__(
+        self,
+        material_type: str,
+        thickness: float,
+        bounds: Optional[Dict[str, Tuple[float, float]]] = None,
+        mesh_size: int = 80,
+        abrasive_cost_per_kg: Optional[float] = None,
+        water_cost_per_m3: Optional[float] = None,
+        power_cost_per_kwh: Optional[float] = None,
+        grid_points: int = 8,
+        seeds: int = 3,
+        max_iterations: int = 100,
+        progress: Optional[Callable[[float], None]] = None
+    ):
+        self.material_type = material_type
+        self.thickness = thickness
+        self.mesh_size = mesh_size
+        # Nezadané ceny = výchozí ceny výpočetní služby
+        given = {
+            'abrasive_cost_per_kg': abrasive_cost_per_kg,
+            'water_cost_per_m3': water_cost_per_m3,
+            'power_cost_per_kwh': power_cost_per_kwh,
+        }
+        prices = {
+            name: AWJCalculationService.DEFAULT_PRICES[name] if value is None else value
+            for name, value in given.items()
+        }
+        self.abrasive_cost_per_kg = prices['abrasive_cost_per_kg']
+        self.water_cost_per_m3 = prices['water_cost_per_m3']
+        self.power_cost_per_kwh = prices['power_cost_per_kwh']
+        self.grid_points = grid_points
+        self.seeds = seeds
+        self.max_iterations = max_iterations
+        self.progress = progress
+
+        merged = {**self.DEFAULT_BOUNDS, **(bounds or {})}
+        unknown = set(merged) - set(self.VARIABLES)
+        if unknown:
+            raise ValueError(f"Neznámé optimalizační proměnné: {', '.join(sorted(unknown))}")
+
+        brittle = AWJCalculationService.material_kind(material_type) in self.BRITTLE_MATERIALS
+        lower, upper = [], []
+        for name in self.VARIABLES:
+            lo, hi = (float(v) for v in merged[name])
+            if name == 'pressure' and brittle:
+                hi = min(hi, self.BRITTLE_MAX_PRESSURE)
+            if lo > hi:
+                raise ValueError(f"Neplatný rozsah pro '{name}': {lo} > {hi}")
+            lower.append(lo)
+            upper.append(hi)
+
+        self.lower = np.array(lower)
+        self.upper = np.array(upper)
+
+        if self.upper[3] <= self.lower[2]:
+            raise ValueError("Průměr fokusační trubice musí být větší než průměr trysky")
+
+        self.evaluations = 0
+
+    def _fixed_parameters(self) -> Dict:
+        """Parametry výpočtu, které optimalizace nemění"""
+        return {
+            'material_type': self.material_type,
+            'thickness': self.thickness,
+            'mesh_size': self.mesh_size,
+            'abrasive_cost_per_kg': self.abrasive_cost_per_kg,
+            'water_cost_per_m3': self.water_cost_per_m3,
+            'power_cost_per_kwh': self.power_cost_per_kwh,
+        }
+
+    def _to_physical(self, unit: np.ndarray) -> np.ndarray:
+        return self.lower + np.clip(unit, 0.0, 1.0) * (self.upper - self.lower)
+
+    def _evaluate(self, points: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Vyhodnotí body (N x 4, fyzikální jednotky) jedním vektorizovaným voláním
+
+        Returns:
+            (řezná rychlost [mm/min], náklady [Kč/m]) bez zaokrouhlení
+        """
+        points = np.atleast_2d(points)
+        self.evaluations += len(points)
+
+        results = AWJCalculationService.perform_full_calculation_batch({
+            **self._fixed_parameters(),
+            'pressure': points[:, 0],
+            'abrasive_flow': points[:, 1],
+            'nozzle_diameter': points[:, 2],
+            'focus_diameter': points[:, 3],
+        }, round_results=False)
+
+        speed = results['cutting_speed']
+        cost = results['cost_per_meter']
+
+        # Tryska musí být užší než fokusační trubice
+        invalid = points[:, 2] >= points[:, 3]
+        speed = np.where(invalid, 0.0, speed)
+        cost = np.where(invalid, np.inf, cost)
+
+        return speed, cost
+
+    def _grid(self) -> np.ndarray:
+        """Hrubý grid v jednotkové krychli (grid_points^4 bodů)"""
+        axes = [np.linspace(0.0, 1.0, self.grid_points)] * len(self.VARIABLES)
+        mesh = np.meshgrid(*axes, indexing='ij')
+        return np.stack([m.ravel() for m in mesh], axis=1)
+
+    def pareto_front(self) -> Dict:
+        """
+        Pareto fronta rychlost / náklady / drsnost jedním vektorizovaným průchodem
+
+        Kritéria se hodnotí na zaokrouhlených výsledcích (stejných, jaké vidí
+        uživatel). Body fronty jsou seřazené od nejvyšší rychlosti.
+        """
+        start_time = time.perf_counter()
+        self.evaluations = 0
+
+        points = self._to_physical(self._grid())
+        points = np.column_stack([
+            np.round(points[:, i], self.PRECISION[name]) for i, name in enumerate(self.VARIABLES)
+        ])
+        points = points[points[:, 2] < points[:, 3]]
+        self.evaluations += len(points)
+
+        results = AWJCalculationService.perform_full_calculation_batch({
+            **self._fixed_parameters(),
+            'pressure': points[:, 0],
+            'abrasive_flow': points[:, 1],
+            'nozzle_diameter': points[:, 2],
+            'focus_diameter': points[:, 3],
+        })
+
+        objectives = np.column_stack([
+            -results['cutting_speed'],
+            results['cost_per_meter'],
+            results['surface_roughness'],
+        ])
+        front = np.flatnonzero(pareto_front_mask(objectives))
+        front = front[np.lexsort(objectives[front].T[::-1])]
+
+        columns = {
+            **{name: points[front, i] for i, name in enumerate(self.VARIABLES)},
+            'cutting_speed': results['cutting_speed'][front],
+            'cost_per_meter': results['cost_per_meter'][front],
+            'surface_roughness': results['surface_roughness'][front],
+        }
+        names = list(columns)
+        front_points = [dict(zip(names, row)) for row in zip(*(c.tolist() for c in columns.values()))]
+
+        return {
+            'points': front_points,
+            'optimizer': {
+                **self._stats('grid+pareto-sweep', 0, start_time),
+                'front_size': len(front_points),
+            },
+        }
+
+    def _refine(self, seeds: np.ndarray, objective, constraints=(), method='L-BFGS-B'):
+        """Lokální zpřesnění z několika startů, vrátí nejlepší bod a počet iterací"""
+        best_x, best_value, iterations = None, np.inf, 0
+
+        for i, seed in enumerate(seeds):
+            # Grid je hotový, zbývá len(seeds) - i startů
+            self._report((i + 1) / (len(seeds) + 1))
+            result = minimize(
+                objective,
+                seed,
+                method=method,
+                bounds=[(0.0, 1.0)] * len(self.VARIABLES),
+                constraints=constraints,
+                options={'maxiter': self.max_iterations},
+            )
+            iterations += int(result.get('nit', 0))
+
+            feasible = all(c['fun'](result.x) >= -1e-6 for c in constraints)
+            if feasible and result.fun < best_value:
+                best_x, best_value = result.x, float(result.fun)
+
+        return best_x, iterations
+
+    def _finalize(self, unit: np.ndarray, min_speed: Optional[float] = None,
+                  fallbacks: np.ndarray = ()) -> Optional[Dict]:
+        """
+        Zaokrouhlí parametry a spočítá výsledky skalární cestou
+
+        Pokud zaokrouhlení poruší omezení min_speed, zkusí se jemnější
+        zaokrouhlení a potom náhradní body (např. přípustné body gridu).
+
+        Returns:
+            Zaokrouhlené parametry s očekávanými výsledky, nebo None pokud
+            žádný kandidát po zaokrouhlení omezení nesplní
+        """
+        for point in [unit, *fallbacks]:
+            physical = self._to_physical(point)
+            for precision in (self.PRECISION, None):
+                params = {
+                    name: round(float(value), self.PRECISION[name] if precision else 4)
+                    for name, value in zip(self.VARIABLES, physical)
+                }
+                results = AWJCalculationService.perform_full_calculation({
+                    **self._fixed_parameters(),
+                    **params,
+                })
+
+                # Zaokrouhlení parametrů nesmí porušit omezení minimální rychlosti
+                if min_speed is None or results['cutting_speed'] >= min_speed:
+                    return {
+                        **params,
+                        'expected_speed': results['cutting_speed'],
+                        'expected_cost': results['cost_per_meter'],
+                    }
+
+        return None
+
+    def _report(self, fraction: float) -> None:
+        if self.progress is not None:
+            self.progress(fraction)
+
+    def _stats(self, method: str, iterations: int, start_time: float) -> Dict:
+        return {
+            'method': method,
+            'grid_points': self.grid_points ** len(self.VARIABLES),
+            'iterations': iterations,
+            'evaluations': self.evaluations,
+            'wall_time_ms': round((time.perf_counter() - start_time) * 1000, 2),
+        }
+
+    def maximize_speed(self) -> Dict:
+        """
+        Parametry pro maximální řeznou rychlost
+
+        Při shodné rychlosti (omezení 5000 mm/min) vyhrává levnější bod.
+        """
+        start_time = time.perf_counter()
+        self.evaluations = 0
+
+        grid = self._grid()
+        speed, cost = self._evaluate(self._to_physical(grid))
+        order = np.lexsort((cost, -speed))
+        seeds = grid[order[:self.seeds]]
+
+        def objective(x):
+            return -float(self._evaluate(self._to_physical(x))[0][0])
+
+        best, iterations = self._refine(seeds, objective)
+        if best is None or -objective(best) < speed[order[0]]:
+            best = grid[order[0]]
+
+        return {
+            **self._finalize(best),
+            'optimizer': self._stats('grid+L-BFGS-B', iterations, start_time),
+        }
+
+    def minimize_cost(self, min_speed: float = 50) -> Dict:
+        """
+        Parametry pro minimální náklady při zachování minimální rychlosti
+
+        Returns:
+            Optimální parametry, nebo {} pokud žádná kombinace nedosáhne min_speed
+        """
+        start_time = time.perf_counter()
+        self.evaluations = 0
+
+        grid = self._grid()
+        speed, cost = self._evaluate(self._to_physical(grid))
+        feasible = np.flatnonzero(speed >= min_speed)
+        if feasible.size == 0:
+            return {}
+
+        order = feasible[np.argsort(cost[feasible], kind='stable')]
+        seeds = grid[order[:self.seeds]]
+
+        def objective(x):
+            return float(self._evaluate(self._to_physical(x))[1][0])
+
+        constraints = ({
+            'type': 'ineq',
+            'fun': lambda x: float(self._evaluate(self._to_physical(x))[0][0]) - min_speed,
+        },)
+
+        best, iterations = self._refine(seeds, objective, constraints, method='SLSQP')
+        if best is None or objective(best) > cost[order[0]]:
+            best = grid[order[0]]
+
+        # Záloha: nejlevnější přípustné body gridu
+        result = self._finalize(best, min_speed=min_speed, fallbacks=grid[order[:self.seeds]])
+        if result is None:
+            return {}
+
+        return {
+            **result,
+            'optimizer': self._stats('grid+SLSQP', iterations, start_time),
+        }
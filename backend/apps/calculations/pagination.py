@@ -0,0 +1,24 @@
+"""
+AWJ Calculations App - Pagination
+Stránkování historie výpočtů
+"""
+
+from rest_framework.pagination import CursorPagination
+
+
+class CalculationCursorPagination(CursorPagination):
+    """
+    Keyset stránkování přes (-created_at, -id)
+
+    Místo OFFSET se další stránka hledá podle pozice posledního záznamu
+    (WHERE created_at < ...), takže dotaz využije index (user, -created_at)
+    a cena stránky nezávisí na tom, jak hluboko uživatel listuje.
+    Nepočítá se ani COUNT(*) přes celou historii.
+
+    GET /api/calculations/?page_size=50
+    GET /api/calculations/?cursor=<hodnota z 'next'>
+    """
+
+    ordering = ('-created_at', '-id')
+    page_size_query_param = 'page_size'
+    max_page_size = 1000
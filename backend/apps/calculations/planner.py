@@ -0,0 +1,352 @@
+"""
+AWJ Calculations App - Throughput Planner
+Plán řezání sady dílů (nebo rozvržení tabulí) na více strojích
+
+Díly jsou zadané délkou řezu, počtem průrazů a počtem kusů, nastavení jsou
+kandidátní parametry řezu (tlak, abrazivo, tryska, ...). Plán:
+
+1. všechny kombinace díl × nastavení jedním voláním perform_full_calculation_batch;
+   čas kusu = délka / rychlost + průrazy · doba průrazu (toolpath.pierce_time)
+   + přejezdy, náklady za dobu zapnutého paprsku (toolpath.consumption_rates)
+2. pro každý díl nastavení s nejkratším časem (objective 'time') nebo
+   nejnižšími náklady ('cost') mezi přípustnými - drsnost nejvýše
+   max_roughness dílu, pro sklo a keramiku tlak nejvýše 400 MPa
+3. rozvrh na stroje minimalizující makespan - LPT heuristika (nejdelší dávky
+   první, každá na stroj s nejdřívějším dokončením). Dávky delší než
+   průměrné zatížení stroje se rozdělí podle kusů, pokud se to vyplatí i
+   s přestavbou dalšího stroje. Přechod stroje na jiný materiál, tloušťku
+   nebo nastavení stojí SETUP_TIME (jednou na skupinu a stroj - stroj řeže
+   dávky seskupené podle skupiny).
+
+Kandidátní stroj se vybírá vektorizovaně přes všechny stroje, smyčka je jen
+přes dávky - tisíce dílů se naplánují v desítkách ms.
+"""
+
+from typing import Dict, List, Optional
+
+import numpy as np
+from django.conf import settings
+
+from .services import AWJCalculationService
+from .toolpath import consumption_cost, consumption_rates, pierce_time, toolpath_config
+
+
+OBJECTIVES = ('time', 'cost')
+
+# Nastavení řezu kandidátů (zbytek z výchozích hodnot výpočtu)
+SETTING_FIELDS = ('pressure', 'abrasive_flow', 'nozzle_diameter', 'focus_diameter', 'mesh_size')
+SETTING_DEFAULTS = {'abrasive_flow': 8.0, 'nozzle_diameter': 0.33, 'focus_diameter': 1.0, 'mesh_size': 80.0}
+
+
+def planner_config() -> Dict:
+    config = {
+        'MAX_PARTS': 10000,
+        'MAX_SETTINGS': 50,
+        'MAX_MACHINES': 64,
+        'SETUP_TIME': 300.0,  # s - výměna tabule / změna parametrů
+    }
+    config.update(settings.AWJ_CALCULATOR.get('PLANNER', {}))
+    return config
+
+
+def evaluate(parts: Dict[str, np.ndarray], candidates: Dict[str, np.ndarray], prices: Dict) -> Dict[str, np.ndarray]:
+    """
+    Čas a náklady kusu pro všechny kombinace díl × nastavení
+
+    Args:
+        parts: Sloupce dílů - material_type, thickness, cut_length [mm], pierces,
+            rapid_length [mm], max_roughness [μm] (NaN = bez omezení)
+        candidates: Sloupce nastavení (SETTING_FIELDS)
+        prices: Ceny (abrasive_cost_per_kg, water_cost_per_m3, power_cost_per_kwh)
+
+    Returns:
+        Matice (díly × nastavení): unit_time [s], unit_cost [Kč], cutting_speed,
+        surface_roughness, pressure_allowed, allowed (tlak i drsnost)
+    """
+    size = len(parts['thickness'])
+    count = len(candidates['pressure'])
+    columns = {
+        'material_type': np.repeat(np.asarray(parts['material_type'], dtype=object), count),
+        'thickness': np.repeat(parts['thickness'], count),
+        **{name: np.tile(candidates[name], size) for name in SETTING_FIELDS},
+        **prices,
+    }
+    results = AWJCalculationService.perform_full_calculation_batch(columns)
+
+    def matrix(values):
+        return np.asarray(values, dtype=np.float64).reshape(size, count)
+
+    speed = matrix(results['cutting_speed'])
+    config = toolpath_config()
+    jet_time = (
+        parts['cut_length'][:, None] / (speed / 60)
+        + parts['pierces'][:, None] * pierce_time(parts['thickness'][:, None], speed, config)
+    )
+    unit_time = jet_time + parts['rapid_length'][:, None] / (float(config['RAPID_SPEED']) / 60)
+
+    rates = consumption_rates(columns['abrasive_flow'], results['water_flow'], results['hydraulic_power'])
+    cost_per_minute = sum(consumption_cost(rates, prices).values())
+    unit_cost = jet_time / 60 * matrix(cost_per_minute)
+
+    # Stejné pravidlo jako QuickCalculationSerializer - křehké materiály max 400 MPa
+    types, inverse = np.unique(np.asarray(parts['material_type']).astype(str), return_inverse=True)
+    kinds = np.array([AWJCalculationService.material_kind(t) for t in types], dtype=object)
+    brittle = np.isin(kinds, ['glass', 'ceramic'])[inverse.ravel()]
+    pressure_allowed = ~(brittle[:, None] & (candidates['pressure'][None, :] > 400))
+
+    roughness = matrix(results['surface_roughness'])
+    allowed = pressure_allowed & ~(roughness > parts['max_roughness'][:, None])  # NaN = bez omezení
+
+    return {
+        'unit_time': unit_time,
+        'unit_cost': unit_cost,
+        'cutting_speed': speed,
+        'surface_roughness': roughness,
+        'pressure_allowed': pressure_allowed,
+        'allowed': allowed,
+    }
+
+
+def choose_settings(evaluation: Dict[str, np.ndarray], objective: str = 'time'):
+    """
+    Nastavení pro každý díl podle cíle (při shodě rozhoduje druhá veličina)
+
+    Díl bez přípustného nastavení dostane nastavení s nejnižší drsností
+    (přednostně mezi nastaveními s povoleným tlakem).
+
+    Returns:
+        (index nastavení pro každý díl, bool pole - díl splňuje požadavky)
+    """
+    primary, secondary = ('unit_time', 'unit_cost') if objective == 'time' else ('unit_cost', 'unit_time')
+    allowed = evaluation['allowed']
+    rows = np.arange(len(allowed))
+
+    values = np.where(allowed, evaluation[primary], np.inf)
+    ties = values == values[rows, np.argmin(values, axis=1)][:, None]
+    best = np.argmin(np.where(ties & allowed, evaluation[secondary], np.inf), axis=1)
+
+    satisfied = allowed.any(axis=1)
+    if not satisfied.all():
+        roughness = evaluation['surface_roughness']
+        preferred = np.where(evaluation['pressure_allowed'], roughness, np.inf)
+        fallback = np.where(
+            evaluation['pressure_allowed'].any(axis=1), np.argmin(preferred, axis=1), np.argmin(roughness, axis=1)
+        )
+        best = np.where(satisfied, best, fallback)
+    return best, satisfied
+
+
+def _batches(durations: np.ndarray, quantities: np.ndarray, groups: np.ndarray, machines: int,
+             setup_time: float = 0.0):
+    """
+    Dávky pro rozvrh - díly s časem nad průměrným zatížením stroje
+    (včetně jedné přestavby na skupinu) se rozdělí na téměř stejné dávky
+    podle kusů
+
+    Další dávka dílu stojí přestavbu dalšího stroje, díl se proto dělí jen
+    dokud zkrácení nejdelší dávky (T / (k - 1) - T / k) převyšuje setup_time.
+
+    Returns:
+        (index dílu, počet kusů) dávek
+    """
+    totals = durations * quantities
+    setups = setup_time * (int(groups.max()) + 1 if len(groups) else 0)
+    ideal = (totals.sum() + setups) / machines
+    pieces = np.minimum(quantities, np.maximum(1, np.ceil(totals / ideal))).astype(np.int64) if ideal > 0 \
+        else np.ones(len(quantities), dtype=np.int64)
+    if setup_time > 0:
+        # Největší k s T / (k (k - 1)) > setup_time
+        worthwhile = np.floor((1 + np.sqrt(1 + 4 * totals / setup_time)) / 2).astype(np.int64)
+        worthwhile -= worthwhile * (worthwhile - 1) * setup_time >= totals
+        pieces = np.clip(pieces, 1, np.maximum(worthwhile, 1))
+    part = np.repeat(np.arange(len(quantities)), pieces)
+    offsets = np.cumsum(pieces) - pieces
+    rank = np.arange(part.size) - offsets[part]
+    quantity = quantities[part] // pieces[part] + (rank < quantities[part] % pieces[part])
+    return part, quantity
+
+
+def _assign(length: np.ndarray, batch_group: np.ndarray, groups: int, machines: int, setup_time: float):
+    """
+    LPT přiřazení dávek na stroje - každá dávka na stroj s nejdřívějším
+    dokončením (přestavba, pokud stroj skupinu ještě neřeže)
+
+    Returns:
+        (pořadí LPT, stroj každé dávky, zatížení strojů)
+    """
+    order = np.argsort(-length, kind='stable')
+    loads = np.zeros(machines)
+    has_group = np.zeros((machines, groups), dtype=bool)
+    machine = np.empty(length.size, dtype=np.int64)
+    for i in order:
+        group = batch_group[i]
+        finish = loads + length[i] + setup_time * ~has_group[:, group]
+        target = int(np.argmin(finish))
+        machine[i] = target
+        loads[target] = finish[target]
+        has_group[target, group] = True
+    return order, machine, loads
+
+
+def schedule(durations: np.ndarray, quantities: np.ndarray, groups: np.ndarray, machines: int,
+             setup_time: float) -> Dict:
+    """
+    Rozvrh dávek na stroje (LPT s přestavbou při změně skupiny)
+
+    Rozvrh s rozdělenými dávkami se porovná s rozvrhem celých dílů a použije
+    se ten s kratším makespanem - dělení tak nikdy neprodlouží plán.
+
+    Args:
+        durations: Čas kusu každého dílu [s]
+        quantities: Počet kusů každého dílu
+        groups: Skupina dílu (materiál, tloušťka, nastavení) - číslo 0..G-1
+        machines: Počet strojů
+        setup_time: Přestavba stroje na novou skupinu [s]
+
+    Returns:
+        part, quantity, machine, start, end (pole dávek), load (zatížení strojů)
+    """
+    group_count = int(groups.max()) + 1 if len(groups) else 0
+    part, quantity = _batches(durations, quantities, groups, machines, setup_time)
+    length = durations[part] * quantity
+    order, machine, loads = _assign(length, groups[part], group_count, machines, setup_time)
+
+    if part.size > len(quantities):
+        whole = np.arange(len(quantities))
+        whole_length = durations * quantities
+        whole_order, whole_machine, whole_loads = _assign(whole_length, groups, group_count, machines, setup_time)
+        if whole_loads.max(initial=0.0) <= loads.max(initial=0.0):
+            part, quantity, length = whole, quantities, whole_length
+            order, machine, loads = whole_order, whole_machine, whole_loads
+
+    # Pořadí na stroji: skupiny v pořadí přiřazení, uvnitř skupiny dávky v pořadí LPT
+    assigned = np.empty(part.size, dtype=np.int64)
+    assigned[order] = np.arange(part.size)
+    batch_group = groups[part]
+    first_assigned = {}
+    for i in order:
+        first_assigned.setdefault((machine[i], batch_group[i]), assigned[i])
+    group_rank = np.array([first_assigned[(m, g)] for m, g in zip(machine, batch_group)], dtype=np.int64) \
+        if part.size else np.empty(0, dtype=np.int64)
+    sequence = np.lexsort((assigned, group_rank, machine))
+
+    start = np.empty(part.size)
+    end = np.empty(part.size)
+    clock, previous = {}, {}
+    for i in sequence:
+        m = machine[i]
+        t = clock.get(m, 0.0)
+        if previous.get(m) != batch_group[i]:
+            t += setup_time
+            previous[m] = batch_group[i]
+        start[i] = t
+        end[i] = t + length[i]
+        clock[m] = end[i]
+
+    return {
+        'part': part, 'quantity': quantity, 'machine': machine,
+        'start': start, 'end': end, 'sequence': sequence, 'load': loads,
+    }
+
+
+def plan(parts: Dict[str, np.ndarray], candidates: Dict[str, np.ndarray], prices: Dict,
+         machines: int = 1, objective: str = 'time', setup_time: Optional[float] = None,
+         names: Optional[List[str]] = None) -> Dict:
+    """
+    Plán řezání dílů na strojích
+
+    Args:
+        parts: Sloupce dílů (viz evaluate) + quantity
+        candidates: Sloupce kandidátních nastavení (SETTING_FIELDS)
+        prices: Ceny spotřeby
+        machines: Počet strojů
+        objective: 'time' nebo 'cost' - volba nastavení pro díl
+        setup_time: Přestavba stroje [s], výchozí PLANNER['SETUP_TIME']
+        names: Názvy dílů pro výstup
+
+    Returns:
+        makespan, lower_bound, totals, parts (zvolené nastavení, časy, náklady),
+        settings (srovnání - celá sada jedním nastavením), schedule (dávky strojů)
+    """
+    setup_time = planner_config()['SETUP_TIME'] if setup_time is None else setup_time
+    evaluation = evaluate(parts, candidates, prices)
+    best, satisfied = choose_settings(evaluation, objective)
+
+    rows = np.arange(len(best))
+    quantities = parts['quantity'].astype(np.int64)
+    unit_time = evaluation['unit_time'][rows, best]
+    unit_cost = evaluation['unit_cost'][rows, best]
+
+    # Skupina = materiál, tloušťka a nastavení (stejná tabule a parametry bez přestavby)
+    keys = np.rec.fromarrays([
+        np.asarray(parts['material_type']).astype(str), parts['thickness'], best
+    ])
+    _, groups = np.unique(keys, return_inverse=True)
+    result = schedule(unit_time, quantities, groups.ravel(), machines, setup_time)
+
+    makespan = float(result['load'].max()) if machines else 0.0
+    processing = float((unit_time * quantities).sum())
+    names = names or [f'part_{i}' for i in rows]
+
+    batches = [[] for _ in range(machines)]
+    for i in result['sequence']:
+        batches[result['machine'][i]].append({
+            'part': names[result['part'][i]],
+            'quantity': int(result['quantity'][i]),
+            'setting': int(best[result['part'][i]]),
+            'start': round(float(result['start'][i]), 3),
+            'end': round(float(result['end'][i]), 3),
+        })
+
+    allowed = evaluation['allowed']
+    totals_time = np.where(allowed, evaluation['unit_time'], np.nan) * quantities[:, None]
+    totals_cost = np.where(allowed, evaluation['unit_cost'], np.nan) * quantities[:, None]
+    complete = allowed.all(axis=0)
+
+    return {
+        'objective': objective,
+        'machines': machines,
+        'makespan': round(makespan, 3),
+        # Dolní mez makespanu (bez přestaveb): průměrné zatížení nebo nejdelší kus
+        'lower_bound': round(max(processing / machines, float(unit_time.max(initial=0.0))), 3),
+        'totals': {
+            'pieces': int(quantities.sum()),
+            'processing_time': round(processing, 3),
+            'setup_time': round(float(result['load'].sum()) - processing, 3),
+            'cost': round(float((unit_cost * quantities).sum()), 2),
+            'cut_length': round(float((parts['cut_length'] * quantities).sum()), 3),
+        },
+        'parts': [
+            {
+                'part': names[i],
+                'setting': int(best[i]),
+                'quantity': int(quantities[i]),
+                'unit_time': round(float(unit_time[i]), 3),
+                'unit_cost': round(float(unit_cost[i]), 2),
+                'cutting_speed': float(evaluation['cutting_speed'][i, best[i]]),
+                'surface_roughness': float(evaluation['surface_roughness'][i, best[i]]),
+                'requirements_met': bool(satisfied[i]),
+            }
+            for i in rows
+        ],
+        'settings': [
+            {
+                'setting': s,
+                'parts_assigned': int((best == s).sum()),
+                'all_parts_allowed': bool(complete[s]),
+                # Celá sada tímto nastavením (jen přípustné díly)
+                'processing_time': round(float(np.nansum(totals_time[:, s])), 3),
+                'cost': round(float(np.nansum(totals_cost[:, s])), 2),
+            }
+            for s in range(len(candidates['pressure']))
+        ],
+        'schedule': [
+            {
+                'machine': m,
+                'load': round(float(result['load'][m]), 3),
+                'utilization': round(float(result['load'][m]) / makespan, 4) if makespan else 0.0,
+                'batches': batches[m],
+            }
+            for m in range(machines)
+        ],
+    }
@@ -0,0 +1,138 @@
+"""
+AWJ Calculations App - Preset Index
+Předpočítaný index optimalizačních presetů (materiál × cíl × tloušťka)
+
+suitable_for_materials je JSONField - filtr __contains na SQLite nejde
+indexovat a prochází všechny presety. Index se proto sestaví jedním dotazem
+jako invertovaná mapa materiál → presety (zvlášť pro každý cíl) a drží se
+v paměti procesu stejně jako snapshot materiálů (materials.py): zahodí se
+signálem post_save/post_delete na OptimizationPreset a změnou razítka verze
+ve sdílené cache.
+
+Rozsahy tloušťky (min_thickness / max_thickness, včetně mezí) jsou pro každou
+skupinu předpočítané po úsecích mezi hranicemi rozsahů, dotaz je tak jedno
+vyhledání v mapě a jedno půlení intervalu.
+"""
+
+import bisect
+import threading
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .materials import MaterialSnapshotCache, material_snapshot_config
+from .models import OptimizationPreset
+from .serializers import OptimizationPresetSerializer
+
+
+PRESET_VERSION_CACHE_KEY = 'awj:presets:version'
+
+
+class ThicknessRanges:
+    """
+    Presety skupiny předpočítané pro každý úsek osy tloušťky
+
+    Úseky se střídají: mezera před hranicí i (2i), hranice i (2i + 1),
+    mezera za poslední hranicí (2m).
+    """
+
+    def __init__(self, ranges: List[Tuple[int, Optional[float], Optional[float]]]):
+        # ranges: (pořadí presetu, min, max) v pořadí výstupu
+        self.all = [rank for rank, _, _ in ranges]
+        self.bounds = sorted({v for _, lo, hi in ranges for v in (lo, hi) if v is not None})
+
+        self.slots = []
+        for slot in range(2 * len(self.bounds) + 1):
+            x = self._representative(slot)
+            self.slots.append([
+                rank for rank, lo, hi in ranges
+                if (lo is None or lo <= x) and (hi is None or x <= hi)
+            ])
+
+    def _representative(self, slot: int) -> float:
+        bounds = self.bounds
+        i, on_bound = divmod(slot, 2)
+        if on_bound:
+            return bounds[i]
+        if not bounds:
+            return 0.0
+        if i == 0:
+            return bounds[0] - 1.0
+        if i == len(bounds):
+            return bounds[-1] + 1.0
+        return (bounds[i - 1] + bounds[i]) / 2
+
+    def find(self, thickness: Optional[float] = None) -> List[int]:
+        if thickness is None:
+            return self.all
+        i = bisect.bisect_left(self.bounds, thickness)
+        on_bound = i < len(self.bounds) and self.bounds[i] == thickness
+        return self.slots[2 * i + on_bound]
+
+
+class PresetIndex:
+    """Neměnný index presetů; presety jsou uložené už serializované"""
+
+    def __init__(self, presets: List[Dict], groups: Dict[Tuple[str, Optional[str]], ThicknessRanges], version):
+        self.presets = presets
+        self.groups = groups
+        self.version = version
+
+    @classmethod
+    def load(cls, version=None) -> 'PresetIndex':
+        presets = list(OptimizationPreset.objects.all())
+        data = OptimizationPresetSerializer(presets, many=True).data
+
+        grouped = defaultdict(list)
+        for rank, preset in enumerate(presets):
+            materials = preset.suitable_for_materials or []
+            for material_type in {m for m in materials if isinstance(m, str)}:
+                entry = (rank, preset.min_thickness, preset.max_thickness)
+                grouped[(material_type, None)].append(entry)
+                grouped[(material_type, preset.target)].append(entry)
+
+        groups = {key: ThicknessRanges(ranges) for key, ranges in grouped.items()}
+        return cls(list(data), groups, version)
+
+    def find(self, material_type: str, target: Optional[str] = None, thickness: Optional[float] = None) -> List[Dict]:
+        """Presety pro materiál (volitelně cíl a tloušťku) v pořadí modelu"""
+        group = self.groups.get((material_type, target))
+        if group is None:
+            return []
+        return [self.presets[rank] for rank in group.find(thickness)]
+
+    def __len__(self):
+        return len(self.presets)
+
+
+_preset_cache = None
+_preset_cache_lock = threading.Lock()
+
+
+def get_preset_index_cache() -> MaterialSnapshotCache:
+    global _preset_cache
+
+    if _preset_cache is None:
+        with _preset_cache_lock:
+            if _preset_cache is None:
+                config = material_snapshot_config()
+                _preset_cache = MaterialSnapshotCache(
+                    check_interval=config['VERSION_CHECK_INTERVAL'],
+                    cache_alias=config['CACHE_ALIAS'],
+                    loader=PresetIndex,
+                    version_key=PRESET_VERSION_CACHE_KEY,
+                )
+    return _preset_cache
+
+
+def get_preset_index() -> PresetIndex:
+    """Aktuální index presetů procesu"""
+    return get_preset_index_cache().get()
+
+
+@receiver(post_save, sender=OptimizationPreset)
+@receiver(post_delete, sender=OptimizationPreset)
+def _invalidate_preset_index(sender, **kwargs):
+    get_preset_index_cache().invalidate()
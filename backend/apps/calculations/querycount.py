@@ -0,0 +1,84 @@
+"""
+AWJ Calculations App - Query Budget
+Hlídání počtu SQL dotazů na request (ochrana proti N+1 dotazům)
+
+Počet dotazů list/detail endpointu musí být konstantní nezávisle na
+velikosti stránky. QueryBudgetMixin spočítá dotazy provedené akcí view
+a při překročení rozpočtu zaloguje varování - request se kvůli tomu nikdy
+neshodí. Rozpočty vynucují testy (django_assert_num_queries v tests/backend).
+"""
+
+import logging
+
+from django.conf import settings
+from django.db import connection
+
+
+logger = logging.getLogger(__name__)
+
+
+class QueryCounter:
+    """
+    Context manager počítající SQL dotazy na výchozím spojení
+
+    Použití:
+        with QueryCounter() as counter:
+            list(AWJCalculation.objects.select_related('material'))
+        counter.count
+    """
+
+    def __init__(self):
+        self.count = 0
+        self._wrapper = None
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+    def __enter__(self):
+        self._wrapper = connection.execute_wrapper(self)
+        self._wrapper.__enter__()
+        return self
+
+    def __exit__(self, *exc_info):
+        return self._wrapper.__exit__(*exc_info)
+
+
+def query_budget_config():
+    config = {'ENABLED': settings.DEBUG}
+    config.update(settings.AWJ_CALCULATOR.get('QUERY_BUDGET', {}))
+    return config
+
+
+class QueryBudgetMixin:
+    """
+    Mixin pro ViewSet: query_budget = {'list': 2, 'retrieve': 1}
+
+    Počítají se jen dotazy samotné akce (autentizace proběhne dřív
+    v initial()), takže rozpočet nezávisí na způsobu přihlášení.
+    """
+
+    query_budget = {}
+
+    def _check_budget(self, action_name, handler, request, *args, **kwargs):
+        config = query_budget_config()
+        budget = self.query_budget.get(action_name)
+        if not config['ENABLED'] or budget is None:
+            return handler(request, *args, **kwargs)
+
+        with QueryCounter() as counter:
+            response = handler(request, *args, **kwargs)
+
+        response['X-Query-Count'] = str(counter.count)
+        if counter.count > budget:
+            logger.warning(
+                "%s.%s: %s SQL dotazů (rozpočet %s)",
+                type(self).__name__, action_name, counter.count, budget
+            )
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self._check_budget('list', super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self._check_budget('retrieve', super().retrieve, request, *args, **kwargs)
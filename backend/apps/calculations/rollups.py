@@ -0,0 +1,241 @@
+"""
+AWJ Calculations App - Statistics Rollups
+Materializované denní statistiky výpočtů (CalculationDailyStatistics)
+
+Rollup má jeden řádek na (den, materiál, uživatel) se součty a počty
+neprázdných hodnot. Udržuje se dvěma způsoby:
+- inkrementálně - signály post_save/post_delete na AWJCalculation a
+  record_calculations() pro bulk_create (ten signály neposílá)
+- periodicky - rebuild_statistics() přepočítá rollup z tabulky výpočtů
+  (management command awj_rebuild_statistics, Celery task)
+
+Dotazy pro /api/statistics/summary/ pak běží nad rollupem, tedy
+O(počet řádků rollupu) místo O(počet výpočtů).
+"""
+
+from collections import defaultdict
+from datetime import date
+from typing import Dict, Iterable, Optional, Tuple
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import TruncDate
+from django.db.models.signals import pre_save, post_save, pre_delete, post_delete
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .models import AWJCalculation, CalculationDailyStatistics, Material
+
+
+# (prefix sloupce rollupu, pole AWJCalculation)
+METRICS = (
+    ('speed', 'cutting_speed'),
+    ('power', 'hydraulic_power'),
+    ('cost', 'cost_per_meter'),
+)
+
+GROUPINGS = {
+    'day': ('date',),
+    'material': ('material__name',),
+    'user': ('user_id', 'user__username'),
+}
+
+RollupKey = Tuple[date, Optional[int], Optional[int]]
+
+
+def rollups_config() -> Dict:
+    config = {'INCREMENTAL': True}
+    config.update(settings.AWJ_CALCULATOR.get('STATISTICS', {}))
+    return config
+
+
+def _key(calculation) -> RollupKey:
+    created_at = calculation.created_at or timezone.now()
+    return timezone.localdate(created_at), calculation.material_id, calculation.user_id
+
+
+def _contribution(calculation) -> Dict[str, float]:
+    deltas = {'calculations': 1}
+    for prefix, field in METRICS:
+        value = getattr(calculation, field)
+        deltas[f'{prefix}_sum'] = float(value) if value is not None else 0.0
+        deltas[f'{prefix}_count'] = int(value is not None)
+    return deltas
+
+
+def _apply(deltas: Dict[RollupKey, Dict[str, float]]) -> None:
+    """
+    Přičte změny k řádkům rollupu
+
+    Řádek klíče se zamkne (select_for_update, UniqueConstraint zaručí, že
+    souběžné get_or_create skončí na stejném řádku) a změny se přičtou F
+    výrazy. Odečet z dosud neexistujícího řádku se uloží jako záporné
+    hodnoty, takže se neztratí. Smaže se jen řádek, kde všechny počty
+    klesly na nulu.
+    """
+    with transaction.atomic():
+        for (day, material_id, user_id), changes in deltas.items():
+            if not any(changes.values()):
+                continue
+
+            row, created = CalculationDailyStatistics.objects.select_for_update().get_or_create(
+                date=day, material_id=material_id, user_id=user_id, defaults=changes
+            )
+            if created:
+                continue
+
+            CalculationDailyStatistics.objects.filter(pk=row.pk).update(
+                **{name: F(name) + value for name, value in changes.items()},
+                updated_at=timezone.now()
+            )
+            # Vynulovat se může odečtem, nebo přičtením k dříve zápornému řádku
+            if changes['calculations'] < 0 or row.calculations < 0:
+                CalculationDailyStatistics.objects.filter(
+                    pk=row.pk, calculations=0, **{f'{prefix}_count': 0 for prefix, _ in METRICS}
+                ).delete()
+
+
+def record_calculations(calculations: Iterable[AWJCalculation], sign: int = 1) -> None:
+    """
+    Započítá (sign=1) nebo odečte (sign=-1) výpočty v rollupu
+
+    Výpočty se nejdřív sečtou po klíčích, takže bulk_create tisíců řádků
+    stojí jen pár UPDATE dotazů.
+    """
+    deltas = defaultdict(lambda: defaultdict(float))
+    for calculation in calculations:
+        for name, value in _contribution(calculation).items():
+            deltas[_key(calculation)][name] += sign * value
+    _apply(deltas)
+
+
+@receiver(pre_save, sender=AWJCalculation)
+def _remember_previous(sender, instance, raw=False, **kwargs):
+    """Při úpravě existujícího výpočtu si zapamatuje původní příspěvek"""
+    if raw or instance.pk is None or not rollups_config()['INCREMENTAL']:
+        return
+    instance._rollup_previous = AWJCalculation.objects.filter(pk=instance.pk).only(
+        'created_at', 'material', 'user', *(field for _, field in METRICS)
+    ).first()
+
+
+@receiver(post_save, sender=AWJCalculation)
+def _record_saved(sender, instance, created, raw=False, **kwargs):
+    if raw or not rollups_config()['INCREMENTAL']:
+        return
+
+    deltas = defaultdict(lambda: defaultdict(float))
+    previous = getattr(instance, '_rollup_previous', None)
+    if previous is not None:
+        for name, value in _contribution(previous).items():
+            deltas[_key(previous)][name] -= value
+        instance._rollup_previous = None
+    for name, value in _contribution(instance).items():
+        deltas[_key(instance)][name] += value
+    _apply(deltas)
+
+
+@receiver(post_delete, sender=AWJCalculation)
+def _record_deleted(sender, instance, **kwargs):
+    if rollups_config()['INCREMENTAL']:
+        record_calculations([instance], sign=-1)
+
+
+@receiver(pre_delete, sender=Material)
+def _merge_deleted_material(sender, instance, **kwargs):
+    """
+    Řádky rollupu mazaného materiálu se přičtou k řádkům bez materiálu
+
+    Výpočty dostanou material=NULL (SET_NULL) - stejně se musí posunout
+    i rollup, prosté SET_NULL by porušilo UniqueConstraint klíče.
+    """
+    fields = ['calculations'] + [f'{prefix}_{part}' for prefix, _ in METRICS for part in ('sum', 'count')]
+    rows = CalculationDailyStatistics.objects.filter(material=instance)
+
+    deltas = defaultdict(lambda: defaultdict(float))
+    for row in rows.values('date', 'user_id', *fields):
+        for name in fields:
+            deltas[(row['date'], None, row['user_id'])][name] += row[name]
+
+    with transaction.atomic():
+        rows.delete()
+        _apply(deltas)
+
+
+def rebuild_statistics(since: Optional[date] = None) -> int:
+    """
+    Přepočítá rollup z tabulky výpočtů (celý, nebo od data since)
+
+    Returns:
+        Počet řádků rollupu
+    """
+    calculations = AWJCalculation.objects.all()
+    rollups = CalculationDailyStatistics.objects.all()
+    if since is not None:
+        calculations = calculations.filter(created_at__date__gte=since)
+        rollups = rollups.filter(date__gte=since)
+
+    aggregates = {'calculations': Count('id')}
+    for prefix, field in METRICS:
+        aggregates[f'{prefix}_sum'] = Sum(field)
+        aggregates[f'{prefix}_count'] = Count(field)
+
+    grouped = calculations.annotate(day=TruncDate('created_at')).values(
+        'day', 'material_id', 'user_id'
+    ).annotate(**aggregates).order_by()
+
+    rows = []
+    for row in grouped:
+        for prefix, _ in METRICS:
+            row[f'{prefix}_sum'] = float(row[f'{prefix}_sum'] or 0)
+        rows.append(CalculationDailyStatistics(date=row.pop('day'), **row))
+
+    with transaction.atomic():
+        rollups.delete()
+        CalculationDailyStatistics.objects.bulk_create(rows, batch_size=1000)
+    return len(rows)
+
+
+def _averages(row: Dict) -> Dict[str, float]:
+    averages = {}
+    for prefix, field in METRICS:
+        count = row[f'{prefix}_count'] or 0
+        averages[field] = round((row[f'{prefix}_sum'] or 0) / count, 2) if count else 0
+    return averages
+
+
+def _sums():
+    sums = {'calculations': Sum('calculations')}
+    for prefix, _ in METRICS:
+        sums[f'{prefix}_sum'] = Sum(f'{prefix}_sum')
+        sums[f'{prefix}_count'] = Sum(f'{prefix}_count')
+    return sums
+
+
+def summarize(rollups) -> Dict:
+    """Celkový počet, nejpoužívanější materiál a průměry nad rollupem"""
+    totals = rollups.aggregate(**_sums())
+    top_material = rollups.values('material__name').annotate(
+        count=Sum('calculations')
+    ).order_by('-count').first()
+
+    return {
+        'total_calculations': totals['calculations'] or 0,
+        'most_used_material': top_material,
+        'averages': _averages(totals),
+    }
+
+
+def breakdown(rollups, group_by: str):
+    """Součty a průměry po dnech / materiálech / uživatelích"""
+    keys = GROUPINGS[group_by]
+    rows = rollups.values(*keys).annotate(**_sums()).order_by(*keys)
+    return [
+        {
+            **{key: row[key] for key in keys},
+            'calculations': row['calculations'],
+            'averages': _averages(row),
+        }
+        for row in rows
+    ]
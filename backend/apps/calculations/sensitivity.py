@@ -0,0 +1,253 @@
+"""
+AWJ Calculations App - Sensitivity Analysis
+Citlivost výsledků na vstupní parametry v pracovním bodě
+
+Všechny modely v services.py jsou mocninné zákony, elasticity
+E = ∂ln(y) / ∂ln(x) jsou proto konstanty nebo jednoduché výrazy a počítají
+se analyticky (řetízkové pravidlo přes řeznou rychlost, průtok a výkon).
+Parciální derivace jsou ∂y/∂x = E · y / x.
+
+Omezení rychlosti (2-5000 mm/min) a drsnosti (0.5-20 μm) model lámou -
+pro body, kde je omezení aktivní nebo ho malá změna vstupu překročí
+(a pro nulové ceny), se použijí centrální konečné diference spočítané
+jedním vektorizovaným voláním perform_full_calculation_batch.
+
+Citlivost se počítá na hladkém modelu (bez zaokrouhlení mezivýsledků).
+"""
+
+from typing import Dict, Optional
+
+import numpy as np
+
+from .services import AWJCalculationService
+
+
+INPUTS = (
+    'thickness', 'pressure', 'nozzle_diameter', 'focus_diameter', 'abrasive_flow', 'mesh_size',
+    'abrasive_cost_per_kg', 'water_cost_per_m3', 'power_cost_per_kwh',
+)
+
+OUTPUTS = (
+    'water_flow', 'hydraulic_power', 'cutting_speed', 'cut_depth', 'surface_roughness', 'cost_per_meter',
+)
+
+DEFAULTS = {
+    'nozzle_diameter': 0.33,
+    'focus_diameter': 1.0,
+    'abrasive_flow': 8,
+    'mesh_size': 80,
+    **AWJCalculationService.DEFAULT_PRICES,
+}
+
+# Relativní krok konečných diferencí (absolutní pro nulové vstupy)
+FD_STEP = 1e-4
+
+
+def _columns(params: Dict) -> Dict[str, np.ndarray]:
+    values = {name: params.get(name, DEFAULTS.get(name)) for name in INPUTS}
+    arrays = np.broadcast_arrays(*[np.asarray(values[name], dtype=np.float64) for name in INPUTS])
+    return {name: np.atleast_1d(array).astype(np.float64) for name, array in zip(INPUTS, arrays)}
+
+
+def _evaluate(material_type, x: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    results = AWJCalculationService.perform_full_calculation_batch(
+        {'material_type': material_type, **x}, round_results=False
+    )
+    return {name: results[name] for name in OUTPUTS}
+
+
+def _unclamped(material_type, x: Dict[str, np.ndarray], y: Dict[str, np.ndarray]):
+    """(rychlost, drsnost) - True tam, kde hodnota není na mezi omezení"""
+    service = AWJCalculationService
+    material = service._material_columns(material_type, len(x['thickness']))
+    speed = service._cutting_speed_kernel(
+        material, x['thickness'], x['pressure'], x['abrasive_flow'],
+        x['nozzle_diameter'], x['focus_diameter'], clamp=False
+    )
+    roughness = service._surface_roughness_kernel(
+        material, y['cutting_speed'], x['abrasive_flow'], x['mesh_size'], clamp=False
+    )
+    return (speed > 2) & (speed < 5000), (roughness > 0.5) & (roughness < 20)
+
+
+def analytic_elasticities(
+    x: Dict[str, np.ndarray], y: Dict[str, np.ndarray], speed_free: np.ndarray, roughness_free: np.ndarray,
+    material: Optional[Dict] = None
+) -> Dict:
+    """
+    Elasticity všech výstupů vůči všem vstupům (řetízkové pravidlo)
+
+    speed_free / roughness_free: body, kde omezení rychlosti / drsnosti není aktivní
+    material: koeficienty modelů (sloupce _material_columns), výchozí MODEL_COEFFICIENTS
+    """
+    zero = np.zeros_like(x['thickness'])
+    coefficients = material or AWJCalculationService.MODEL_COEFFICIENTS
+
+    def terms(**exponents):
+        return {name: zero + exponents.get(name, 0.0) for name in INPUTS}
+
+    # Průtok Q ~ d² · p^0.5, výkon W ~ Q · p
+    water_flow = terms(nozzle_diameter=2.0, pressure=0.5)
+    power = terms(nozzle_diameter=2.0, pressure=1.5)
+
+    # Rychlost V ~ p^a · m^b / t^c · (1 + 0.1 · (f/d - 3)), výchozí a=1.5, b=0.8, c=1.2
+    ratio = x['focus_diameter'] / x['nozzle_diameter']
+    correction = 0.1 * ratio / (1 + 0.1 * (ratio - 3.0))
+    speed = terms(
+        thickness=-coefficients['thickness_exponent'],
+        pressure=coefficients['pressure_exponent'],
+        abrasive_flow=coefficients['abrasive_exponent'],
+    )
+    speed['focus_diameter'] = correction
+    speed['nozzle_diameter'] = -correction
+    speed = {name: np.where(speed_free, value, 0.0) for name, value in speed.items()}
+
+    # Hloubka h ~ p^1.5 · m^0.8 / V^0.5
+    direct = terms(pressure=1.5, abrasive_flow=0.8)
+    depth = {name: direct[name] - 0.5 * speed[name] for name in INPUTS}
+
+    # Drsnost Ra ~ V^0.3 / (m^0.4 · mesh^0.2) (výchozí exponenty)
+    direct = terms(
+        abrasive_flow=-coefficients['roughness_abrasive_exponent'],
+        mesh_size=-coefficients['roughness_mesh_exponent'],
+    )
+    speed_exponent = coefficients['roughness_speed_exponent']
+    roughness = {
+        name: np.where(roughness_free, speed_exponent * speed[name] + direct[name], 0.0) for name in INPUTS
+    }
+
+    # Náklady C = (1000 / V) · (abrazivo + voda + energie) za minutu
+    abrasive = 0.06 * x['abrasive_flow'] * x['abrasive_cost_per_kg']
+    water = y['water_flow'] / 1000 * x['water_cost_per_m3']
+    energy = y['hydraulic_power'] / 60 * x['power_cost_per_kwh']
+    total = abrasive + water + energy
+    shares = [
+        np.divide(part, total, out=np.zeros_like(total), where=total > 0)
+        for part in (abrasive, water, energy)
+    ]
+    components = (
+        terms(abrasive_flow=1.0, abrasive_cost_per_kg=1.0),
+        {**water_flow, 'water_cost_per_m3': zero + 1.0},
+        {**power, 'power_cost_per_kwh': zero + 1.0},
+    )
+    cost = {
+        name: -speed[name] + sum(share * part[name] for share, part in zip(shares, components))
+        for name in INPUTS
+    }
+
+    return {
+        'water_flow': water_flow,
+        'hydraulic_power': power,
+        'cutting_speed': speed,
+        'cut_depth': depth,
+        'surface_roughness': roughness,
+        'cost_per_meter': cost,
+    }
+
+
+def finite_differences(material_type, x: Dict[str, np.ndarray], step: float = FD_STEP):
+    """
+    Centrální konečné diference pro všechny vstupy jedním voláním
+
+    Returns:
+        (derivace {výstup: {vstup: pole}}, body bez omezení pro x-/x+ {vstup: pole})
+    """
+    size = len(x['thickness'])
+    blocks = {name: np.tile(x[name], 2 * len(INPUTS)) for name in INPUTS}
+    deltas = {}
+    for j, name in enumerate(INPUTS):
+        value = x[name]
+        delta = np.where(value != 0, np.abs(value) * step, step)
+        lower = np.maximum(value - delta, 0.0)  # ceny ani rozměry nesmí být záporné
+        upper = value + delta
+        blocks[name][2 * j * size:(2 * j + 1) * size] = lower
+        blocks[name][(2 * j + 1) * size:(2 * j + 2) * size] = upper
+        deltas[name] = upper - lower
+
+    results = _evaluate(material_type, blocks)
+    speed_free, roughness_free = _unclamped(material_type, blocks, results)
+    free = speed_free & roughness_free
+
+    derivatives = {output: {} for output in OUTPUTS}
+    free_around = {}
+    for j, name in enumerate(INPUTS):
+        lower = slice(2 * j * size, (2 * j + 1) * size)
+        upper = slice((2 * j + 1) * size, (2 * j + 2) * size)
+        for output in OUTPUTS:
+            derivatives[output][name] = (results[output][upper] - results[output][lower]) / deltas[name]
+        free_around[name] = free[lower] & free[upper]
+
+    return derivatives, free_around
+
+
+def sensitivity(params: Dict, step: float = FD_STEP) -> Dict:
+    """
+    Citlivost výstupů na vstupy v jednom nebo více pracovních bodech
+
+    Args:
+        params: Vstupy jako perform_full_calculation_batch (skaláry nebo sloupce)
+        step: Relativní krok konečných diferencí
+
+    Returns:
+        values (hladký model), elasticities a derivatives {výstup: {vstup: pole}},
+        finite_difference {vstup: bool pole} - kde se použily konečné diference
+    """
+    material_type = params.get('material_type', 'steel')
+    x = _columns(params)
+    y = _evaluate(material_type, x)
+    speed_free, roughness_free = _unclamped(material_type, x, y)
+    free = speed_free & roughness_free
+
+    material = AWJCalculationService._material_columns(material_type, len(x['thickness']))
+    elasticities = analytic_elasticities(x, y, speed_free, roughness_free, material)
+    fd_derivatives, free_around = finite_differences(material_type, x, step)
+
+    derivatives = {output: {} for output in OUTPUTS}
+    use_fd = {}
+    for name in INPUTS:
+        use_fd[name] = ~(free & free_around[name]) | (x[name] == 0)
+        for output in OUTPUTS:
+            analytic = elasticities[output][name] * y[output] / np.where(x[name] != 0, x[name], 1.0)
+            derivative = np.where(use_fd[name], fd_derivatives[output][name], analytic)
+            derivatives[output][name] = derivative
+            # Nulový výstup (např. náklady při nulových cenách) - elasticita není definovaná, vrací se 0
+            fd_elasticity = np.divide(
+                derivative * x[name], y[output], out=np.zeros_like(derivative), where=y[output] != 0
+            )
+            elasticities[output][name] = np.where(use_fd[name], fd_elasticity, elasticities[output][name])
+
+    return {
+        'values': y,
+        'elasticities': elasticities,
+        'derivatives': derivatives,
+        'finite_difference': use_fd,
+    }
+
+
+def what_if(params: Dict, span: float = 0.2, steps: int = 11, inputs: Optional[tuple] = None) -> Dict:
+    """
+    Průběh výsledků při změně každého vstupu o ±span (relativně) jedním voláním
+
+    Ostatní vstupy zůstávají v pracovním bodě, výsledky jsou zaokrouhlené
+    stejně jako quick_calculate.
+    """
+    inputs = inputs or INPUTS
+    x = {name: float(values[0]) for name, values in _columns(params).items()}
+    factors = 1 + np.linspace(-span, span, steps)
+
+    columns = {name: np.full(steps * len(inputs), value) for name, value in x.items()}
+    for j, name in enumerate(inputs):
+        columns[name][j * steps:(j + 1) * steps] = x[name] * factors
+
+    results = AWJCalculationService.perform_full_calculation_batch(
+        {'material_type': params.get('material_type', 'steel'), **columns}
+    )
+
+    curves = {}
+    for j, name in enumerate(inputs):
+        block = slice(j * steps, (j + 1) * steps)
+        curves[name] = {
+            'values': columns[name][block].tolist(),
+            **{output: results[output][block].tolist() for output in OUTPUTS},
+        }
+    return curves
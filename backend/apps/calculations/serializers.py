@@ -3,8 +3,38 @@ AWJ Calculations App - DRF Serializers
 REST API serializery pro calculations modely
 """
 
+import numpy as np
+from django.conf import settings
+from django.core.validators import MinValueValidator, MaxValueValidator
 from rest_framework import serializers
-from .models import Material, AbrasiveMaterial, AWJCalculation, CalculationHistory, OptimizationPreset
+from .models import (
+    Material, AbrasiveMaterial, AWJCalculation, CalculationHistory,
+    OptimizationPreset, CalculationJob, TariffProfile, MaterialCalibration
+)
+from .materials import (
+    material_key, is_material_key, get_material_snapshot, get_abrasive_catalog, get_tariff_catalog,
+    cost_parameters
+)
+from .services import AWJCalculationService, AWJOptimizationService
+from .optimizer import AWJOptimizationEngine
+from .toolpath import parse_json, parse_toolpath, toolpath_config
+from .planner import OBJECTIVES, SETTING_DEFAULTS, SETTING_FIELDS, planner_config
+
+
+class AsyncFlagMixin:
+    """
+    Volitelný příznak "async" - spustit výpočet jako asynchronní úlohu
+
+    "async" je klíčové slovo Pythonu, pole se proto přidává v get_fields.
+    Validovaná hodnota je ve validated_data['async'].
+    """
+
+    def get_fields(self):
+        fields = super().get_fields()
+        fields['async'] = serializers.BooleanField(
+            default=False, help_text="true = vrátí job_id, výsledek přes /api/jobs/{id}/result/"
+        )
+        return fields
 
 
 class MaterialSerializer(serializers.ModelSerializer):
@@ -32,6 +62,39 @@ class AbrasiveMaterialSerializer(serializers.ModelSerializer):
         read_only_fields = ['id']
 
 
+class TariffProfileSerializer(serializers.ModelSerializer):
+    """Serializer pro TariffProfile model"""
+
+    class Meta:
+        model = TariffProfile
+        fields = [
+            'id', 'name', 'description', 'water_cost_per_m3', 'power_cost_per_kwh',
+            'abrasive_cost_per_kg', 'is_default', 'created_at', 'updated_at'
+        ]
+        read_only_fields = ['id', 'created_at', 'updated_at']
+
+
+class MaterialCalibrationSerializer(serializers.ModelSerializer):
+    """Serializer pro kalibrace koeficientů materiálu"""
+
+    class Meta:
+        model = MaterialCalibration
+        fields = ['id', 'material', 'coefficients', 'metrics', 'samples', 'is_active', 'created_at']
+        read_only_fields = fields
+
+
+class CalibrationRequestSerializer(serializers.Serializer):
+    """Parametry kalibrační úlohy (POST /api/materials/calibrate/)"""
+
+    materials = serializers.ListField(
+        child=serializers.IntegerField(), required=False, allow_empty=False,
+        help_text="Id materiálů (výchozí všechny)"
+    )
+    days = serializers.IntegerField(required=False, min_value=1, max_value=3650)
+    activate = serializers.BooleanField(default=True)
+    dry_run = serializers.BooleanField(default=False)
+
+
 class AWJCalculationSerializer(serializers.ModelSerializer):
     """Hlavní serializer pro AWJ výpočty"""
 
@@ -43,6 +106,20 @@ class AWJCalculationSerializer(serializers.ModelSerializer):
     input_parameters = serializers.SerializerMethodField()
     results = serializers.SerializerMethodField()
 
+    # Sloupce modelu potřebné pro vypočtená pole (pro only() při ?fields=)
+    SPARSE_COLUMNS = {
+        'material_details': ('material',),
+        'abrasive_details': ('abrasive',),
+        'input_parameters': (
+            'material__type', 'abrasive__mesh_size', 'thickness', 'pressure',
+            'nozzle_diameter', 'focus_diameter', 'focus_length', 'abrasive_flow',
+        ),
+        'results': (
+            'cutting_speed', 'hydraulic_power', 'water_flow', 'cut_depth',
+            'surface_roughness', 'cost_per_meter', 'extended_results',
+        ),
+    }
+
     class Meta:
         model = AWJCalculation
         fields = [
@@ -57,6 +134,8 @@ class AWJCalculationSerializer(serializers.ModelSerializer):
             'cutting_speed', 'hydraulic_power', 'water_flow',
             'cut_depth', 'surface_roughness', 'cost_per_meter',
             'extended_results',
+            # Naměřené výsledky (zpětná vazba pro kalibraci)
+            'measured_speed', 'measured_roughness', 'measured_depth',
             # Computed
             'input_parameters', 'results',
             # Metadata
@@ -70,6 +149,38 @@ class AWJCalculationSerializer(serializers.ModelSerializer):
             'created_at', 'updated_at'
         ]
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        # Sparse fieldset: serializovat jen pole z context['fields']
+        requested = self.context.get('fields')
+        if requested:
+            for name in set(self.fields) - set(requested):
+                self.fields.pop(name)
+
+    @classmethod
+    def sparse_columns(cls, fields):
+        """
+        Sloupce pro QuerySet.only() a relace pro select_related()
+
+        Args:
+            fields: Názvy polí serializeru (podmnožina Meta.fields)
+
+        Returns:
+            (sloupce, relace)
+        """
+        columns = {'id', 'created_at'}  # created_at = klíč kurzorového stránkování
+        for name in fields:
+            columns.update(cls.SPARSE_COLUMNS.get(name, (name,)))
+
+        related = {column.split('__')[0] for column in columns if '__' in column}
+        # Nested *_details potřebuje celý řádek relace, ne jen vybrané sloupce
+        full = {name[:-len('_details')] for name in fields if name.endswith('_details')}
+        related |= full
+        columns = {c for c in columns if '__' not in c or c.split('__')[0] not in full} | full
+
+        return sorted(columns), sorted(related)
+
     def get_input_parameters(self, obj):
         """Vrátí vstupní parametry"""
         return obj.get_input_parameters()
@@ -136,12 +247,25 @@ class OptimizationPresetSerializer(serializers.ModelSerializer):
         fields = [
             'id', 'name', 'description', 'target',
             'recommended_params', 'suitable_for_materials',
+            'min_thickness', 'max_thickness',
             'success_rate', 'usage_count',
             'created_at', 'updated_at'
         ]
         read_only_fields = ['id', 'usage_count', 'created_at', 'updated_at']
 
 
+class CalculationJobSerializer(serializers.ModelSerializer):
+    """Serializer pro stav asynchronní úlohy (bez výsledku)"""
+
+    class Meta:
+        model = CalculationJob
+        fields = [
+            'id', 'kind', 'status', 'progress', 'error',
+            'cancel_requested', 'created_at', 'started_at', 'finished_at'
+        ]
+        read_only_fields = fields
+
+
 class QuickCalculationSerializer(serializers.Serializer):
     """
     Serializer pro rychlý výpočet bez uložení do databáze
@@ -162,12 +286,52 @@ class QuickCalculationSerializer(serializers.Serializer):
     mesh_size = serializers.IntegerField(default=80)
 
     # Optional parameters
+    material_id = serializers.IntegerField(
+        required=False, allow_null=True,
+        help_text="Materiál z databáze - výpočet použije jeho konstanty"
+    )
+    abrasive_id = serializers.IntegerField(
+        required=False, allow_null=True,
+        help_text="Abrazivo z databáze - výpočet použije jeho mesh a cenu za kg"
+    )
+    tariff = serializers.CharField(
+        required=False, allow_null=True,
+        help_text="Název tarifu (ceny vody, energie a abraziva), jinak výchozí tarif"
+    )
     material_strength = serializers.FloatField(required=False, allow_null=True)
     save_to_history = serializers.BooleanField(default=False)
 
+    def validate_material_id(self, value):
+        if value is not None and get_material_snapshot().get(material_key(value)) is None:
+            raise serializers.ValidationError(f"Materiál {value} neexistuje")
+        return value
+
+    def validate_abrasive_id(self, value):
+        if value is not None and get_abrasive_catalog().get(value) is None:
+            raise serializers.ValidationError(f"Abrazivo {value} neexistuje")
+        return value
+
+    def validate_tariff(self, value):
+        if value is not None and get_tariff_catalog().get(value) is None:
+            raise serializers.ValidationError(f"Tarif {value} neexistuje")
+        return value
+
     def validate(self, data):
         """Cross-field validation"""
 
+        # Materiál z databáze nahradí vestavěný typ klíčem 'material:<id>'
+        if data.get('material_id') is not None:
+            data['material_type'] = material_key(data.pop('material_id'))
+        else:
+            data.pop('material_id', None)
+
+        # Ceny z tarifu (bez tarifu výchozí) a mesh a cena abraziva z databáze;
+        # abrasive_id a tariff zůstávají pro historii a variace batch výpočtu
+        data.update(cost_parameters(data.get('tariff'), data.get('abrasive_id')))
+        for name in ('abrasive_id', 'tariff'):
+            if data.get(name) is None:
+                data.pop(name, None)
+
         # Kontrola poměru trysky a fokusační trubice
         if data['nozzle_diameter'] >= data['focus_diameter']:
             raise serializers.ValidationError({
@@ -175,7 +339,7 @@ class QuickCalculationSerializer(serializers.Serializer):
             })
 
         # Kontrola rozumnosti parametrů pro daný materiál
-        if data['material_type'] in ['glass', 'ceramic']:
+        if AWJCalculationService.material_kind(data['material_type']) in ['glass', 'ceramic']:
             if data['pressure'] > 400:
                 raise serializers.ValidationError({
                     'pressure': 'Pro křehké materiály se doporučuje tlak max 400 MPa'
@@ -184,18 +348,310 @@ class QuickCalculationSerializer(serializers.Serializer):
         return data
 
 
-class BatchCalculationSerializer(serializers.Serializer):
+class SensitivitySerializer(QuickCalculationSerializer):
+    """
+    Serializer pro analýzu citlivosti v pracovním bodě
+
+    Pracovní bod má stejná pole jako QuickCalculationSerializer; se span
+    se navíc spočítá průběh výsledků při změně každého vstupu o ±span.
+    """
+
+    span = serializers.FloatField(
+        min_value=0.01, max_value=0.9, required=False, allow_null=True,
+        help_text="Relativní rozsah what-if průběhů (0.2 = ±20 %)"
+    )
+    steps = serializers.IntegerField(min_value=3, max_value=101, default=11)
+
+
+class OptimizeSerializer(AsyncFlagMixin, serializers.Serializer):
+    """
+    Serializer pro optimalizaci parametrů (synchronní i asynchronní)
+
+    Rozsahy "bounds" musí být dvojice [min, max] v mezích
+    QuickCalculationSerializer. Validovaná data (kromě "async") jsou přímo
+    argumenty AWJOptimizationService.optimize (včetně cen tarifu a abraziva).
+    """
+
+    material_type = serializers.ChoiceField(
+        choices=QuickCalculationSerializer._declared_fields['material_type'].choices, default='steel'
+    )
+    material_id = serializers.IntegerField(required=False, allow_null=True)
+    abrasive_id = serializers.IntegerField(required=False, allow_null=True)
+    tariff = serializers.CharField(required=False, allow_null=True)
+    thickness = serializers.FloatField(min_value=0.1, max_value=500, default=10)
+    target = serializers.ChoiceField(choices=AWJOptimizationService.TARGETS, default='max_speed')
+    min_speed = serializers.FloatField(min_value=0, max_value=5000, default=50)
+    bounds = serializers.DictField(
+        child=serializers.ListField(child=serializers.FloatField(), min_length=2, max_length=2),
+        required=False, allow_null=True,
+        help_text='{"pressure": [100, 400], "nozzle_diameter": [0.25, 0.4]}'
+    )
+
+    validate_material_id = QuickCalculationSerializer.validate_material_id
+    validate_abrasive_id = QuickCalculationSerializer.validate_abrasive_id
+    validate_tariff = QuickCalculationSerializer.validate_tariff
+
+    def validate_bounds(self, value):
+        if not value:
+            return None
+
+        unknown = set(value) - set(AWJOptimizationEngine.VARIABLES)
+        if unknown:
+            raise serializers.ValidationError(f"Neznámé optimalizační proměnné: {', '.join(sorted(unknown))}")
+
+        fields = QuickCalculationSerializer().fields
+        errors = {}
+        for name, (lower, upper) in value.items():
+            field = fields[name]
+            if lower > upper:
+                errors[name] = f"Neplatný rozsah: {lower} > {upper}"
+            elif lower < field.min_value or upper > field.max_value:
+                errors[name] = f"Rozsah musí ležet v mezích {field.min_value} - {field.max_value}"
+        if errors:
+            raise serializers.ValidationError(errors)
+
+        return {name: (lower, upper) for name, (lower, upper) in value.items()}
+
+    def validate(self, data):
+        # Materiál z databáze nahradí vestavěný typ klíčem 'material:<id>'
+        material_id = data.pop('material_id', None)
+        if material_id is not None:
+            data['material_type'] = material_key(material_id)
+
+        bounds = {**AWJOptimizationEngine.DEFAULT_BOUNDS, **(data.get('bounds') or {})}
+        if bounds['focus_diameter'][1] <= bounds['nozzle_diameter'][0]:
+            raise serializers.ValidationError({
+                'bounds': 'Průměr fokusační trubice musí být větší než průměr trysky'
+            })
+
+        # Ceny tarifu a abraziva se předají optimalizátoru jednou pro celou úlohu
+        data.update(cost_parameters(data.pop('tariff', None), data.pop('abrasive_id', None)))
+        return data
+
+
+class JobEstimateSerializer(QuickCalculationSerializer):
+    """
+    Serializer pro odhad času a nákladů řezu celého dílu
+
+    Parametry řezu jako QuickCalculationSerializer, obrysy dílu jako nahraný
+    soubor (multipart: ASCII DXF nebo JSON) nebo pole "contours" v JSON těle.
+    Validovaná data obsahují navíc 'toolpath' (toolpath.Toolpath).
+    """
+
+    file = serializers.FileField(required=False, help_text="Obrysy dílu - ASCII DXF nebo JSON")
+    contours = serializers.JSONField(
+        required=False,
+        help_text='[{"points": [[x, y], ...], "closed": true}, ...] [mm]'
+    )
+
+    def validate(self, data):
+        data = super().validate(data)
+        config = toolpath_config()
+        upload = data.pop('file', None)
+        contours = data.pop('contours', None)
+
+        if (upload is None) == (contours is None):
+            raise serializers.ValidationError({'file': 'Zadejte buď soubor s obrysy, nebo pole contours'})
+        if upload is not None and upload.size > config['MAX_UPLOAD_SIZE']:
+            raise serializers.ValidationError({
+                'file': f"Maximální velikost souboru je {config['MAX_UPLOAD_SIZE'] // (1024 * 1024)} MB"
+            })
+
+        try:
+            if upload is not None:
+                toolpath = parse_toolpath(upload.read(), upload.name, config['ARC_TOLERANCE'])
+            else:
+                toolpath = parse_json(contours)
+        except ValueError as exc:
+            raise serializers.ValidationError({'file' if upload is not None else 'contours': str(exc)})
+
+        if toolpath.segments == 0:
+            raise serializers.ValidationError({'file': 'Obrysy neobsahují žádný segment řezu'})
+        if toolpath.segments > config['MAX_SEGMENTS']:
+            raise serializers.ValidationError({
+                'file': f"Maximální počet segmentů je {config['MAX_SEGMENTS']}"
+            })
+
+        data['toolpath'] = toolpath
+        return data
+
+
+class PlanSerializer(serializers.Serializer):
+    """
+    Serializer pro plán řezání dílů na více strojích (planner.py)
+
+    Díly i kandidátní nastavení se validují vektorizovaně nad sloupci
+    (jako variace BatchCalculationSerializer). Validovaná data obsahují
+    'parts' a 'candidates' jako sloupce, 'names' a 'prices'.
+    """
+
+    # Číselná pole dílu: (min, max, výchozí hodnota, celé číslo); min je vyloučené u cut_length
+    PART_FIELDS = {
+        'thickness': (0.1, 500, None, False),
+        'cut_length': (0, None, None, False),
+        'pierces': (0, None, 1, True),
+        'quantity': (1, None, 1, True),
+        'rapid_length': (0, None, 0.0, False),
+        'max_roughness': (0, None, np.nan, False),
+    }
+
+    parts = serializers.ListField(
+        child=serializers.DictField(), min_length=1,
+        help_text='[{"name": "A", "material_type": "steel", "thickness": 10, "cut_length": 1200, '
+                  '"pierces": 3, "quantity": 50}, ...]'
+    )
+    candidates = serializers.ListField(
+        child=serializers.DictField(), min_length=1,
+        help_text='Kandidátní nastavení [{"pressure": 380, "abrasive_flow": 8}, ...]'
+    )
+    machines = serializers.IntegerField(min_value=1, default=1)
+    objective = serializers.ChoiceField(choices=OBJECTIVES, default='time')
+    setup_time = serializers.FloatField(min_value=0, required=False, allow_null=True)
+    abrasive_id = serializers.IntegerField(required=False, allow_null=True)
+    tariff = serializers.CharField(required=False, allow_null=True)
+
+    @staticmethod
+    def _invalid_indices(mask):
+        return np.flatnonzero(mask).tolist()[:20]
+
+    def validate_machines(self, value):
+        limit = planner_config()['MAX_MACHINES']
+        if value > limit:
+            raise serializers.ValidationError(f"Maximální počet strojů je {limit}")
+        return value
+
+    def _numeric(self, rows, name, lower, upper, default, integer, exclusive=False):
+        values = [row.get(name, default) for row in rows]
+        try:
+            column = np.asarray([np.nan if v is None else v for v in values], dtype=np.float64)
+        except (TypeError, ValueError):
+            raise serializers.ValidationError(f"{name}: hodnoty musí být čísla")
+
+        missing = np.isnan(column) & (default is None or not np.isnan(default))
+        invalid = missing | np.isinf(column)
+        if lower is not None:
+            invalid |= (column <= lower) if exclusive else (column < lower)
+        if upper is not None:
+            invalid |= column > upper
+        if integer:
+            invalid |= column != np.round(column)
+        if invalid.any():
+            raise serializers.ValidationError(
+                f"{name}: neplatná hodnota v řádcích {self._invalid_indices(invalid)}"
+            )
+        return column
+
+    def _part_columns(self, rows):
+        config = planner_config()
+        if len(rows) > config['MAX_PARTS']:
+            raise serializers.ValidationError(f"Maximální počet dílů je {config['MAX_PARTS']}")
+
+        columns = {
+            name: self._numeric(
+                rows, name, lower, upper, default, integer, exclusive=name in ('cut_length', 'max_roughness')
+            )
+            for name, (lower, upper, default, integer) in self.PART_FIELDS.items()
+        }
+
+        # Materiál: vestavěný typ nebo material_id (klíč 'material:<id>')
+        choices = set(QuickCalculationSerializer().fields['material_type'].choices)
+        snapshot = get_material_snapshot()
+        materials = np.empty(len(rows), dtype=object)
+        invalid = []
+        for i, row in enumerate(rows):
+            material_id = row.get('material_id')
+            if material_id is not None:
+                try:
+                    key = material_key(int(material_id))
+                except (TypeError, ValueError):
+                    key = None
+                if key is None or snapshot.get(key) is None:
+                    invalid.append(i)
+                materials[i] = key
+            elif row.get('material_type') in choices:
+                materials[i] = row['material_type']
+            else:
+                invalid.append(i)
+        if invalid:
+            raise serializers.ValidationError(
+                f"material_type / material_id: neplatný materiál v řádcích {invalid[:20]}"
+            )
+        columns['material_type'] = materials
+        return columns
+
+    def validate_parts(self, value):
+        return {
+            'columns': self._part_columns(value),
+            'names': [str(row.get('name', f'part_{i}')) for i, row in enumerate(value)],
+        }
+
+    def validate_candidates(self, value):
+        limit = planner_config()['MAX_SETTINGS']
+        if len(value) > limit:
+            raise serializers.ValidationError(f"Maximální počet nastavení je {limit}")
+
+        fields = QuickCalculationSerializer().fields
+        columns = {}
+        for name in SETTING_FIELDS:
+            field = fields[name]
+            columns[name] = self._numeric(
+                value, name, field.min_value, field.max_value, SETTING_DEFAULTS.get(name),
+                isinstance(field, serializers.IntegerField)
+            )
+
+        invalid = columns['nozzle_diameter'] >= columns['focus_diameter']
+        if invalid.any():
+            raise serializers.ValidationError(
+                'Průměr fokusační trubice musí být větší než průměr trysky '
+                f'(nastavení {self._invalid_indices(invalid)})'
+            )
+        return columns
+
+    def validate(self, data):
+        parts = data.pop('parts')
+        data['parts'], data['names'] = parts['columns'], parts['names']
+        try:
+            prices = cost_parameters(data.get('tariff'), data.get('abrasive_id'))
+        except LookupError as exc:
+            field = 'tariff' if data.get('abrasive_id') is None else 'abrasive_id'
+            raise serializers.ValidationError({field: str(exc)})
+
+        # Abrazivo z databáze určí mesh nastavení, která mesh_size nezadala
+        mesh_size = prices.pop('mesh_size', None)
+        if mesh_size is not None:
+            explicit = np.array(['mesh_size' in row for row in self.initial_data.get('candidates', [])])
+            data['candidates']['mesh_size'] = np.where(explicit, data['candidates']['mesh_size'], mesh_size)
+        data['prices'] = {
+            name: prices.get(name, default) for name, default in AWJCalculationService.DEFAULT_PRICES.items()
+        }
+        return data
+
+
+class BatchCalculationSerializer(AsyncFlagMixin, serializers.Serializer):
     """
     Serializer pro batch výpočty (více variant najednou)
     Použití pro optimalizaci a porovnání parametrů
+
+    Variace se validují jako celek - pro každý parametr se sestaví sloupec
+    hodnot přes všechny varianty a rozsahy se kontrolují vektorizovaně.
+    Validovaná data obsahují navíc 'columns' pro perform_full_calculation_batch
+    (první řádek je základní varianta).
     """
 
+    RESPONSE_FORMATS = ['records', 'columnar', 'ndjson', 'csv']
+
     base_parameters = QuickCalculationSerializer()
     variations = serializers.ListField(
         child=serializers.DictField(),
-        max_length=50,
+        max_length=settings.AWJ_CALCULATOR.get('MAX_BATCH_VARIATIONS', 10000),
         help_text="Seznam variací parametrů pro porovnání"
     )
+    response_format = serializers.ChoiceField(
+        choices=RESPONSE_FORMATS,
+        default='records',
+        help_text="records = seznam variant, columnar = sloupce hodnot, "
+                  "ndjson / csv = streamovaná odpověď"
+    )
 
     def validate_variations(self, value):
         """Validace variací"""
@@ -210,3 +666,394 @@ class BatchCalculationSerializer(serializers.Serializer):
                 )
 
         return value
+
+    @staticmethod
+    def _invalid_indices(mask):
+        """Vrátí (zkrácený) seznam indexů variant, které neprošly kontrolou"""
+        # Řádek 0 je základní varianta, variace jsou číslované od 0
+        indices = (np.flatnonzero(mask) - 1).tolist()
+        return indices[:20]
+
+    def _material_column(self, material_types, variations):
+        """Nahradí typ materiálu klíčem 'material:<id>' u variací s material_id"""
+        snapshot = get_material_snapshot()
+        column = material_types.copy()
+        missing = []
+        for i, variation in enumerate(variations, start=1):
+            material_id = variation.get('material_id')
+            if material_id is None:
+                continue
+            try:
+                key = material_key(int(material_id))
+            except (TypeError, ValueError):
+                key = None
+            if key is None or snapshot.get(key) is None:
+                missing.append(i - 1)
+                continue
+            column[i] = key
+
+        if missing:
+            raise serializers.ValidationError({'variations': {
+                'material_id': f"Neexistující materiál ve variacích {missing[:20]}"
+            }})
+        return column
+
+    def _price_columns(self, base, mesh_sizes, variations):
+        """
+        Sloupce cen a mesh_size podle tarifu a abraziva jednotlivých variací
+
+        Variace bez tariff / abrasive_id dědí hodnoty základní varianty,
+        každá kombinace se z katalogů vyhodnotí jen jednou.
+        """
+        tariffs = get_tariff_catalog()
+        abrasives = get_abrasive_catalog()
+        defaults = AWJCalculationService.DEFAULT_PRICES
+
+        mesh_sizes = mesh_sizes.copy()
+        prices = {name: np.empty(len(mesh_sizes)) for name in defaults}
+        resolved = {}
+        missing = {'tariff': [], 'abrasive_id': []}
+
+        for i, variation in enumerate([{}] + variations):
+            tariff = variation.get('tariff', base.get('tariff'))
+            abrasive_id = variation.get('abrasive_id', base.get('abrasive_id'))
+            key = (repr(tariff), repr(abrasive_id))
+            if key not in resolved:
+                if tariffs.get(tariff) is None:
+                    resolved[key] = 'tariff'
+                elif abrasive_id is not None and abrasives.get(abrasive_id) is None:
+                    resolved[key] = 'abrasive_id'
+                else:
+                    resolved[key] = cost_parameters(tariff, abrasive_id)
+
+            params = resolved[key]
+            if isinstance(params, str):
+                missing[params].append(i - 1)
+                continue
+            for name, column in prices.items():
+                column[i] = params.get(name, defaults[name])
+            if variation.get('abrasive_id') is not None:
+                mesh_sizes[i] = params['mesh_size']
+
+        errors = {
+            name: f"Neexistující záznam ve variacích {indices[:20]}"
+            for name, indices in missing.items() if indices
+        }
+        if errors:
+            raise serializers.ValidationError({'variations': errors})
+        return mesh_sizes, prices
+
+    def validate(self, data):
+        """Validace všech variací najednou nad sloupci parametrů"""
+
+        base = data['base_parameters']
+        variations = data['variations']
+        fields = QuickCalculationSerializer().fields
+        references = ('material_id', 'abrasive_id', 'tariff')
+        allowed = [name for name in fields if name != 'save_to_history' and name not in references]
+
+        unknown = set().union(*variations) - set(allowed) - set(references)
+        if unknown:
+            raise serializers.ValidationError({
+                'variations': f"Neznámé parametry: {', '.join(sorted(unknown))}"
+            })
+
+        errors = {}
+        columns = {}
+        for name in allowed:
+            if name not in base and not any(name in v for v in variations):
+                continue
+
+            field = fields[name]
+            values = [base.get(name)] + [v.get(name, base.get(name)) for v in variations]
+
+            if isinstance(field, serializers.ChoiceField):
+                column = np.asarray(values, dtype=object)
+                invalid = ~np.isin(column, list(field.choices))
+                if name == 'material_type' and invalid.any():
+                    # Základ s material_id má místo typu klíč 'material:<id>' (zděděný variacemi)
+                    snapshot = get_material_snapshot()
+                    rows = np.flatnonzero(invalid)
+                    invalid[rows] = [
+                        not (is_material_key(value) and snapshot.get(value) is not None) for value in column[rows]
+                    ]
+            else:
+                try:
+                    column = np.asarray(values, dtype=np.float64)
+                except (TypeError, ValueError):
+                    errors[name] = 'Hodnoty musí být čísla'
+                    continue
+                # Nepovinná pole s allow_null: None (NaN) se nekontroluje
+                given = ~np.isnan(column) if field.allow_null else np.ones(len(column), dtype=bool)
+                invalid = given & ~np.isfinite(column)
+                if getattr(field, 'min_value', None) is not None:
+                    invalid |= given & (column < field.min_value)
+                if getattr(field, 'max_value', None) is not None:
+                    invalid |= given & (column > field.max_value)
+                if isinstance(field, serializers.IntegerField):
+                    invalid |= given & (column != np.round(column))
+
+            if invalid.any():
+                errors[name] = f"Neplatná hodnota ve variacích {self._invalid_indices(invalid)}"
+            columns[name] = column
+
+        if errors:
+            raise serializers.ValidationError({'variations': errors})
+
+        # Variace s material_id počítají s materiálem z databáze
+        if any(v.get('material_id') is not None for v in variations):
+            columns['material_type'] = self._material_column(columns['material_type'], variations)
+
+        # Tarif a abrazivo z databáze (v základu nebo ve variacích) určí ceny a mesh
+        priced = any(name in base for name in AWJCalculationService.DEFAULT_PRICES)
+        if priced or any('tariff' in v or v.get('abrasive_id') is not None for v in variations):
+            columns['mesh_size'], prices = self._price_columns(base, columns['mesh_size'], variations)
+            columns.update(prices)
+
+        # Cross-field validace (stejná pravidla jako QuickCalculationSerializer)
+        invalid = columns['nozzle_diameter'] >= columns['focus_diameter']
+        if invalid.any():
+            raise serializers.ValidationError({'variations': {
+                'focus_diameter': 'Průměr fokusační trubice musí být větší než průměr trysky '
+                                  f'(variace {self._invalid_indices(invalid)})'
+            }})
+
+        types, inverse = np.unique(columns['material_type'].astype(str), return_inverse=True)
+        kinds = np.array([AWJCalculationService.material_kind(t) for t in types], dtype=object)
+        brittle = np.isin(kinds, ['glass', 'ceramic'])[inverse]
+        invalid = brittle & (columns['pressure'] > 400)
+        if invalid.any():
+            raise serializers.ValidationError({'variations': {
+                'pressure': 'Pro křehké materiály se doporučuje tlak max 400 MPa '
+                            f'(variace {self._invalid_indices(invalid)})'
+            }})
+
+        data['columns'] = columns
+        return data
+
+
+class BulkCalculationCreateSerializer(serializers.Serializer):
+    """
+    Serializer pro hromadné vytvoření uložených výpočtů
+
+    Každý řádek má stejná pole jako AWJCalculationCreateSerializer. Rozsahy
+    se kontrolují vektorizovaně podle validátorů modelu, materiály a abraziva
+    se načtou jedním dotazem na tabulku. Validovaná data obsahují 'rows'
+    (hodnoty polí modelu) a 'columns' pro perform_full_calculation_batch.
+    """
+
+    NUMERIC_FIELDS = [
+        'thickness', 'pressure', 'nozzle_diameter',
+        'focus_diameter', 'focus_length', 'abrasive_flow'
+    ]
+
+    calculations = serializers.ListField(
+        child=serializers.DictField(),
+        min_length=1,
+        max_length=settings.AWJ_CALCULATOR.get('MAX_BULK_CREATE', 10000),
+        help_text="Seznam výpočtů (material, abrasive, thickness, pressure, ...)"
+    )
+
+    @staticmethod
+    def _invalid_indices(mask):
+        return np.flatnonzero(mask).tolist()[:20]
+
+    @staticmethod
+    def _limits(model_field):
+        lower = upper = None
+        for validator in model_field.validators:
+            if isinstance(validator, MinValueValidator):
+                lower = validator.limit_value
+            elif isinstance(validator, MaxValueValidator):
+                upper = validator.limit_value
+        return lower, upper
+
+    def _related(self, rows, name, model):
+        """Načte instance podle id jedním dotazem, vrátí seznam (None = bez vazby)"""
+        try:
+            ids = [None if row.get(name) is None else int(row[name]) for row in rows]
+        except (TypeError, ValueError):
+            raise serializers.ValidationError({'calculations': {name: 'Neplatné id'}})
+
+        wanted = {pk for pk in ids if pk is not None}
+        found = model.objects.in_bulk(wanted) if wanted else {}
+
+        missing = [i for i, pk in enumerate(ids) if pk is not None and pk not in found]
+        if missing:
+            raise serializers.ValidationError({'calculations': {
+                name: f"Neexistující záznam v řádcích {missing[:20]}"
+            }})
+        return [found.get(pk) for pk in ids]
+
+    def validate(self, data):
+        rows = data['calculations']
+        allowed = set(AWJCalculationCreateSerializer.Meta.fields)
+
+        unknown = set().union(*rows) - allowed
+        if unknown:
+            raise serializers.ValidationError({
+                'calculations': f"Neznámé parametry: {', '.join(sorted(unknown))}"
+            })
+
+        errors = {}
+        columns = {}
+        for name in self.NUMERIC_FIELDS:
+            model_field = AWJCalculation._meta.get_field(name)
+            if model_field.has_default():
+                values = [row.get(name, model_field.default) for row in rows]
+            else:
+                values = [row.get(name) for row in rows]
+
+            try:
+                column = np.asarray(values, dtype=np.float64)
+            except (TypeError, ValueError):
+                errors[name] = 'Hodnoty musí být čísla'
+                continue
+
+            invalid = ~np.isfinite(column)
+            lower, upper = self._limits(model_field)
+            if lower is not None:
+                invalid |= column < lower
+            if upper is not None:
+                invalid |= column > upper
+            if invalid.any():
+                errors[name] = f"Chybějící nebo neplatná hodnota v řádcích {self._invalid_indices(invalid)}"
+            columns[name] = column
+
+        if errors:
+            raise serializers.ValidationError({'calculations': errors})
+
+        materials = self._related(rows, 'material', Material)
+        abrasives = self._related(rows, 'abrasive', AbrasiveMaterial)
+
+        # Stejné výchozí hodnoty jako při vytvoření jednoho výpočtu
+        columns['material_type'] = np.asarray(
+            [material_key(m.pk) if m else 'steel' for m in materials], dtype=object
+        )
+        columns['mesh_size'] = np.asarray(
+            [a.mesh_size if a else 80 for a in abrasives], dtype=np.float64
+        )
+
+        # Ceny výchozího tarifu, cena abraziva z vybraného abraziva
+        prices = {**AWJCalculationService.DEFAULT_PRICES, **get_tariff_catalog().get()}
+        columns['abrasive_cost_per_kg'] = np.asarray(
+            [float(a.cost_per_kg) if a else prices['abrasive_cost_per_kg'] for a in abrasives],
+            dtype=np.float64
+        )
+        columns['water_cost_per_m3'] = prices['water_cost_per_m3']
+        columns['power_cost_per_kwh'] = prices['power_cost_per_kwh']
+
+        data['rows'] = [
+            {
+                'material': material,
+                'abrasive': abrasive,
+                'notes': str(row.get('notes') or ''),
+                **{name: float(columns[name][i]) for name in self.NUMERIC_FIELDS},
+            }
+            for i, (row, material, abrasive) in enumerate(zip(rows, materials, abrasives))
+        ]
+        data['columns'] = columns
+        return data
+
+
+class SweepAxisSerializer(serializers.Serializer):
+    """Osa sweepu - rozsah s počtem bodů, nebo explicitní hodnoty"""
+
+    min = serializers.FloatField(required=False)
+    max = serializers.FloatField(required=False)
+    points = serializers.IntegerField(min_value=1, max_value=1000, default=10)
+    spacing = serializers.ChoiceField(choices=['linear', 'log'], default='linear')
+    values = serializers.ListField(child=serializers.FloatField(), required=False, max_length=1000)
+
+    def validate(self, data):
+        if 'values' not in data and ('min' not in data or 'max' not in data):
+            raise serializers.ValidationError("Zadejte 'values' nebo 'min' a 'max'")
+        if 'values' not in data and data['min'] > data['max']:
+            raise serializers.ValidationError("'min' musí být menší nebo rovno 'max'")
+        return data
+
+    @staticmethod
+    def to_values(data):
+        """Hodnoty osy jako NumPy pole"""
+        if 'values' in data:
+            return np.asarray(data['values'], dtype=np.float64)
+        if data['spacing'] == 'log':
+            return np.geomspace(data['min'], data['max'], data['points'])
+        return np.linspace(data['min'], data['max'], data['points'])
+
+
+class SweepSerializer(serializers.Serializer):
+    """
+    Serializer pro streamovaný sweep přes prostor parametrů
+    Osy, které nejsou zadány, mají výchozí hodnotu z QuickCalculationSerializer
+    """
+
+    STREAM_FORMATS = ['ndjson', 'csv']
+
+    materials = serializers.ListField(
+        child=serializers.ChoiceField(choices=QuickCalculationSerializer._declared_fields['material_type'].choices),
+        min_length=1
+    )
+    axes = serializers.DictField(child=SweepAxisSerializer())
+    response_format = serializers.ChoiceField(choices=STREAM_FORMATS, default='ndjson')
+
+    SWEEP_PARAMETERS = [
+        'thickness', 'pressure', 'nozzle_diameter', 'focus_diameter',
+        'focus_length', 'abrasive_flow', 'mesh_size'
+    ]
+
+    def validate_axes(self, value):
+        unknown = set(value) - set(self.SWEEP_PARAMETERS)
+        if unknown:
+            raise serializers.ValidationError(f"Neznámé parametry: {', '.join(sorted(unknown))}")
+        for required in ('thickness', 'pressure'):
+            if required not in value:
+                raise serializers.ValidationError(f"Chybí osa '{required}'")
+        return value
+
+    def validate(self, data):
+        """Kontrola rozsahů os a celkové velikosti sweepu"""
+        fields = QuickCalculationSerializer().fields
+        axes = {}
+        errors = {}
+
+        for name in self.SWEEP_PARAMETERS:
+            field = fields[name]
+            if name in data['axes']:
+                values = SweepAxisSerializer.to_values(data['axes'][name])
+            else:
+                values = np.asarray([field.default], dtype=np.float64)
+
+            if field.min_value is not None and values.min() < field.min_value:
+                errors[name] = f"Minimální hodnota je {field.min_value}"
+            elif field.max_value is not None and values.max() > field.max_value:
+                errors[name] = f"Maximální hodnota je {field.max_value}"
+            axes[name] = values
+
+        if errors:
+            raise serializers.ValidationError({'axes': errors})
+
+        rows = len(data['materials']) * int(np.prod([len(v) for v in axes.values()]))
+        max_rows = settings.AWJ_CALCULATOR.get('MAX_SWEEP_ROWS', 5_000_000)
+        if rows > max_rows:
+            raise serializers.ValidationError(f"Sweep má {rows} kombinací, maximum je {max_rows}")
+
+        data['grid'] = axes
+        return data
+
+
+class StatisticsQuerySerializer(serializers.Serializer):
+    """Query parametry /api/statistics/summary/ (časové okno a rozpad)"""
+
+    since = serializers.DateField(required=False)
+    until = serializers.DateField(required=False)
+    days = serializers.IntegerField(required=False, min_value=1, max_value=3650)
+    user = serializers.CharField(required=False, help_text="'me' nebo id uživatele (jen staff)")
+    group_by = serializers.ChoiceField(choices=['day', 'material', 'user'], required=False)
+
+    def validate(self, data):
+        if 'days' in data and 'since' in data:
+            raise serializers.ValidationError({'days': 'Použijte buď days, nebo since'})
+        if data.get('since') and data.get('until') and data['since'] > data['until']:
+            raise serializers.ValidationError({'until': 'until musí být po since'})
+        return data
@@ -4,12 +4,39 @@ Servisní vrstva s výpočetními algoritmy pro AWJ
 Obsahuje reálné fyzikální vzorce a empirické modely
 """
 
+import copy
 import math
+from functools import lru_cache
 import numpy as np
-from typing import Dict, Tuple, Optional
+from typing import Dict, List, Tuple, Optional
 from decimal import Decimal
 
 
+def _round_half_even(values: np.ndarray, ndigits: int) -> np.ndarray:
+    """
+    Vektorizované zaokrouhlení shodné s vestavěným round()
+
+    np.round násobí 10^n a výsledek tak může u hodnot ležících těsně
+    u poloviny padnout na jinou stranu než round() (který zaokrouhluje
+    přesnou binární hodnotu). Tyto hraniční prvky se přepočítají skalárně.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    scale = 10.0 ** ndigits
+    scaled = values * scale
+    rounded = np.rint(scaled) / scale
+
+    frac = np.abs(scaled - np.trunc(scaled))
+    tolerance = 8 * np.finfo(np.float64).eps * np.maximum(np.abs(scaled), 1.0)
+    suspicious = np.abs(frac - 0.5) <= tolerance
+    if suspicious.any():
+        idx = np.flatnonzero(suspicious)
+        flat_values = values.reshape(-1)
+        flat_rounded = rounded.reshape(-1)
+        flat_rounded[idx] = [round(float(flat_values[i]), ndigits) for i in idx]
+
+    return rounded
+
+
 class AWJCalculationService:
     """
     Hlavní servisní třída pro AWJ výpočty
@@ -35,6 +62,54 @@ class AWJCalculationService:
         'composite': {'k': 0.9, 'density': 1600, 'strength': 250, 'roughness_factor': 1.1},
     }
 
+    # Empirické exponenty a konstanty modelů rychlosti, hloubky a drsnosti (z výzkumu);
+    # kalibrace z naměřených výsledků je může pro materiál z databáze přepsat (calibration.py)
+    MODEL_COEFFICIENTS = {
+        'pressure_exponent': 1.5,  # a - exponent tlaku
+        'abrasive_exponent': 0.8,  # b - exponent abraziva
+        'thickness_exponent': 1.2,  # c - exponent tloušťky
+        'strength_exponent': 0.5,  # d - exponent pevnosti
+        'depth_factor': 10.0,  # normalizační faktor hloubky řezu
+        'roughness_speed_exponent': 0.3,
+        'roughness_abrasive_exponent': 0.4,
+        'roughness_mesh_exponent': 0.2,
+    }
+
+    # Výchozí ceny pro výpočet nákladů (bez tarifu a abraziva z databáze)
+    DEFAULT_PRICES = {
+        'abrasive_cost_per_kg': 25.0,  # Kč/kg
+        'water_cost_per_m3': 100.0,  # Kč/m³
+        'power_cost_per_kwh': 4.0,  # Kč/kWh
+    }
+
+    @classmethod
+    def material_properties(cls, material_type: str) -> Dict:
+        """
+        Materiálové konstanty pro typ materiálu
+
+        Vestavěné typy se berou z MATERIAL_PROPERTIES, klíče 'material:<id>'
+        ze snapshotu tabulky Material (viz materials.py). Neznámé typy se
+        nahradí ocelí.
+        """
+        props = cls.MATERIAL_PROPERTIES.get(material_type)
+        if props is None:
+            from .materials import is_material_key, get_material_snapshot
+            if is_material_key(material_type):
+                props = get_material_snapshot().get(material_type)
+        return props or cls.MATERIAL_PROPERTIES['steel']
+
+    @classmethod
+    def material_coefficients(cls, material_type: str) -> Dict:
+        """Materiálové konstanty doplněné o (případně kalibrované) koeficienty modelů"""
+        return {**cls.MODEL_COEFFICIENTS, **cls.material_properties(material_type)}
+
+    @classmethod
+    def material_kind(cls, material_type: str) -> str:
+        """Vestavěný typ materiálu (pro 'material:<id>' typ záznamu Material)"""
+        if material_type in cls.MATERIAL_PROPERTIES:
+            return material_type
+        return cls.material_properties(material_type).get('type', 'steel')
+
     @classmethod
     def calculate_water_flow(cls, nozzle_diameter: float, pressure: float) -> float:
         """
@@ -116,15 +191,15 @@ class AWJCalculationService:
         """
 
         # Získání materiálových vlastností
-        mat_props = cls.MATERIAL_PROPERTIES.get(material_type, cls.MATERIAL_PROPERTIES['steel'])
+        mat_props = cls.material_coefficients(material_type)
         k_material = mat_props['k']
         strength = mat_props['strength']
 
-        # Empirické exponenty (z výzkumu AWJ)
-        a = 1.5  # exponent tlaku
-        b = 0.8  # exponent abraziva
-        c = 1.2  # exponent tloušťky
-        d = 0.5  # exponent pevnosti
+        # Empirické exponenty (z výzkumu AWJ, případně kalibrované)
+        a = mat_props['pressure_exponent']  # exponent tlaku
+        b = mat_props['abrasive_exponent']  # exponent abraziva
+        c = mat_props['thickness_exponent']  # exponent tloušťky
+        d = mat_props['strength_exponent']  # exponent pevnosti
 
         # Základní výpočet řezné rychlosti
         numerator = k_material * (pressure ** a) * (abrasive_flow ** b)
@@ -167,14 +242,14 @@ class AWJCalculationService:
             Hloubka řezu [mm]
         """
 
-        mat_props = cls.MATERIAL_PROPERTIES.get(material_type, cls.MATERIAL_PROPERTIES['steel'])
+        mat_props = cls.material_coefficients(material_type)
         k_material = mat_props['k']
 
         # Empirický vzorec pro hloubku
         # h = k * (P^1.5 * m_a^0.8) / v^0.5
         depth = k_material * (pressure ** 1.5) * (abrasive_flow ** 0.8) / (cutting_speed ** 0.5)
 
-        depth *= 10  # Normalizační faktor
+        depth *= mat_props['depth_factor']  # Normalizační faktor
 
         return round(depth, 2)
 
@@ -199,14 +274,15 @@ class AWJCalculationService:
             Drsnost Ra [μm]
         """
 
-        mat_props = cls.MATERIAL_PROPERTIES.get(material_type, cls.MATERIAL_PROPERTIES['steel'])
+        mat_props = cls.material_coefficients(material_type)
         roughness_factor = mat_props['roughness_factor']
 
         # Základní drsnost závisí na rychlosti a abraziv
         # Ra = k * v^0.3 / (m_a^0.4 * mesh^0.2)
 
-        base_roughness = roughness_factor * (cutting_speed ** 0.3) / (
-            (abrasive_flow ** 0.4) * (mesh_size ** 0.2)
+        base_roughness = roughness_factor * (cutting_speed ** mat_props['roughness_speed_exponent']) / (
+            (abrasive_flow ** mat_props['roughness_abrasive_exponent'])
+            * (mesh_size ** mat_props['roughness_mesh_exponent'])
         )
 
         # Typické Ra pro AWJ je 1-15 μm
@@ -222,9 +298,9 @@ class AWJCalculationService:
         abrasive_flow: float,
         cutting_speed: float,
         water_flow: float,
-        abrasive_cost_per_kg: float = 25.0,
-        water_cost_per_m3: float = 100.0,
-        power_cost_per_kwh: float = 4.0,
+        abrasive_cost_per_kg: Optional[float] = None,
+        water_cost_per_m3: Optional[float] = None,
+        power_cost_per_kwh: Optional[float] = None,
         hydraulic_power: float = 0.0
     ) -> Decimal:
         """
@@ -234,14 +310,20 @@ class AWJCalculationService:
             abrasive_flow: Tok abraziva [g/s]
             cutting_speed: Řezná rychlost [mm/min]
             water_flow: Průtok vody [l/min]
-            abrasive_cost_per_kg: Cena abraziva [Kč/kg]
-            water_cost_per_m3: Cena vody [Kč/m³]
-            power_cost_per_kwh: Cena elektrické energie [Kč/kWh]
+            abrasive_cost_per_kg: Cena abraziva [Kč/kg], výchozí z DEFAULT_PRICES
+            water_cost_per_m3: Cena vody [Kč/m³], výchozí z DEFAULT_PRICES
+            power_cost_per_kwh: Cena elektrické energie [Kč/kWh], výchozí z DEFAULT_PRICES
             hydraulic_power: Hydraulický výkon [kW]
 
         Returns:
             Náklady [Kč/m]
         """
+        if abrasive_cost_per_kg is None:
+            abrasive_cost_per_kg = cls.DEFAULT_PRICES['abrasive_cost_per_kg']
+        if water_cost_per_m3 is None:
+            water_cost_per_m3 = cls.DEFAULT_PRICES['water_cost_per_m3']
+        if power_cost_per_kwh is None:
+            power_cost_per_kwh = cls.DEFAULT_PRICES['power_cost_per_kwh']
 
         # Čas na 1 metr [min]
         time_per_meter_min = 1000 / cutting_speed  # 1000 mm = 1 m
@@ -284,6 +366,7 @@ class AWJCalculationService:
         focus_length = params.get('focus_length', 76)
         abrasive_flow = params.get('abrasive_flow', 8)
         mesh_size = params.get('mesh_size', 80)
+        prices = {name: params.get(name, default) for name, default in cls.DEFAULT_PRICES.items()}
 
         # 1. Průtok vody
         water_flow = cls.calculate_water_flow(nozzle_diameter, pressure)
@@ -322,7 +405,8 @@ class AWJCalculationService:
             abrasive_flow=abrasive_flow,
             cutting_speed=cutting_speed,
             water_flow=water_flow,
-            hydraulic_power=hydraulic_power
+            hydraulic_power=hydraulic_power,
+            **prices
         )
 
         # Sestavení výsledků
@@ -351,10 +435,207 @@ class AWJCalculationService:
 
         return results
 
+    @classmethod
+    def _material_columns(cls, material_type, size: int) -> Dict[str, np.ndarray]:
+        """
+        Převede typ(y) materiálu na sloupce materiálových konstant
+
+        Neznámé typy se stejně jako ve skalárních výpočtech nahradí ocelí.
+        Koeficienty modelů jsou pro jeden materiál skaláry (stejné operace
+        jako s konstantními exponenty), pro více materiálů sloupce.
+        """
+        materials = np.asarray(material_type, dtype=object)
+        if materials.ndim == 0:
+            props = cls.material_coefficients(material_type)
+            return {
+                **{key: np.full(size, float(props[key])) for key in ('k', 'strength', 'roughness_factor')},
+                **{key: float(props[key]) for key in cls.MODEL_COEFFICIENTS},
+            }
+
+        materials = np.broadcast_to(materials, (size,))
+        unique_types, inverse = np.unique(materials.astype(str), return_inverse=True)
+        table = [cls.material_coefficients(t) for t in unique_types]
+        return {
+            key: np.array([float(props[key]) for props in table])[inverse]
+            for key in ('k', 'strength', 'roughness_factor', *cls.MODEL_COEFFICIENTS)
+        }
+
+    @staticmethod
+    def _cutting_speed_kernel(
+        material: Dict[str, np.ndarray],
+        thickness: np.ndarray,
+        pressure: np.ndarray,
+        abrasive_flow: np.ndarray,
+        nozzle_diameter: np.ndarray,
+        focus_diameter: np.ndarray,
+        clamp: bool = True
+    ) -> np.ndarray:
+        """Vektorizovaná řezná rychlost [mm/min] bez zaokrouhlení (viz calculate_cutting_speed)"""
+        numerator = material['k'] * (pressure ** material['pressure_exponent']) * (
+            abrasive_flow ** material['abrasive_exponent']
+        )
+        denominator = (thickness ** material['thickness_exponent']) * (
+            material['strength'] ** material['strength_exponent']
+        )
+        speed = numerator / denominator
+        speed = speed * (1 + 0.1 * (focus_diameter / nozzle_diameter - 3.0))
+        speed = speed * 60
+        return np.clip(speed, 2, 5000) if clamp else speed
+
+    @staticmethod
+    def _cut_depth_kernel(
+        material: Dict[str, np.ndarray],
+        pressure: np.ndarray,
+        abrasive_flow: np.ndarray,
+        cutting_speed: np.ndarray
+    ) -> np.ndarray:
+        """Vektorizovaná hloubka řezu [mm] bez zaokrouhlení (viz calculate_cut_depth)"""
+        depth = material['k'] * (pressure ** 1.5) * (abrasive_flow ** 0.8) / (cutting_speed ** 0.5)
+        return depth * material['depth_factor']
+
+    @staticmethod
+    def _surface_roughness_kernel(
+        material: Dict[str, np.ndarray],
+        cutting_speed: np.ndarray,
+        abrasive_flow: np.ndarray,
+        mesh_size: np.ndarray,
+        clamp: bool = True
+    ) -> np.ndarray:
+        """Vektorizovaná drsnost Ra [μm] bez zaokrouhlení (viz calculate_surface_roughness)"""
+        base_roughness = material['roughness_factor'] * (cutting_speed ** material['roughness_speed_exponent']) / (
+            (abrasive_flow ** material['roughness_abrasive_exponent'])
+            * (mesh_size ** material['roughness_mesh_exponent'])
+        )
+        roughness = base_roughness * 2.0
+        return np.clip(roughness, 0.5, 20) if clamp else roughness
+
+    @classmethod
+    def perform_full_calculation_batch(cls, params: Dict, round_results: bool = True) -> Dict:
+        """
+        Vektorizovaná varianta perform_full_calculation pro mnoho variant najednou
+
+        Vstupem je dictionary sloupců (pole stejné délky nebo skaláry, které
+        se rozšíří na celou dávku). Výsledky jsou sloupce NumPy polí
+        (struct-of-arrays) a pro každý prvek odpovídají bit po bitu výsledku
+        perform_full_calculation včetně zaokrouhlení a omezení rychlosti.
+
+        S round_results=False se mezivýsledky nezaokrouhlují - hladký model
+        pro spojité optimalizátory (omezení rychlosti 2-5000 mm/min zůstává).
+
+        Args:
+            params: Dictionary se sloupci vstupních parametrů
+            round_results: Zaokrouhlovat jako skalární výpočet
+
+        Returns:
+            Dictionary se sloupci vypočtených výsledků
+        """
+
+        rnd = _round_half_even if round_results else (lambda values, ndigits: values)
+
+        columns = {
+            'thickness': params['thickness'],
+            'pressure': params['pressure'],
+            'nozzle_diameter': params.get('nozzle_diameter', 0.33),
+            'focus_diameter': params.get('focus_diameter', 1.0),
+            'abrasive_flow': params.get('abrasive_flow', 8),
+            'mesh_size': params.get('mesh_size', 80),
+            **{name: params.get(name, default) for name, default in cls.DEFAULT_PRICES.items()},
+        }
+        names = list(columns)
+        arrays = np.broadcast_arrays(*[np.asarray(columns[n], dtype=np.float64) for n in names])
+        size = max(arrays[0].size, np.asarray(params.get('material_type', 'steel'), dtype=object).size)
+        arrays = [np.broadcast_to(a, (size,)).ravel() for a in arrays]
+        (thickness, pressure, nozzle_diameter, focus_diameter, abrasive_flow, mesh_size,
+         abrasive_cost_per_kg, water_cost_per_m3, power_cost_per_kwh) = arrays
+
+        material = cls._material_columns(params.get('material_type', 'steel'), size)
+
+        # 1. Průtok vody
+        d_m = nozzle_diameter / 1000
+        area = math.pi * (d_m / 2) ** 2
+        water_velocity = np.sqrt(2 * (pressure * 1e6) / cls.WATER_DENSITY)
+        water_flow = rnd(area * (cls.C_DISCHARGE * water_velocity) * 1000 * 60, 2)
+
+        # 2. Hydraulický výkon
+        hydraulic_power = rnd(water_flow / (1000 * 60) * (pressure * 1e6) / 1000, 2)
+
+        # 3. Řezná rychlost
+        cutting_speed = rnd(cls._cutting_speed_kernel(
+            material, thickness, pressure, abrasive_flow, nozzle_diameter, focus_diameter
+        ), 1)
+
+        # 4. Hloubka řezu
+        cut_depth = rnd(cls._cut_depth_kernel(material, pressure, abrasive_flow, cutting_speed), 2)
+
+        # 5. Drsnost povrchu
+        surface_roughness = rnd(cls._surface_roughness_kernel(
+            material, cutting_speed, abrasive_flow, mesh_size
+        ), 2)
+
+        # 6. Náklady
+        time_per_meter_min = 1000 / cutting_speed
+        cost_abrasive = (abrasive_flow / 1000) * time_per_meter_min * 60 * abrasive_cost_per_kg
+        cost_water = (water_flow / 1000) * time_per_meter_min * water_cost_per_m3
+        cost_energy = (hydraulic_power / 60) * time_per_meter_min * power_cost_per_kwh
+        cost_per_meter = rnd(cost_abrasive + cost_water + cost_energy, 2)
+
+        # Rychlost vody pro extended výsledky (stejné pořadí operací jako skalárně)
+        jet_velocity = np.sqrt(2 * pressure * 1e6 / cls.WATER_DENSITY)
+
+        return {
+            'water_flow': water_flow,
+            'hydraulic_power': hydraulic_power,
+            'cutting_speed': cutting_speed,
+            'cut_depth': cut_depth,
+            'surface_roughness': surface_roughness,
+            'cost_per_meter': cost_per_meter,
+
+            'extended': {
+                'water_velocity': rnd(jet_velocity, 2),
+                'kinetic_energy': rnd(
+                    0.5 * cls.WATER_DENSITY * (jet_velocity ** 2), 2
+                ),
+                'mass_flow_rate': rnd(water_flow * cls.WATER_DENSITY / 60000, 4),
+                'abrasive_ratio': rnd(
+                    abrasive_flow / (water_flow * cls.WATER_DENSITY / 60), 3
+                ),
+                'specific_energy': rnd(hydraulic_power * 1000 / cutting_speed, 2),
+            }
+        }
+
+    @staticmethod
+    def batch_results_to_columns(results: Dict) -> Dict:
+        """
+        Převede sloupce NumPy polí z perform_full_calculation_batch na seznamy
+        (kompaktní sloupcový formát vhodný pro JSON)
+        """
+        columns = {key: value.tolist() for key, value in results.items() if key != 'extended'}
+        columns['extended'] = {key: value.tolist() for key, value in results['extended'].items()}
+        return columns
+
+    @classmethod
+    def batch_results_to_records(cls, results: Dict) -> List[Dict]:
+        """
+        Rozdělí výsledky perform_full_calculation_batch na seznam dictionary
+        ve stejném tvaru, jaký vrací perform_full_calculation
+        """
+        columns = cls.batch_results_to_columns(results)
+        extended = columns.pop('extended')
+
+        keys = list(columns)
+        extended_keys = list(extended)
+        rows = zip(zip(*columns.values()), zip(*extended.values()))
+
+        return [
+            {**dict(zip(keys, values)), 'extended': dict(zip(extended_keys, extended_values))}
+            for values, extended_values in rows
+        ]
+
 
 class AWJOptimizationService:
     """
     Servis pro optimalizaci AWJ parametrů
+    Deleguje na AWJOptimizationEngine (vektorizovaný grid + lokální zpřesnění)
     """
 
     @staticmethod
@@ -362,88 +643,131 @@ class AWJOptimizationService:
         material_type: str,
         thickness: float,
         pressure_range: Tuple[float, float] = (100, 600),
-        abrasive_range: Tuple[float, float] = (1, 20)
+        abrasive_range: Tuple[float, float] = (1, 20),
+        bounds: Optional[Dict[str, Tuple[float, float]]] = None,
+        **engine_options
     ) -> Dict:
         """
         Optimalizace parametrů pro maximální rychlost
 
         Returns:
-            Optimální parametry a očekávaná rychlost
-        """
-
-        best_speed = 0
-        best_params = {}
-
-        # Grid search přes možné kombinace
-        for pressure in np.linspace(pressure_range[0], pressure_range[1], 10):
-            for abrasive in np.linspace(abrasive_range[0], abrasive_range[1], 10):
-                speed = AWJCalculationService.calculate_cutting_speed(
-                    material_type=material_type,
-                    thickness=thickness,
-                    pressure=float(pressure),
-                    abrasive_flow=float(abrasive),
-                    nozzle_diameter=0.33,
-                    focus_diameter=1.0
-                )
-
-                if speed > best_speed:
-                    best_speed = speed
-                    best_params = {
-                        'pressure': round(float(pressure), 1),
-                        'abrasive_flow': round(float(abrasive), 1),
-                        'expected_speed': round(speed, 1)
-                    }
-
-        return best_params
+            Optimální parametry, očekávaná rychlost a statistiky optimalizátoru
+        """
+        from .optimizer import AWJOptimizationEngine
+
+        engine = AWJOptimizationEngine(
+            material_type=material_type,
+            thickness=thickness,
+            bounds={'pressure': pressure_range, 'abrasive_flow': abrasive_range, **(bounds or {})},
+            **engine_options
+        )
+        return engine.maximize_speed()
 
     @staticmethod
     def optimize_for_cost(
         material_type: str,
         thickness: float,
-        min_speed: float = 50  # Minimální přijatelná rychlost
+        min_speed: float = 50,  # Minimální přijatelná rychlost
+        bounds: Optional[Dict[str, Tuple[float, float]]] = None,
+        **engine_options
     ) -> Dict:
         """
         Optimalizace parametrů pro minimální náklady
         při zachování minimální rychlosti
 
         Returns:
-            Optimální parametry a očekávané náklady
-        """
-
-        best_cost = float('inf')
-        best_params = {}
-
-        for pressure in np.linspace(100, 400, 10):  # Nižší tlaky = nižší náklady
-            for abrasive in np.linspace(3, 12, 10):  # Střední tok abraziva
-
-                speed = AWJCalculationService.calculate_cutting_speed(
-                    material_type=material_type,
-                    thickness=thickness,
-                    pressure=float(pressure),
-                    abrasive_flow=float(abrasive),
-                    nozzle_diameter=0.33,
-                    focus_diameter=1.0
-                )
-
-                if speed >= min_speed:
-                    water_flow = AWJCalculationService.calculate_water_flow(0.33, float(pressure))
-                    hydraulic_power = AWJCalculationService.calculate_hydraulic_power(
-                        float(pressure), water_flow
-                    )
-                    cost = AWJCalculationService.calculate_cost_per_meter(
-                        abrasive_flow=float(abrasive),
-                        cutting_speed=speed,
-                        water_flow=water_flow,
-                        hydraulic_power=hydraulic_power
-                    )
-
-                    if cost < best_cost:
-                        best_cost = cost
-                        best_params = {
-                            'pressure': round(float(pressure), 1),
-                            'abrasive_flow': round(float(abrasive), 1),
-                            'expected_cost': round(float(cost), 2),
-                            'expected_speed': round(speed, 1)
-                        }
-
-        return best_params
+            Optimální parametry, očekávané náklady a statistiky optimalizátoru
+        """
+        from .optimizer import AWJOptimizationEngine
+
+        engine = AWJOptimizationEngine(
+            material_type=material_type,
+            thickness=thickness,
+            bounds={**AWJOptimizationService.COST_BOUNDS, **(bounds or {})},
+            **engine_options
+        )
+        return engine.minimize_cost(min_speed=min_speed)
+
+    TARGETS = ('max_speed', 'min_cost', 'pareto')
+
+    # Rozsahy pro minimalizaci nákladů: nižší tlaky = nižší náklady, střední tok abraziva
+    COST_BOUNDS = {'pressure': (100, 400), 'abrasive_flow': (3, 12)}
+
+    @classmethod
+    def optimize(
+        cls,
+        material_type: str,
+        thickness: float,
+        target: str = 'max_speed',
+        min_speed: float = 50,
+        bounds: Optional[Dict[str, Tuple[float, float]]] = None,
+        **engine_options
+    ) -> Dict:
+        """
+        Spustí optimalizaci podle cíle (max_speed / min_cost / pareto)
+
+        engine_options (mesh_size, abrasive_cost_per_kg, ..., progress) se
+        předají AWJOptimizationEngine.
+
+        Raises:
+            ValueError: Neznámý cíl nebo neplatné rozsahy
+        """
+        if target == 'max_speed':
+            return cls.optimize_for_speed(material_type, thickness, bounds=bounds, **engine_options)
+        if target == 'min_cost':
+            return cls.optimize_for_cost(
+                material_type, thickness, min_speed=min_speed, bounds=bounds, **engine_options
+            )
+        if target == 'pareto':
+            return cls.pareto_front(material_type, thickness, bounds=bounds, **engine_options)
+        raise ValueError('Invalid target. Use "max_speed", "min_cost" or "pareto"')
+
+    @staticmethod
+    def pareto_front(
+        material_type: str,
+        thickness: float,
+        bounds: Optional[Dict[str, Tuple[float, float]]] = None,
+        grid_points: int = 10,
+        **engine_options
+    ) -> Dict:
+        """
+        Pareto fronta rychlost / náklady / drsnost pro materiál a tloušťku
+
+        Výsledek se cachuje podle materiálu, tloušťky, rozsahů, hustoty gridu
+        a engine_options (abrazivo), opakované dotazy jsou tak okamžité.
+        Volající dostane vlastní kopii, úpravy výsledku cache nepoškodí.
+        Fronta je jediný vektorizovaný průchod, callback progress se proto
+        volá jen před ním (kontrola zrušení úlohy).
+        """
+        progress = engine_options.pop('progress', None)
+        if progress is not None:
+            progress(0.0)
+
+        bounds_key = tuple(sorted(
+            (name, tuple(float(v) for v in value)) for name, value in (bounds or {}).items()
+        ))
+        # Konstanty materiálu z DB jsou součástí klíče - změna materiálu = nová fronta
+        coefficients = None
+        if material_type not in AWJCalculationService.MATERIAL_PROPERTIES:
+            coefficients = tuple(sorted(AWJCalculationService.material_properties(material_type).items()))
+        options_key = tuple(sorted(engine_options.items()))
+        return copy.deepcopy(_cached_pareto_front(
+            material_type, round(float(thickness), 2), bounds_key, int(grid_points), coefficients, options_key
+        ))
+
+
+@lru_cache(maxsize=256)
+def _cached_pareto_front(
+    material_type: str, thickness: float, bounds_key: Tuple, grid_points: int, coefficients: Optional[Tuple],
+    options_key: Tuple = ()
+) -> Dict:
+    from .optimizer import AWJOptimizationEngine
+
+    engine = AWJOptimizationEngine(
+        material_type=material_type,
+        thickness=thickness,
+        bounds=dict(bounds_key),
+        grid_points=grid_points,
+        **dict(options_key)
+    )
+    return engine.pareto_front()
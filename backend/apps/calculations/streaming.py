@@ -0,0 +1,164 @@
+"""
+AWJ Calculations App - Streaming Responses
+Streamované odpovědi (NDJSON / CSV) pro velké batch výpočty a sweepy
+
+Výsledky se počítají po blocích v generátoru a každý blok se hned
+serializuje a odešle - paměť zůstává konstantní a klient může začít
+zpracovávat první řádky dřív, než je spočítán celý výsledek.
+"""
+
+import csv
+import io
+import json
+from typing import Dict, Iterator, Optional, Sequence, Tuple
+
+import numpy as np
+from django.http import StreamingHttpResponse
+
+from .services import AWJCalculationService
+
+
+STREAM_FORMATS = ('ndjson', 'csv')
+
+CONTENT_TYPES = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv; charset=utf-8',
+}
+
+# Blok = (popisky variant, sloupce parametrů, sloupce výsledků)
+Chunk = Tuple[Sequence, Dict[str, np.ndarray], Dict]
+
+BRITTLE_MATERIALS = ('glass', 'ceramic')
+
+
+def batch_chunks(columns: Dict[str, np.ndarray], chunk_size: int) -> Iterator[Chunk]:
+    """Bloky batch výpočtu (řádek 0 = základní varianta)"""
+    size = len(next(iter(columns.values())))
+    for start in range(0, size, chunk_size):
+        stop = min(start + chunk_size, size)
+        labels = ['base' if i == 0 else f'variation_{i}' for i in range(start, stop)]
+        params = {name: np.asarray(column)[start:stop] for name, column in columns.items()}
+        yield labels, params, AWJCalculationService.perform_full_calculation_batch(params)
+
+
+def _valid_combinations(params: Dict[str, np.ndarray]) -> np.ndarray:
+    """
+    Maska kombinací splňujících pravidla QuickCalculationSerializer
+
+    Každé pravidlo váže jen dvojici os (tryska / fokusační trubice,
+    materiál / tlak), na čemž stojí i sweep_counts.
+    """
+    valid = np.ones(np.broadcast(*params.values()).shape, dtype=bool)
+    if 'nozzle_diameter' in params and 'focus_diameter' in params:
+        valid &= params['nozzle_diameter'] < params['focus_diameter']
+    if 'material_type' in params and 'pressure' in params:
+        valid &= ~(np.isin(params['material_type'], BRITTLE_MATERIALS) & (params['pressure'] > 400))
+    return valid
+
+
+def sweep_counts(axes: Dict[str, np.ndarray], materials: Sequence[str]) -> Tuple[int, int]:
+    """
+    Počet všech a přeskočených kombinací sweepu bez jeho procházení
+
+    Returns:
+        (počet kombinací, počet přeskočených neplatných kombinací)
+    """
+    sizes = {name: len(values) for name, values in axes.items()}
+    total = len(materials) * int(np.prod(list(sizes.values())))
+
+    valid = 1
+    pairs = (('nozzle_diameter', 'focus_diameter'), ('material_type', 'pressure'))
+    all_axes = {'material_type': np.asarray(materials, dtype=object), **axes}
+    for first, second in pairs:
+        if first in all_axes and second in all_axes:
+            valid *= int(_valid_combinations({
+                first: all_axes[first][:, None], second: all_axes[second][None, :]
+            }).sum())
+            sizes.pop(first, None)
+            sizes.pop(second, None)
+        elif first == 'material_type':
+            valid *= len(materials)
+    valid *= int(np.prod(list(sizes.values())))
+
+    return total, total - valid
+
+
+def grid_chunks(axes: Dict[str, np.ndarray], materials: Sequence[str], chunk_size: int) -> Iterator[Chunk]:
+    """
+    Bloky plného faktoriálního sweepu generované líně z indexů
+
+    Kombinace porušující pravidla QuickCalculationSerializer (tryska >= fokusační
+    trubice, tlak > 400 MPa u křehkých materiálů) se přeskočí, jejich počet
+    vrací sweep_counts. Popisek varianty je 'combination_<index v plném gridu>'.
+    """
+    names = list(axes)
+    values = [np.asarray(materials, dtype=object)] + [np.asarray(axes[name]) for name in names]
+    shape = tuple(len(v) for v in values)
+    size = int(np.prod(shape))
+
+    for start in range(0, size, chunk_size):
+        indices = np.arange(start, min(start + chunk_size, size))
+        coords = np.unravel_index(indices, shape)
+        params = {'material_type': values[0][coords[0]]}
+        params.update({name: values[i + 1][coords[i + 1]] for i, name in enumerate(names)})
+
+        valid = _valid_combinations(params)
+        if not valid.any():
+            continue
+
+        params = {name: column[valid] for name, column in params.items()}
+        labels = [f'combination_{i}' for i in indices[valid].tolist()]
+        yield labels, params, AWJCalculationService.perform_full_calculation_batch(params)
+
+
+def render_ndjson(chunks: Iterator[Chunk]) -> Iterator[str]:
+    """Jeden JSON objekt na řádek: variant, parameters, results"""
+    for labels, params, results in chunks:
+        names = list(params)
+        param_rows = zip(*(params[name].tolist() for name in names))
+        records = AWJCalculationService.batch_results_to_records(results)
+        yield ''.join(
+            json.dumps({
+                'variant': label,
+                'parameters': dict(zip(names, row)),
+                'results': record
+            }) + '\n'
+            for label, row, record in zip(labels, param_rows, records)
+        )
+
+
+def render_csv(chunks: Iterator[Chunk]) -> Iterator[str]:
+    """Plochá tabulka: variant, parametry, výsledky, extended_*"""
+    header = None
+    for labels, params, results in chunks:
+        columns = AWJCalculationService.batch_results_to_columns(results)
+        extended = columns.pop('extended')
+
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        if header is None:
+            header = (
+                ['variant'] + list(params) + list(columns) + [f'extended_{name}' for name in extended]
+            )
+            writer.writerow(header)
+
+        writer.writerows(zip(
+            labels,
+            *(params[name].tolist() for name in params),
+            *columns.values(),
+            *extended.values()
+        ))
+        yield buffer.getvalue()
+
+
+def streaming_response(
+    chunks: Iterator[Chunk], stream_format: str, filename: str, headers: Optional[Dict[str, str]] = None
+) -> StreamingHttpResponse:
+    """StreamingHttpResponse pro zvolený formát (headers = doplňující hlavičky)"""
+    renderer = render_csv if stream_format == 'csv' else render_ndjson
+    response = StreamingHttpResponse(renderer(chunks), content_type=CONTENT_TYPES[stream_format])
+    response['Content-Disposition'] = f'attachment; filename="{filename}.{stream_format}"'
+    response['X-Accel-Buffering'] = 'no'
+    for name, value in (headers or {}).items():
+        response[name] = value
+    return response
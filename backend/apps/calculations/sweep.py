@@ -0,0 +1,156 @@
+"""
+AWJ Calculations App - Parallel Sweeps
+Paralelní sweep přes prostor parametrů na více jádrech CPU
+
+Prostor parametrů se rozdělí na bloky (chunk_size řádků), které se
+vyhodnocují v ProcessPoolExecutor. Vstupy i výstupy leží ve sdílené paměti
+(multiprocessing.shared_memory) - workerům se předávají jen názvy segmentů
+a rozsahy řádků, žádná pole se nepicklují.
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+
+from .services import AWJCalculationService
+
+
+INPUT_COLUMNS = ('thickness', 'pressure', 'nozzle_diameter', 'focus_diameter', 'abrasive_flow', 'mesh_size')
+RESULT_COLUMNS = ('water_flow', 'hydraulic_power', 'cutting_speed', 'cut_depth', 'surface_roughness', 'cost_per_meter')
+EXTENDED_COLUMNS = ('water_velocity', 'kinetic_energy', 'mass_flow_rate', 'abrasive_ratio', 'specific_energy')
+OUTPUT_COLUMNS = RESULT_COLUMNS + EXTENDED_COLUMNS
+
+MATERIAL_TYPES = tuple(AWJCalculationService.MATERIAL_PROPERTIES)
+
+
+def _attach(name: str, shape, dtype):
+    segment = shared_memory.SharedMemory(name=name)
+    return segment, np.ndarray(shape, dtype=dtype, buffer=segment.buf)
+
+
+def _evaluate_chunk(spec: Dict, start: int, stop: int) -> int:
+    """Worker: spočítá řádky [start, stop) ze sdílených vstupů do sdílených výstupů"""
+    size = spec['size']
+    segments = []
+    try:
+        segment, inputs = _attach(spec['inputs'], (len(INPUT_COLUMNS), size), np.float64)
+        segments.append(segment)
+        segment, materials = _attach(spec['materials'], (size,), np.int8)
+        segments.append(segment)
+        segment, outputs = _attach(spec['outputs'], (len(OUTPUT_COLUMNS), size), np.float64)
+        segments.append(segment)
+
+        params = {name: inputs[i, start:stop] for i, name in enumerate(INPUT_COLUMNS)}
+        params['material_type'] = np.asarray(MATERIAL_TYPES, dtype=object)[materials[start:stop]]
+        results = AWJCalculationService.perform_full_calculation_batch(params)
+
+        for i, name in enumerate(RESULT_COLUMNS):
+            outputs[i, start:stop] = results[name]
+        for i, name in enumerate(EXTENDED_COLUMNS, start=len(RESULT_COLUMNS)):
+            outputs[i, start:stop] = results['extended'][name]
+    finally:
+        # Pole nad bufferem se musí uvolnit dřív než segment
+        inputs = materials = outputs = None
+        for segment in segments:
+            segment.close()
+
+    return stop - start
+
+
+class SweepRunner:
+    """
+    Paralelní vyhodnocení velkých sweepů
+
+    Args:
+        workers: Počet procesů (výchozí os.cpu_count(); 1 = bez poolu)
+        chunk_size: Počet řádků na jeden blok práce
+        mp_context: multiprocessing kontext pro ProcessPoolExecutor
+    """
+
+    def __init__(self, workers: Optional[int] = None, chunk_size: int = 100_000, mp_context=None):
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.mp_context = mp_context
+        self.last_stats = {}
+
+    @staticmethod
+    def grid_size(axes: Dict[str, Sequence[float]], materials: Sequence[str]) -> int:
+        size = len(materials)
+        for name in INPUT_COLUMNS:
+            size *= len(axes[name])
+        return size
+
+    def run_grid(self, axes: Dict[str, Sequence[float]], materials: Sequence[str] = MATERIAL_TYPES) -> Dict:
+        """
+        Plný faktoriální sweep přes materiály a osy parametrů
+
+        Args:
+            axes: Hodnoty pro každý sloupec z INPUT_COLUMNS
+            materials: Typy materiálů (výchozí všechny z MATERIAL_PROPERTIES)
+
+        Returns:
+            Sloupce vstupů ('material_type' + INPUT_COLUMNS) a výsledků
+            ve stejném tvaru jako perform_full_calculation_batch
+        """
+        unknown = [m for m in materials if m not in MATERIAL_TYPES]
+        if unknown:
+            # Sweep pracuje jen s vestavěnými materiály (kódy int8 ve sdílené paměti)
+            raise ValueError(f"Neznámé materiály: {', '.join(map(str, unknown))}")
+        codes = np.array([MATERIAL_TYPES.index(m) for m in materials], dtype=np.int8)
+        grids = np.meshgrid(codes, *[np.asarray(axes[name], dtype=np.float64) for name in INPUT_COLUMNS],
+                            indexing='ij')
+        return self._run(np.stack([g.ravel() for g in grids[1:]]), grids[0].ravel())
+
+    def _run(self, inputs: np.ndarray, codes: np.ndarray) -> Dict:
+        start_time = time.perf_counter()
+        size = inputs.shape[1]
+
+        segments = {
+            'inputs': shared_memory.SharedMemory(create=True, size=max(inputs.nbytes, 1)),
+            'materials': shared_memory.SharedMemory(create=True, size=max(codes.nbytes, 1)),
+            'outputs': shared_memory.SharedMemory(
+                create=True, size=max(len(OUTPUT_COLUMNS) * size * 8, 1)
+            ),
+        }
+        try:
+            np.ndarray(inputs.shape, dtype=np.float64, buffer=segments['inputs'].buf)[:] = inputs
+            np.ndarray(codes.shape, dtype=np.int8, buffer=segments['materials'].buf)[:] = codes
+            outputs = np.ndarray((len(OUTPUT_COLUMNS), size), dtype=np.float64, buffer=segments['outputs'].buf)
+
+            spec = {'size': size, **{key: segment.name for key, segment in segments.items()}}
+            bounds = [(start, min(start + self.chunk_size, size)) for start in range(0, size, self.chunk_size)]
+
+            if self.workers == 1 or len(bounds) <= 1:
+                for start, stop in bounds:
+                    _evaluate_chunk(spec, start, stop)
+            else:
+                with ProcessPoolExecutor(max_workers=self.workers, mp_context=self.mp_context) as pool:
+                    futures = [pool.submit(_evaluate_chunk, spec, start, stop) for start, stop in bounds]
+                    for future in futures:
+                        future.result()
+
+            results = {name: outputs[i].copy() for i, name in enumerate(RESULT_COLUMNS)}
+            results['extended'] = {
+                name: outputs[i].copy() for i, name in enumerate(EXTENDED_COLUMNS, start=len(RESULT_COLUMNS))
+            }
+            parameters = {name: inputs[i].copy() for i, name in enumerate(INPUT_COLUMNS)}
+            parameters['material_type'] = np.asarray(MATERIAL_TYPES, dtype=object)[codes]
+            outputs = None
+        finally:
+            for segment in segments.values():
+                segment.close()
+                segment.unlink()
+
+        self.last_stats = {
+            'rows': size,
+            'chunks': len(bounds),
+            'workers': self.workers,
+            'chunk_size': self.chunk_size,
+            'wall_time_s': round(time.perf_counter() - start_time, 4),
+        }
+
+        return {'parameters': parameters, 'results': results}
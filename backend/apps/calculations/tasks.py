@@ -0,0 +1,33 @@
+"""
+AWJ Calculations App - Celery Tasks
+Celery úlohy (používá je backend 'celery' v jobs.py)
+"""
+
+from datetime import timedelta
+
+from celery import shared_task
+from django.utils import timezone
+
+from .calibration import calibrate
+from .jobs import execute_job
+from .rollups import rebuild_statistics
+
+
+@shared_task(name='calculations.run_calculation_job')
+def run_calculation_job(job_id):
+    """Provede CalculationJob v Celery workeru"""
+    execute_job(job_id)
+
+
+@shared_task(name='calculations.rebuild_statistics')
+def rebuild_statistics_task(days=None):
+    """Periodický přepočet rollupu statistik (celý, nebo posledních N dní)"""
+    since = timezone.localdate() - timedelta(days=days) if days else None
+    return rebuild_statistics(since=since)
+
+
+@shared_task(name='calculations.calibrate_models')
+def calibrate_models_task(days=None):
+    """Periodická kalibrace koeficientů modelů z naměřených výsledků (všechna data, nebo posledních N dní)"""
+    since = timezone.localdate() - timedelta(days=days) if days else None
+    return calibrate(since=since)['calibrated']
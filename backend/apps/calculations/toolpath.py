@@ -0,0 +1,475 @@
+"""
+AWJ Calculations App - Toolpath Job Estimator
+Čas a náklady řezu celého dílu z obrysů (polyline / DXF)
+
+calculate_cost_per_meter oceňuje jeden metr přímého řezu. Díl je ale sada
+obrysů - každý obrys se propaluje (průraz), v rozích a malých poloměrech
+stroj zpomaluje a mezi obrysy přejíždí rychloposuvem.
+
+Obrysy se převedou na jedno pole bodů (Toolpath) a všechny segmenty se
+počítají vektorizovaně:
+
+- rychlost posuvu u je řezná rychlost modelu (perform_full_calculation)
+- v rohu s úhlem zlomu θ je rychlost nejvýše u · max(CORNER_MIN_FACTOR, (1 + cos θ) / 2)
+  a v oblouku o poloměru r nejvýše sqrt(a · r) (r z délek sousedních segmentů)
+- začátek a konec obrysu mají rychlost 0; rychlosti ve vrcholech omezuje
+  zrychlení a - dopředný i zpětný průchod (v_i² ≤ v_j² + 2a · s) jsou
+  prefixová minima (np.minimum.accumulate), ne smyčka
+- segment se projede lichoběžníkovým profilem rychlosti mezi vrcholy
+- průraz trvá max(PIERCE_MIN_TIME, PIERCE_FACTOR · t / u), přejezdy mezi
+  obrysy (v pořadí souboru) rychlostí RAPID_SPEED
+
+Náklady (abrazivo, voda, energie) se počítají za dobu zapnutého paprsku
+(řez + průrazy) se stejnými cenami jako cost_per_meter.
+
+Vstup: JSON ({"contours": [{"points": [[x, y], ...], "closed": true}, ...]})
+nebo ASCII DXF (sekce ENTITIES: LINE, ARC, CIRCLE, LWPOLYLINE, POLYLINE/VERTEX
+včetně bulge). Oblouky se rozdělí na úsečky s tolerancí ARC_TOLERANCE,
+navazující otevřené entity (LINE + ARC řetězce) se spojí do jednoho obrysu.
+"""
+
+import json
+from typing import Dict, Iterable, Optional, Tuple
+
+import numpy as np
+from django.conf import settings
+
+from .services import AWJCalculationService
+
+
+# Vzdálenost [mm], do které se body považují za totožné (napojení entit DXF)
+JOIN_TOLERANCE = 1e-6
+
+# Nejvíce úseček na jeden oblouk
+MAX_ARC_SEGMENTS = 720
+
+
+def toolpath_config() -> Dict:
+    config = {
+        'ACCELERATION': 1000.0,  # mm/s²
+        'CORNER_MIN_FACTOR': 0.1,  # nejnižší poměr rychlosti v rohu
+        'PIERCE_MIN_TIME': 0.5,  # s
+        'PIERCE_FACTOR': 2.0,  # doba průrazu = PIERCE_FACTOR · tloušťka / rychlost
+        'RAPID_SPEED': 10000.0,  # mm/min
+        'ARC_TOLERANCE': 0.01,  # mm - odchylka úsečky od oblouku
+        'MAX_SEGMENTS': 2_000_000,
+        'MAX_UPLOAD_SIZE': 50 * 1024 * 1024,  # B
+    }
+    config.update(settings.AWJ_CALCULATOR.get('TOOLPATH', {}))
+    return config
+
+
+class Toolpath:
+    """
+    Obrysy dílu jako jedno pole bodů
+
+    points: (N, 2) body všech obrysů za sebou [mm]
+    contour: (N,) číslo obrysu každého bodu (neklesající; po sestavení 0..počet-1)
+
+    Uzavřené obrysy mají poslední bod shodný s prvním. Opakované body
+    a obrysy bez segmentu se při sestavení vynechají.
+    """
+
+    def __init__(self, points: np.ndarray, contour: np.ndarray):
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        contour = np.asarray(contour, dtype=np.int64)
+        if points.size and not np.isfinite(points).all():
+            raise ValueError("Souřadnice obrysů musí být konečná čísla")
+
+        # Opakované body uvnitř obrysu nic neřežou
+        keep = np.ones(len(points), dtype=bool)
+        keep[1:] = (contour[1:] != contour[:-1]) | np.any(points[1:] != points[:-1], axis=1)
+        points, contour = points[keep], contour[keep]
+
+        # Obrysy s jediným bodem se vynechají, čísla obrysů se přečíslují
+        _, counts = np.unique(contour, return_counts=True)
+        keep = np.repeat(counts > 1, counts)
+        points, contour = points[keep], contour[keep]
+
+        # Délky řezů i přejezdů mezi obrysy (a jejich součet) musí být konečné - hypot
+        # souřadnic řádu 1e308 přeteče do inf
+        with np.errstate(over='ignore', invalid='ignore'):
+            delta = np.diff(points, axis=0)
+            total = np.hypot(delta[:, 0], delta[:, 1]).sum()
+        if not np.isfinite(total):
+            raise ValueError("Obrysy jsou příliš velké - délky segmentů musí být konečná čísla")
+        self.points = points
+        self.contour = np.cumsum(np.r_[True, contour[1:] != contour[:-1]]) - 1 if len(contour) else contour
+
+    @classmethod
+    def from_contours(cls, contours: Iterable[Tuple[np.ndarray, bool]]) -> 'Toolpath':
+        """Toolpath ze seznamu (body (n, 2), uzavřený)"""
+        arrays, ids = [], []
+        for i, (points, closed) in enumerate(contours):
+            points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+            if closed and len(points) > 1 and np.any(points[0] != points[-1]):
+                points = np.vstack([points, points[:1]])
+            arrays.append(points)
+            ids.append(np.full(len(points), i, dtype=np.int64))
+        if not arrays:
+            return cls(np.empty((0, 2)), np.empty(0, dtype=np.int64))
+        return cls(np.concatenate(arrays), np.concatenate(ids))
+
+    @property
+    def contours(self) -> int:
+        return int(self.contour[-1]) + 1 if len(self.contour) else 0
+
+    @property
+    def segments(self) -> int:
+        return len(self.points) - self.contours
+
+
+def _arc_points(cx, cy, radius, start, sweep, tolerance: float):
+    """
+    Body oblouků (vektorizovaně, úhly v radiánech)
+
+    Returns:
+        (x, y, číslo oblouku, j / n) pro j = 0..n každého oblouku
+    """
+    radius = np.asarray(radius, dtype=np.float64)
+    ratio = np.clip(1 - tolerance / np.maximum(radius, 1e-12), -1.0, 1.0)
+    step = np.maximum(2 * np.arccos(ratio), 1e-6)
+    n = np.clip(np.ceil(np.abs(sweep) / step), 1, MAX_ARC_SEGMENTS).astype(np.int64)
+
+    owner = np.repeat(np.arange(len(n)), n + 1)
+    offsets = np.cumsum(n + 1) - (n + 1)
+    fraction = (np.arange(owner.size) - offsets[owner]) / n[owner]
+    angle = start[owner] + sweep[owner] * fraction
+    return cx[owner] + radius[owner] * np.cos(angle), cy[owner] + radius[owner] * np.sin(angle), owner, fraction
+
+
+def _bulge_points(x, y, bulge, key, position, tolerance: float):
+    """
+    Vnitřní body oblouků segmentů s bulge (DXF: bulge = tan(θ/4) úseku z bodu i do i+1)
+
+    Vstupem jsou vrcholy seřazené podle (key, position); vrací body, které
+    se vloží mezi vrcholy (position se zlomkovou částí).
+    """
+    same = key[1:] == key[:-1]
+    arcs = np.flatnonzero(same & (bulge[:-1] != 0))
+    if not arcs.size:
+        return np.empty(0), np.empty(0), np.empty(0, dtype=np.int64), np.empty(0)
+
+    x0, y0, x1, y1 = x[arcs], y[arcs], x[arcs + 1], y[arcs + 1]
+    b = bulge[arcs]
+    theta = 4 * np.arctan(b)  # úhel oblouku, kladný proti směru hodinových ručiček
+    chord = np.hypot(x1 - x0, y1 - y0)
+    radius = chord / (2 * np.abs(np.sin(theta / 2)))
+    # Střed leží na ose tětivy ve vzdálenosti (r - výška oblouku) od tětivy
+    offset = chord * (1 - b * b) / (4 * b)
+    mx, my = (x0 + x1) / 2, (y0 + y1) / 2
+    nx, ny = -(y1 - y0) / chord, (x1 - x0) / chord
+    cx, cy = mx + offset * nx, my + offset * ny
+    start = np.arctan2(y0 - cy, x0 - cx)
+
+    px, py, owner, fraction = _arc_points(cx, cy, radius, start, theta, tolerance)
+    inner = (fraction > 0) & (fraction < 1)
+    owner = owner[inner]
+    return px[inner], py[inner], key[arcs][owner], position[arcs][owner] + fraction[inner]
+
+
+def parse_json(data) -> Toolpath:
+    """
+    Toolpath z JSON dat
+
+    {"contours": [{"points": [[x, y], ...], "closed": true}, ...]}
+    nebo přímo seznam obrysů ([[x, y], ...] jsou otevřené obrysy)
+    """
+    contours = data.get('contours') if isinstance(data, dict) else data
+    if not isinstance(contours, list):
+        raise ValueError("Očekáván seznam obrysů 'contours'")
+
+    parsed = []
+    for i, contour in enumerate(contours):
+        if isinstance(contour, dict):
+            points, closed = contour.get('points'), bool(contour.get('closed', False))
+        else:
+            points, closed = contour, False
+        try:
+            points = np.asarray(points, dtype=np.float64)
+        except (TypeError, ValueError):
+            raise ValueError(f"Obrys {i}: body musí být dvojice čísel [x, y]")
+        if points.ndim != 2 or points.shape[1] != 2:
+            raise ValueError(f"Obrys {i}: body musí být dvojice čísel [x, y]")
+        parsed.append((points, closed))
+    return Toolpath.from_contours(parsed)
+
+
+def parse_dxf(text: str, tolerance: float) -> Toolpath:
+    """Toolpath z ASCII DXF (sekce ENTITIES, 2D - souřadnice Z se ignorují)"""
+    lines = text.splitlines()
+    try:
+        codes = np.array(lines[0:len(lines) - len(lines) % 2:2]).astype(np.int64)
+    except ValueError:
+        raise ValueError("Soubor není ASCII DXF (neplatný kód skupiny)")
+    values = np.array([value.strip() for value in lines[1::2]], dtype=object)[:len(codes)]
+
+    # Jen sekce ENTITIES (bloky bez INSERT se neřežou), bez ní celý soubor
+    section = np.flatnonzero((codes == 2) & (values == 'ENTITIES'))
+    if section.size:
+        begin = section[0] + 1
+        end = np.flatnonzero((codes[begin:] == 0) & (values[begin:] == 'ENDSEC'))
+        end = begin + end[0] if end.size else len(codes)
+        codes, values = codes[begin:end], values[begin:end]
+
+    is_start = codes == 0
+    entity = np.cumsum(is_start) - 1
+    types = values[is_start].astype(str)
+    count = len(types)
+
+    def scalar(code: int, default: float = 0.0) -> np.ndarray:
+        """Hodnota kódu pro každou entitu (první výskyt)"""
+        out = np.full(count, default)
+        rows = np.flatnonzero((codes == code) & (entity >= 0))
+        owners, first = np.unique(entity[rows], return_index=True)
+        try:
+            out[owners] = values[rows[first]].astype(np.float64)
+        except ValueError:
+            raise ValueError(f"Neplatná číselná hodnota kódu {code}")
+        return out
+
+    x, y = scalar(10), scalar(20)
+    flags = scalar(70).astype(np.int64)
+    tables = []  # (x, y, klíč obrysu, pořadí, bulge)
+
+    # LWPOLYLINE - vrcholy jsou opakované kódy 10/20 (a volitelně 42) uvnitř entity
+    in_lw = np.zeros(len(codes), dtype=bool)
+    in_lw[entity >= 0] = types[entity[entity >= 0]] == 'LWPOLYLINE'
+    vertex_rows = np.flatnonzero(in_lw & (codes == 10))
+    y_rows = np.flatnonzero(in_lw & (codes == 20))
+    if vertex_rows.size != y_rows.size:
+        raise ValueError("LWPOLYLINE: počet souřadnic X a Y nesouhlasí")
+    vertex_number = np.cumsum(in_lw & (codes == 10)) - 1
+    bulge = np.zeros(vertex_rows.size)
+    bulge_rows = np.flatnonzero(in_lw & (codes == 42))
+    try:
+        bulge[vertex_number[bulge_rows]] = values[bulge_rows].astype(np.float64)
+        lw_x, lw_y = values[vertex_rows].astype(np.float64), values[y_rows].astype(np.float64)
+    except ValueError:
+        raise ValueError("LWPOLYLINE: neplatná číselná hodnota")
+    tables.append((lw_x, lw_y, entity[vertex_rows], vertex_rows.astype(np.float64), bulge))
+
+    # POLYLINE + VERTEX ... SEQEND - vrchol patří poslední předchozí POLYLINE
+    polyline = np.where(types == 'POLYLINE', np.arange(count), -1)
+    owner = np.maximum.accumulate(polyline) if count else polyline
+    vertices = np.flatnonzero((types == 'VERTEX') & (owner >= 0))
+    tables.append((x[vertices], y[vertices], owner[vertices], vertices.astype(np.float64), scalar(42)[vertices]))
+
+    # Uzavřené polyline (bit 1) dostanou zpět první vrchol, bulge posledního vrcholu platí pro uzávěr
+    px, py, key, position, bulges = (np.concatenate(column) for column in zip(*tables))
+    order = np.lexsort((position, key))
+    px, py, key, bulges = px[order], py[order], key[order], bulges[order]
+    position = np.arange(len(key), dtype=np.float64)
+    closed = (flags[key] & 1).astype(bool) if len(key) else np.zeros(0, dtype=bool)
+    last = np.flatnonzero(np.r_[key[1:] != key[:-1], True]) if len(key) else np.empty(0, dtype=np.int64)
+    first = np.r_[0, last[:-1] + 1] if len(key) else last
+    closing = closed[last]
+    px = np.r_[px, px[first[closing]]]
+    py = np.r_[py, py[first[closing]]]
+    key = np.r_[key, key[last[closing]]]
+    position = np.r_[position, position[last[closing]] + 0.5]
+    bulges = np.r_[bulges, np.zeros(closing.sum())]
+    order = np.lexsort((position, key))
+    px, py, key, position, bulges = px[order], py[order], key[order], position[order], bulges[order]
+
+    ax, ay, akey, aposition = _bulge_points(px, py, bulges, key, position, tolerance)
+    xs, ys, keys, positions = [px, ax], [py, ay], [key, akey], [position, aposition]
+
+    # LINE - úsečka z (10, 20) do (11, 21)
+    segments = np.flatnonzero(types == 'LINE')
+    x1, y1 = scalar(11), scalar(21)
+    xs += [x[segments], x1[segments]]
+    ys += [y[segments], y1[segments]]
+    keys += [segments, segments]
+    positions += [np.zeros(segments.size), np.ones(segments.size)]
+
+    # ARC (úhly 50 -> 51 ve stupních proti směru hodinových ručiček) a CIRCLE
+    radius = scalar(40)
+    arcs = np.flatnonzero(((types == 'ARC') | (types == 'CIRCLE')) & (radius > 0))
+    start = np.radians(scalar(50)[arcs])
+    sweep = np.where(
+        types[arcs] == 'CIRCLE', 2 * np.pi, np.mod(np.radians(scalar(51)[arcs]) - start, 2 * np.pi)
+    )
+    sweep = np.where(sweep == 0, 2 * np.pi, sweep)
+    cx, cy, arc, fraction = _arc_points(x[arcs], y[arcs], radius[arcs], start, sweep, tolerance)
+    xs.append(cx)
+    ys.append(cy)
+    keys.append(arcs[arc])
+    positions.append(fraction)
+
+    px, py, key, position = (np.concatenate(column) for column in (xs, ys, keys, positions))
+    order = np.lexsort((position, key))
+    points = np.column_stack([px[order], py[order]])
+    key = key[order]
+
+    # Navazující otevřené entity (konec = začátek další) tvoří jeden obrys
+    if len(key):
+        starts = np.flatnonzero(np.r_[True, key[1:] != key[:-1]])
+        ends = np.r_[starts[1:], len(key)] - 1
+        is_closed = np.hypot(*(points[ends] - points[starts]).T) <= JOIN_TOLERANCE
+        gap = np.hypot(*(points[starts[1:]] - points[ends[:-1]]).T)
+        join = np.r_[False, (gap <= JOIN_TOLERANCE) & ~is_closed[1:] & ~is_closed[:-1]]
+        contour = np.repeat(np.cumsum(~join) - 1, np.diff(np.r_[starts, len(key)]))
+    else:
+        contour = key
+    return Toolpath(points, contour)
+
+
+def parse_toolpath(content: bytes, name: str = '', tolerance: Optional[float] = None) -> Toolpath:
+    """Toolpath z nahraného souboru - JSON (.json nebo obsah začínající { / [) nebo ASCII DXF"""
+    tolerance = tolerance or toolpath_config()['ARC_TOLERANCE']
+    try:
+        text = content.decode('utf-8')
+    except UnicodeDecodeError:
+        text = content.decode('latin-1')
+
+    stripped = text.lstrip()
+    if name.lower().endswith('.json') or stripped[:1] in ('{', '['):
+        try:
+            data = json.loads(text)
+        except json.JSONDecodeError as exc:
+            raise ValueError(f"Neplatný JSON: {exc.msg}")
+        return parse_json(data)
+    return parse_dxf(text, tolerance)
+
+
+def pierce_time(thickness, cutting_speed, config: Optional[Dict] = None):
+    """Doba průrazu [s] - max(PIERCE_MIN_TIME, PIERCE_FACTOR · tloušťka / rychlost), i pro pole"""
+    config = config or toolpath_config()
+    return np.maximum(
+        float(config['PIERCE_MIN_TIME']),
+        float(config['PIERCE_FACTOR']) * np.asarray(thickness) / (np.asarray(cutting_speed) / 60)
+    )
+
+
+def consumption_rates(abrasive_flow, water_flow, hydraulic_power) -> Dict:
+    """Spotřeba za minutu zapnutého paprsku - abrazivo [kg], voda [m³], energie [kWh], i pro pole"""
+    return {
+        'abrasive_kg': np.asarray(abrasive_flow) * 0.06,  # g/s -> kg/min
+        'water_m3': np.asarray(water_flow) / 1000,
+        'energy_kwh': np.asarray(hydraulic_power) / 60,
+    }
+
+
+def consumption_cost(consumption: Dict, params: Dict) -> Dict:
+    """Náklady [Kč] spotřeby podle cen v params (výchozí ceny jako cost_per_meter)"""
+    prices = {**AWJCalculationService.DEFAULT_PRICES, **params}
+    return {
+        'abrasive': consumption['abrasive_kg'] * prices['abrasive_cost_per_kg'],
+        'water': consumption['water_m3'] * prices['water_cost_per_m3'],
+        'energy': consumption['energy_kwh'] * prices['power_cost_per_kwh'],
+    }
+
+
+def _vertex_speeds(toolpath: Toolpath, speed: float, acceleration: float, corner_min_factor: float):
+    """
+    Rychlosti ve vrcholech [mm/s] - omezení rohů, oblouků a zrychlení
+
+    Returns:
+        (rychlosti vrcholů, délky segmentů, maska segmentů mezi body)
+    """
+    points, contour = toolpath.points, toolpath.contour
+    delta = np.diff(points, axis=0)
+    length = np.hypot(delta[:, 0], delta[:, 1])
+    segment = contour[1:] == contour[:-1]
+    length = np.where(segment, length, 0.0)
+
+    first = np.r_[True, ~segment]
+    last = np.r_[~segment, True]
+    interior = ~(first | last)
+
+    limit = np.zeros(len(points))
+    i = np.flatnonzero(interior)
+    prev, nxt = delta[i - 1], delta[i]
+    cos_turn = np.einsum('ij,ij->i', prev, nxt) / (length[i - 1] * length[i])
+    cos_turn = np.clip(cos_turn, -1.0, 1.0)
+    corner = speed * np.maximum(corner_min_factor, (1 + cos_turn) / 2)
+    # Poloměr kružnice vrcholem ze sousedních segmentů: r = l / (2 sin(θ/2))
+    half_sin = np.sqrt((1 - cos_turn) / 2)
+    with np.errstate(divide='ignore'):
+        radius = np.minimum(length[i - 1], length[i]) / (2 * half_sin)
+    limit[i] = np.minimum(corner, np.sqrt(acceleration * radius))
+
+    # v_i² = min_j (c_j² + 2a |s_i - s_j|) - začátky a konce obrysů mají c = 0,
+    # prefixová minima proto nepřetečou mezi obrysy
+    s = np.r_[0.0, np.cumsum(length)]
+    squared = limit ** 2
+    forward = 2 * acceleration * s + np.minimum.accumulate(squared - 2 * acceleration * s)
+    backward = -2 * acceleration * s + np.minimum.accumulate((squared + 2 * acceleration * s)[::-1])[::-1]
+    return np.sqrt(np.maximum(np.minimum(forward, backward), 0.0)), length, segment
+
+
+def estimate_job(toolpath: Toolpath, params: Dict, results: Dict, config: Optional[Dict] = None) -> Dict:
+    """
+    Čas a náklady řezu dílu
+
+    Args:
+        toolpath: Obrysy dílu
+        params: Vstupy výpočtu (tloušťka, abrazivo, ceny jako perform_full_calculation)
+        results: Výsledek perform_full_calculation pro params
+        config: Přepíše toolpath_config()
+
+    Returns:
+        contours, segments, pierces, délky [mm], rychlosti [mm/min],
+        time [s] (cutting, slowdown, piercing, rapid, total), consumption a cost [Kč]
+    """
+    config = {**toolpath_config(), **(config or {})}
+    acceleration = float(config['ACCELERATION'])
+    speed = results['cutting_speed'] / 60  # mm/s
+
+    vertex_speed, length, segment = _vertex_speeds(
+        toolpath, speed, acceleration, float(config['CORNER_MIN_FACTOR'])
+    )
+
+    # Lichoběžníkový profil segmentu: rozjezd z v0, vrchol vp, dojezd na v1
+    v0, v1, length = vertex_speed[:-1][segment], vertex_speed[1:][segment], length[segment]
+    peak = np.minimum(speed, np.sqrt(acceleration * length + (v0 ** 2 + v1 ** 2) / 2))
+    peak = np.maximum(peak, np.maximum(v0, v1))
+    ramp = (2 * peak ** 2 - v0 ** 2 - v1 ** 2) / (2 * acceleration)
+    cruise = np.maximum(length - ramp, 0.0)
+    segment_time = (2 * peak - v0 - v1) / acceleration + cruise / peak
+    cutting_time = float(segment_time.sum())
+    cut_length = float(length.sum())
+
+    # Průrazy a přejezdy mezi obrysy
+    contours = toolpath.contours
+    starts = np.flatnonzero(np.r_[True, ~segment]) if contours else np.empty(0, dtype=np.int64)
+    ends = np.r_[starts[1:] - 1, len(toolpath.points) - 1] if contours else starts
+    rapid = toolpath.points[starts[1:]] - toolpath.points[ends[:-1]]
+    rapid_length = float(np.hypot(rapid[:, 0], rapid[:, 1]).sum())
+    rapid_time = rapid_length / (float(config['RAPID_SPEED']) / 60)
+    piercing_time = contours * float(pierce_time(params['thickness'], results['cutting_speed'], config))
+
+    # Spotřeba a náklady za dobu zapnutého paprsku
+    jet_minutes = (cutting_time + piercing_time) / 60
+    rates = consumption_rates(params.get('abrasive_flow', 8), results['water_flow'], results['hydraulic_power'])
+    consumption = {name: float(rate) * jet_minutes for name, rate in rates.items()}
+    cost = consumption_cost(consumption, params)
+    total_cost = sum(cost.values())
+
+    return {
+        'contours': contours,
+        'segments': int(length.size),
+        'pierces': contours,
+        'cut_length': round(cut_length, 3),
+        'rapid_length': round(rapid_length, 3),
+        'nominal_speed': results['cutting_speed'],
+        'average_speed': round(cut_length / cutting_time * 60, 2) if cutting_time else 0.0,
+        'time': {
+            'cutting': round(cutting_time, 3),
+            'slowdown': round(cutting_time - cut_length / speed, 3),
+            'piercing': round(piercing_time, 3),
+            'rapid': round(rapid_time, 3),
+            'total': round(cutting_time + piercing_time + rapid_time, 3),
+        },
+        'consumption': {
+            'abrasive_kg': round(consumption['abrasive_kg'], 4),
+            'water_m3': round(consumption['water_m3'], 5),
+            'energy_kwh': round(consumption['energy_kwh'], 4),
+        },
+        'cost': {
+            **{name: round(value, 2) for name, value in cost.items()},
+            'total': round(total_cost, 2),
+            'per_meter': round(total_cost / (cut_length / 1000), 2) if cut_length else 0.0,
+        },
+    }
@@ -10,8 +10,10 @@ from . import views
 router = DefaultRouter()
 router.register(r'materials', views.MaterialViewSet, basename='material')
 router.register(r'abrasives', views.AbrasiveMaterialViewSet, basename='abrasive')
+router.register(r'tariffs', views.TariffProfileViewSet, basename='tariff')
 router.register(r'calculations', views.AWJCalculationViewSet, basename='calculation')
 router.register(r'optimization-presets', views.OptimizationPresetViewSet, basename='optimization-preset')
+router.register(r'jobs', views.CalculationJobViewSet, basename='job')
 router.register(r'statistics', views.CalculationStatisticsView, basename='statistics')
 
 app_name = 'calculations'
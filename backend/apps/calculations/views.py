@@ -5,22 +5,45 @@ Django REST Framework ViewSets pro AWJ výpočty
 
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
-from rest_framework.permissions import AllowAny, IsAuthenticatedOrReadOnly
+from rest_framework.permissions import AllowAny, IsAdminUser, IsAuthenticatedOrReadOnly
+from django.conf import settings
+from django.db import transaction
+from django.http import StreamingHttpResponse
 from django.utils import timezone
+from datetime import timedelta
+import json
+import math
 import time
 
 from .models import (
     Material, AbrasiveMaterial, AWJCalculation,
-    CalculationHistory, OptimizationPreset
+    CalculationHistory, OptimizationPreset, CalculationJob,
+    CalculationDailyStatistics, TariffProfile, MaterialCalibration
 )
 from .serializers import (
-    MaterialSerializer, AbrasiveMaterialSerializer,
+    MaterialSerializer, AbrasiveMaterialSerializer, TariffProfileSerializer,
     AWJCalculationSerializer, AWJCalculationCreateSerializer,
     CalculationHistorySerializer, OptimizationPresetSerializer,
-    QuickCalculationSerializer, BatchCalculationSerializer
+    QuickCalculationSerializer, BatchCalculationSerializer, SensitivitySerializer, JobEstimateSerializer,
+    PlanSerializer, OptimizeSerializer,
+    CalculationJobSerializer, SweepSerializer, BulkCalculationCreateSerializer,
+    StatisticsQuerySerializer, MaterialCalibrationSerializer, CalibrationRequestSerializer
 )
 from .services import AWJCalculationService, AWJOptimizationService
+from .cache import cached_full_calculation, get_result_cache
+from .jobs import submit_job, cancel_job, evaluate_batch, jobs_config
+from .streaming import STREAM_FORMATS, batch_chunks, grid_chunks, streaming_response, sweep_counts
+from .querycount import QueryBudgetMixin
+from .pagination import CalculationCursorPagination
+from .history_buffer import save_quick_calculation
+from .materials import material_key, get_tariff_catalog
+from .rollups import record_calculations, rollups_config, summarize, breakdown
+from .presets import get_preset_index
+from .sensitivity import INPUTS as SENSITIVITY_INPUTS, sensitivity as analyze_sensitivity, what_if
+from .toolpath import estimate_job as estimate_toolpath_job
+from .planner import plan as plan_parts
 
 
 class MaterialViewSet(viewsets.ReadOnlyModelViewSet):
@@ -28,6 +51,8 @@ class MaterialViewSet(viewsets.ReadOnlyModelViewSet):
     API endpoint pro materiály
     GET /api/materials/ - seznam materiálů
     GET /api/materials/{id}/ - detail materiálu
+    GET /api/materials/{id}/calibrations/ - kalibrace koeficientů materiálu
+    POST /api/materials/calibrate/ - kalibrační úloha (jen admin)
     """
 
     queryset = Material.objects.all()
@@ -42,6 +67,38 @@ class MaterialViewSet(viewsets.ReadOnlyModelViewSet):
             'types': [{'value': t[0], 'label': t[1]} for t in types]
         })
 
+    @action(detail=True, methods=['get'])
+    def calibrations(self, request, pk=None):
+        """Kalibrace materiálu od nejnovější (aktivní má is_active)"""
+        calibrations = MaterialCalibration.objects.filter(material=self.get_object())
+        return Response(MaterialCalibrationSerializer(calibrations, many=True).data)
+
+    @action(detail=False, methods=['post'], permission_classes=[IsAdminUser])
+    def calibrate(self, request):
+        """
+        Spustí kalibraci koeficientů z naměřených výsledků jako asynchronní úlohu
+
+        Body: {"materials": [3, 5], "days": 90, "activate": true, "dry_run": false}
+        (vše volitelné; naměřené výsledky se zapisují do measured_speed,
+        measured_roughness, measured_depth výpočtů - PATCH /api/calculations/{id}/)
+        """
+        serializer = CalibrationRequestSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        data = serializer.validated_data
+
+        parameters = {
+            'material_ids': data.get('materials'),
+            'since': None,
+            'activate': data['activate'],
+            'dry_run': data['dry_run'],
+        }
+        if data.get('days'):
+            parameters['since'] = (timezone.localdate() - timedelta(days=data['days'])).isoformat()
+
+        job = submit_job('calibrate', parameters, user=request.user)
+        return AWJCalculationViewSet._job_accepted(request, job)
+
 
 class AbrasiveMaterialViewSet(viewsets.ReadOnlyModelViewSet):
     """
@@ -65,7 +122,21 @@ class AbrasiveMaterialViewSet(viewsets.ReadOnlyModelViewSet):
         return Response({'mesh_sizes': mesh_sizes})
 
 
-class AWJCalculationViewSet(viewsets.ModelViewSet):
+class TariffProfileViewSet(viewsets.ReadOnlyModelViewSet):
+    """
+    API endpoint pro tarify (ceny vody, energie a abraziva)
+    GET /api/tariffs/ - seznam tarifů
+    GET /api/tariffs/{id}/ - detail tarifu
+
+    Výpočty volí tarif názvem v parametru "tariff".
+    """
+
+    queryset = TariffProfile.objects.all()
+    serializer_class = TariffProfileSerializer
+    permission_classes = [AllowAny]
+
+
+class AWJCalculationViewSet(QueryBudgetMixin, viewsets.ModelViewSet):
     """
     Hlavní API endpoint pro AWJ výpočty
 
@@ -76,8 +147,12 @@ class AWJCalculationViewSet(viewsets.ModelViewSet):
     DELETE /api/calculations/{id}/ - smazání výpočtu
     """
 
-    queryset = AWJCalculation.objects.all()
+    queryset = AWJCalculation.objects.select_related('material', 'abrasive')
     permission_classes = [IsAuthenticatedOrReadOnly]
+    pagination_class = CalculationCursorPagination
+
+    # Stránka i detail = jeden SELECT s JOINy (kurzorové stránkování nedělá COUNT)
+    query_budget = {'list': 1, 'retrieve': 1}
 
     def get_serializer_class(self):
         """Vrátí správný serializer podle akce"""
@@ -87,7 +162,13 @@ class AWJCalculationViewSet(viewsets.ModelViewSet):
 
     def get_queryset(self):
         """Filtrování podle uživatele"""
-        queryset = AWJCalculation.objects.all()
+        fields = self.sparse_fields()
+        if fields:
+            columns, related = AWJCalculationSerializer.sparse_columns(fields)
+            queryset = AWJCalculation.objects.select_related(*related).only(*columns)
+        else:
+            # material a abrasive se serializují u každého řádku (nested + input_parameters)
+            queryset = AWJCalculation.objects.select_related('material', 'abrasive')
 
         # Pokud je uživatel přihlášený, zobraz jen jeho výpočty
         if self.request.user.is_authenticated:
@@ -100,44 +181,120 @@ class AWJCalculationViewSet(viewsets.ModelViewSet):
 
         return queryset.order_by('-created_at')
 
+    def sparse_fields(self):
+        """
+        Pole z ?fields=id,thickness,results (jen list a detail)
+
+        Omezí načtené sloupce (only()) i serializovaný výstup.
+        """
+        raw = self.request.query_params.get('fields')
+        if not raw or self.action not in ('list', 'retrieve'):
+            return None
+
+        fields = [name.strip() for name in raw.split(',') if name.strip()]
+        unknown = sorted(set(fields) - set(AWJCalculationSerializer.Meta.fields))
+        if unknown:
+            raise ValidationError({'fields': f"Neznámá pole: {', '.join(unknown)}"})
+        return fields
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['fields'] = self.sparse_fields()
+        return context
+
     def perform_create(self, serializer):
-        """Při vytváření výpočtu provede výpočet a uloží výsledky"""
+        """Provede výpočet a uloží výpočet i výsledky jedním zápisem"""
 
         start_time = time.time()
-
-        # Získání instance (ještě neuložená)
-        instance = serializer.save(
-            user=self.request.user if self.request.user.is_authenticated else None
-        )
+        data = serializer.validated_data
+        material = data.get('material')
+        abrasive = data.get('abrasive')
 
         # Provedení výpočtu
         params = {
-            'material_type': instance.material.type if instance.material else 'steel',
-            'thickness': instance.thickness,
-            'pressure': instance.pressure,
-            'nozzle_diameter': instance.nozzle_diameter,
-            'focus_diameter': instance.focus_diameter,
-            'focus_length': instance.focus_length,
-            'abrasive_flow': instance.abrasive_flow,
-            'mesh_size': instance.abrasive.mesh_size if instance.abrasive else 80,
+            'material_type': material_key(material.pk) if material else 'steel',
+            'thickness': data['thickness'],
+            'pressure': data['pressure'],
+            'nozzle_diameter': data.get('nozzle_diameter', 0.33),
+            'focus_diameter': data.get('focus_diameter', 1.0),
+            'focus_length': data.get('focus_length', 76),
+            'abrasive_flow': data.get('abrasive_flow', 8),
+            'mesh_size': abrasive.mesh_size if abrasive else 80,
+            # Ceny výchozího tarifu, cena abraziva z vybraného abraziva
+            **get_tariff_catalog().get(),
         }
+        if abrasive:
+            params['abrasive_cost_per_kg'] = float(abrasive.cost_per_kg)
 
         results = AWJCalculationService.perform_full_calculation(params)
 
-        # Uložení výsledků
-        instance.water_flow = results['water_flow']
-        instance.hydraulic_power = results['hydraulic_power']
-        instance.cutting_speed = results['cutting_speed']
-        instance.cut_depth = results['cut_depth']
-        instance.surface_roughness = results['surface_roughness']
-        instance.cost_per_meter = results['cost_per_meter']
-        instance.extended_results = results.get('extended', {})
-
         # Čas výpočtu
         calc_time = (time.time() - start_time) * 1000  # ms
-        instance.calculation_time = round(calc_time, 2)
 
-        instance.save()
+        serializer.save(
+            user=self.request.user if self.request.user.is_authenticated else None,
+            **self._result_fields(results),
+            calculation_time=round(calc_time, 2)
+        )
+
+    @staticmethod
+    def _result_fields(results):
+        """Výsledky perform_full_calculation jako hodnoty polí AWJCalculation"""
+        return {
+            'water_flow': results['water_flow'],
+            'hydraulic_power': results['hydraulic_power'],
+            'cutting_speed': results['cutting_speed'],
+            'cut_depth': results['cut_depth'],
+            'surface_roughness': results['surface_roughness'],
+            'cost_per_meter': results['cost_per_meter'],
+            'extended_results': results.get('extended', {}),
+        }
+
+    @action(detail=False, methods=['post'])
+    def bulk_create(self, request):
+        """
+        Hromadné vytvoření uložených výpočtů
+        POST /api/calculations/bulk_create/
+
+        {"calculations": [{"material": 1, "thickness": 10, "pressure": 380}, ...]}
+
+        Všechny řádky se spočítají jedním vektorizovaným voláním a uloží
+        přes bulk_create v jedné transakci (buď všechny, nebo žádný).
+        """
+
+        serializer = BulkCalculationCreateSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        rows = serializer.validated_data['rows']
+
+        start_time = time.time()
+        results = AWJCalculationService.perform_full_calculation_batch(
+            serializer.validated_data['columns']
+        )
+        records = AWJCalculationService.batch_results_to_records(results)
+        calc_time = (time.time() - start_time) * 1000
+
+        user = request.user if request.user.is_authenticated else None
+        per_row_time = round(calc_time / len(rows), 4)
+        instances = [
+            AWJCalculation(
+                user=user, **row, **self._result_fields(record), calculation_time=per_row_time
+            )
+            for row, record in zip(rows, records)
+        ]
+
+        batch_size = settings.AWJ_CALCULATOR.get('BULK_CREATE_BATCH_SIZE', 1000)
+        with transaction.atomic():
+            created = AWJCalculation.objects.bulk_create(instances, batch_size=batch_size)
+            # bulk_create neposílá post_save - rollup statistik se aktualizuje ručně
+            if rollups_config()['INCREMENTAL']:
+                record_calculations(created)
+
+        return Response({
+            'success': True,
+            'created': len(created),
+            'ids': [instance.pk for instance in created],
+            'calculation_time_ms': round(calc_time, 2),
+        }, status=status.HTTP_201_CREATED)
 
     @action(detail=False, methods=['post'])
     def quick_calculate(self, request):
@@ -146,6 +303,7 @@ class AWJCalculationViewSet(viewsets.ModelViewSet):
         POST /api/calculations/quick_calculate/
 
         Použití pro real-time výpočty v UI
+        Opakované vstupy se obslouží z cache výsledků (viz cache.py)
         """
 
         serializer = QuickCalculationSerializer(data=request.data)
@@ -154,29 +312,160 @@ class AWJCalculationViewSet(viewsets.ModelViewSet):
         start_time = time.time()
 
         # Provedení výpočtu
-        results = AWJCalculationService.perform_full_calculation(
-            serializer.validated_data
-        )
+        results, cached = cached_full_calculation(serializer.validated_data)
 
         calc_time = (time.time() - start_time) * 1000
 
-        # Pokud chce uživatel uložit
+        # Uložení do historie - zápis do DB proběhne odloženě (history_buffer.py)
+        saved = False
         if serializer.validated_data.get('save_to_history', False):
-            # TODO: Implementovat uložení do historie
-            pass
+            saved = save_quick_calculation(
+                serializer.validated_data, results,
+                user=request.user, calculation_time=round(calc_time, 2)
+            )
 
         return Response({
             'success': True,
             'results': results,
+            'cached': cached,
+            'saved_to_history': saved,
             'calculation_time_ms': round(calc_time, 2),
             'input_parameters': serializer.validated_data
         })
 
+    @action(detail=False, methods=['post'])
+    def sensitivity(self, request):
+        """
+        Citlivost výsledků na vstupy v pracovním bodě
+        POST /api/calculations/sensitivity/
+
+        Vrátí elasticity (∂ln y / ∂ln x) a parciální derivace všech výstupů
+        vůči všem vstupům najednou, analyticky; u omezených oblastí modelu
+        konečnými diferencemi (viz sensitivity.py). S "span": 0.2 navíc
+        what-if průběhy výsledků pro změnu každého vstupu o ±20 %.
+
+        Body: stejný jako quick_calculate + volitelně "span", "steps"
+        """
+
+        serializer = SensitivitySerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+
+        start_time = time.time()
+
+        analysis = analyze_sensitivity(data)
+        results, _ = cached_full_calculation(data)
+
+        response = {
+            'success': True,
+            'results': results,
+            'elasticities': {
+                output: {name: round(float(values[name][0]), 6) for name in SENSITIVITY_INPUTS}
+                for output, values in analysis['elasticities'].items()
+            },
+            'derivatives': {
+                output: {name: float(values[name][0]) for name in SENSITIVITY_INPUTS}
+                for output, values in analysis['derivatives'].items()
+            },
+            'methods': {
+                name: 'finite_difference' if used[0] else 'analytic'
+                for name, used in analysis['finite_difference'].items()
+            },
+        }
+        if data.get('span'):
+            response['what_if'] = what_if(data, span=data['span'], steps=data['steps'])
+
+        response['calculation_time_ms'] = round((time.time() - start_time) * 1000, 2)
+        response['input_parameters'] = data
+        return Response(response)
+
+    @action(detail=False, methods=['post'])
+    def estimate_job(self, request):
+        """
+        Odhad času a nákladů řezu celého dílu z obrysů
+        POST /api/calculations/estimate_job/
+
+        Multipart: "file" (ASCII DXF nebo JSON s obrysy) + parametry jako
+        quick_calculate; nebo JSON tělo s "contours":
+        [{"points": [[x, y], ...], "closed": true}, ...]
+
+        Zpomalení v rozích a obloucích, průrazy a přejezdy viz toolpath.py.
+        """
+
+        serializer = JobEstimateSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = dict(serializer.validated_data)
+        toolpath = data.pop('toolpath')
+
+        start_time = time.time()
+        results, _ = cached_full_calculation(data)
+        estimate = estimate_toolpath_job(toolpath, data, results)
+
+        return Response({
+            'success': True,
+            'results': results,
+            'estimate': estimate,
+            'calculation_time_ms': round((time.time() - start_time) * 1000, 2),
+            'input_parameters': data,
+        })
+
+    @action(detail=False, methods=['post'])
+    def plan(self, request):
+        """
+        Plán řezání sady dílů na více strojích
+        POST /api/calculations/plan/
+
+        {
+            "parts": [{"name": "A", "material_type": "steel", "thickness": 10,
+                       "cut_length": 1200, "pierces": 3, "quantity": 50, "max_roughness": 4}],
+            "candidates": [{"pressure": 380}, {"pressure": 600, "abrasive_flow": 12}],
+            "machines": 3,
+            "objective": "time" | "cost",
+            "setup_time": 300  // volitelné [s]
+        }
+
+        Všechny kombinace díl × nastavení se spočítají jedním batch voláním,
+        rozvrh minimalizuje makespan (LPT heuristika, viz planner.py).
+        """
+
+        serializer = PlanSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+
+        start_time = time.time()
+        result = plan_parts(
+            data['parts'], data['candidates'], data['prices'],
+            machines=data['machines'], objective=data['objective'],
+            setup_time=data.get('setup_time'), names=data['names'],
+        )
+
+        return Response({
+            'success': True,
+            **result,
+            'calculation_time_ms': round((time.time() - start_time) * 1000, 2),
+        })
+
+    @action(detail=False, methods=['get'])
+    def cache_stats(self, request):
+        """
+        Statistiky cache výsledků (hits / misses / evictions)
+        GET /api/calculations/cache_stats/
+        """
+
+        return Response(get_result_cache().stats())
+
     @action(detail=False, methods=['post'])
     def batch_calculate(self, request):
         """
         Batch výpočet pro porovnání variant
         POST /api/calculations/batch_calculate/
+
+        Všechny varianty se spočítají jedním vektorizovaným voláním.
+        "response_format": "columnar" vrátí výsledky jako sloupce hodnot
+        místo opakování kompletních parametrů u každé varianty.
+        "async": true (nebo více než ASYNC_BATCH_THRESHOLD variant) vrátí
+        job_id a výpočet proběhne jako asynchronní úloha.
+        "response_format": "ndjson" | "csv" výsledky streamuje po blocích.
         """
 
         serializer = BatchCalculationSerializer(data=request.data)
@@ -184,35 +473,82 @@ class AWJCalculationViewSet(viewsets.ModelViewSet):
 
         base_params = serializer.validated_data['base_parameters']
         variations = serializer.validated_data['variations']
+        columns = serializer.validated_data['columns']
+        response_format = serializer.validated_data['response_format']
+
+        # Streamovaná odpověď - výsledky se počítají a odesílají po blocích
+        if response_format in STREAM_FORMATS:
+            chunk_size = settings.AWJ_CALCULATOR.get('STREAM_CHUNK_SIZE', 2000)
+            return streaming_response(batch_chunks(columns, chunk_size), response_format, 'batch')
+
+        # Velké dávky (nebo "async": true) poběží jako asynchronní úloha
+        threshold = jobs_config().get('ASYNC_BATCH_THRESHOLD', 2000)
+        if serializer.validated_data['async'] or len(variations) > threshold:
+            job = submit_job('batch', {
+                'base_parameters': base_params,
+                'variations': variations,
+                'columns': {name: column.tolist() for name, column in columns.items()},
+                'response_format': response_format,
+            }, user=self._job_user(request))
+            return self._job_accepted(request, job)
 
-        results_list = []
+        start_time = time.time()
+        payload = evaluate_batch(base_params, variations, columns, response_format)
+        calc_time = (time.time() - start_time) * 1000
 
-        # Základní výpočet
-        base_results = AWJCalculationService.perform_full_calculation(base_params)
-        results_list.append({
-            'variant': 'base',
-            'parameters': base_params,
-            'results': base_results
+        return Response({
+            'success': True,
+            'calculation_time_ms': round(calc_time, 2),
+            **payload
         })
 
-        # Výpočty variací
-        for i, variation in enumerate(variations):
-            # Merge base params s variation
-            variant_params = {**base_params, **variation}
+    @action(detail=False, methods=['post'])
+    def sweep(self, request):
+        """
+        Streamovaný sweep přes prostor parametrů (NDJSON / CSV)
+        POST /api/calculations/sweep/
+
+        Body:
+        {
+            "materials": ["steel", "aluminum"],
+            "axes": {
+                "thickness": {"min": 1, "max": 100, "points": 50, "spacing": "log"},
+                "pressure": {"values": [300, 380, 420]}
+            },
+            "response_format": "ndjson" | "csv"
+        }
+
+        Neplatné kombinace (tryska >= fokusační trubice, tlak > 400 MPa u křehkých
+        materiálů) se přeskočí; hlavičky X-Sweep-Combinations a X-Sweep-Skipped
+        uvádějí celkový počet a počet přeskočených kombinací.
+        """
+
+        serializer = SweepSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
 
-            variant_results = AWJCalculationService.perform_full_calculation(variant_params)
+        grid = serializer.validated_data['grid']
+        materials = serializer.validated_data['materials']
+        chunk_size = settings.AWJ_CALCULATOR.get('STREAM_CHUNK_SIZE', 2000)
+        total, skipped = sweep_counts(grid, materials)
+        return streaming_response(
+            grid_chunks(grid, materials, chunk_size), serializer.validated_data['response_format'], 'sweep',
+            headers={'X-Sweep-Combinations': str(total), 'X-Sweep-Skipped': str(skipped)}
+        )
 
-            results_list.append({
-                'variant': f'variation_{i+1}',
-                'parameters': variant_params,
-                'results': variant_results
-            })
+    @staticmethod
+    def _job_user(request):
+        return request.user if request.user.is_authenticated else None
 
+    @staticmethod
+    def _job_accepted(request, job):
+        """Odpověď 202 s identifikátorem úlohy a odkazy pro polling"""
         return Response({
             'success': True,
-            'total_variants': len(results_list),
-            'results': results_list
-        })
+            'job_id': str(job.id),
+            'status': job.status,
+            'status_url': request.build_absolute_uri(f'/api/jobs/{job.id}/'),
+            'result_url': request.build_absolute_uri(f'/api/jobs/{job.id}/result/'),
+        }, status=status.HTTP_202_ACCEPTED)
 
     @action(detail=False, methods=['post'])
     def optimize(self, request):
@@ -220,41 +556,41 @@ class AWJCalculationViewSet(viewsets.ModelViewSet):
         AI Optimalizace parametrů
         POST /api/calculations/optimize/
 
+        target "pareto" vrátí celou Pareto frontu rychlost / náklady / drsnost
+        (cachovanou pro materiál a tloušťku) v optimized_parameters.points
+
         Body:
         {
             "material_type": "steel",
+            "material_id": 3,  // volitelné - materiál z databáze místo material_type
+            "abrasive_id": 2,  // volitelné - mesh a cena abraziva z databáze
+            "tariff": "dilna-2024",  // volitelné - ceny z tarifu, jinak výchozí tarif
             "thickness": 10,
-            "target": "max_speed" | "min_cost"
+            "target": "max_speed" | "min_cost" | "pareto",
+            "bounds": {"pressure": [100, 400], "nozzle_diameter": [0.25, 0.4]},  // volitelné
+            "async": true  // volitelné - vrátí job_id, výsledek přes /api/jobs/{id}/result/
         }
         """
 
-        material_type = request.data.get('material_type', 'steel')
-        thickness = float(request.data.get('thickness', 10))
-        target = request.data.get('target', 'max_speed')
+        serializer = OptimizeSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        options = dict(serializer.validated_data)
+        run_async = options.pop('async')
 
-        if target == 'max_speed':
-            optimized = AWJOptimizationService.optimize_for_speed(
-                material_type=material_type,
-                thickness=thickness
-            )
-        elif target == 'min_cost':
-            min_speed = float(request.data.get('min_speed', 50))
-            optimized = AWJOptimizationService.optimize_for_cost(
-                material_type=material_type,
-                thickness=thickness,
-                min_speed=min_speed
-            )
-        else:
-            return Response(
-                {'error': 'Invalid target. Use "max_speed" or "min_cost"'},
-                status=status.HTTP_400_BAD_REQUEST
-            )
+        if run_async:
+            job = submit_job('optimize', options, user=self._job_user(request))
+            return self._job_accepted(request, job)
+
+        try:
+            optimized = AWJOptimizationService.optimize(**options)
+        except (TypeError, ValueError) as exc:
+            return Response({'error': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
 
         return Response({
             'success': True,
-            'target': target,
-            'material_type': material_type,
-            'thickness': thickness,
+            'target': options['target'],
+            'material_type': options['material_type'],
+            'thickness': options['thickness'],
             'optimized_parameters': optimized
         })
 
@@ -275,6 +611,111 @@ class AWJCalculationViewSet(viewsets.ModelViewSet):
         })
 
 
+class CalculationJobViewSet(viewsets.ReadOnlyModelViewSet):
+    """
+    API endpoint pro asynchronní úlohy
+    GET /api/jobs/ - seznam úloh
+    GET /api/jobs/{id}/ - stav a průběh úlohy (polling)
+    GET /api/jobs/{id}/result/ - výsledek dokončené úlohy
+    GET /api/jobs/{id}/stream/ - průběh jako Server-Sent Events
+    POST /api/jobs/{id}/cancel/ - zrušení úlohy
+    """
+
+    serializer_class = CalculationJobSerializer
+    permission_classes = [IsAuthenticatedOrReadOnly]
+
+    STREAM_POLL_INTERVAL = 0.5  # s
+    # Krátké spojení drží worker jen chvíli, klient (EventSource) se pak připojí znovu
+    STREAM_TIMEOUT = 25  # s
+    STREAM_RETRY = 1000  # ms
+
+    def get_queryset(self):
+        """
+        Filtrování podle uživatele
+
+        Přihlášený uživatel vidí jen své úlohy, nepřihlášený jen anonymní
+        úlohy; cizí úloha tak vrátí 404.
+        """
+        queryset = CalculationJob.objects.all()
+
+        if self.request.user.is_authenticated:
+            queryset = queryset.filter(user=self.request.user)
+        else:
+            queryset = queryset.filter(user__isnull=True)
+
+        return queryset.order_by('-created_at')
+
+    @action(detail=True, methods=['get'])
+    def result(self, request, pk=None):
+        """
+        Výsledek úlohy
+        GET /api/jobs/{id}/result/
+        """
+
+        job = self.get_object()
+
+        if job.status != CalculationJob.STATUS_SUCCEEDED:
+            return Response(
+                {'error': f'Úloha není dokončena (stav: {job.status})', 'status': job.status},
+                status=status.HTTP_409_CONFLICT
+            )
+
+        return Response({
+            'success': True,
+            'job_id': str(job.id),
+            'kind': job.kind,
+            'result': job.result
+        })
+
+    @action(detail=True, methods=['post'])
+    def cancel(self, request, pk=None):
+        """
+        Zrušení úlohy
+        POST /api/jobs/{id}/cancel/
+        """
+
+        job = cancel_job(self.get_object())
+        return Response(self.get_serializer(job).data)
+
+    @action(detail=True, methods=['get'])
+    def stream(self, request, pk=None):
+        """
+        Průběh úlohy jako Server-Sent Events (text/event-stream)
+        GET /api/jobs/{id}/stream/
+
+        Spojení se po STREAM_TIMEOUT sekundách ukončí a klient se podle
+        "retry" připojí znovu. Koncový stav se pošle jako událost "end",
+        po které má klient spojení zavřít.
+        """
+
+        job = self.get_object()
+
+        def events():
+            deadline = time.monotonic() + self.STREAM_TIMEOUT
+            last = None
+            yield f"retry: {self.STREAM_RETRY}\n\n"
+            while True:
+                state = CalculationJob.objects.filter(pk=job.pk).values(
+                    'status', 'progress', 'error'
+                ).first()
+                if state is None:
+                    return
+                if state['status'] in CalculationJob.FINISHED_STATUSES:
+                    yield f"event: end\ndata: {json.dumps(state)}\n\n"
+                    return
+                if state != last:
+                    yield f"data: {json.dumps(state)}\n\n"
+                    last = state
+                if time.monotonic() > deadline:
+                    return
+                time.sleep(self.STREAM_POLL_INTERVAL)
+
+        response = StreamingHttpResponse(events(), content_type='text/event-stream')
+        response['Cache-Control'] = 'no-cache'
+        response['X-Accel-Buffering'] = 'no'
+        return response
+
+
 class OptimizationPresetViewSet(viewsets.ReadOnlyModelViewSet):
     """
     API endpoint pro optimalizační presety
@@ -291,6 +732,9 @@ class OptimizationPresetViewSet(viewsets.ReadOnlyModelViewSet):
         """
         Vrátí presety vhodné pro daný materiál
         GET /api/optimization-presets/for_material/?material=steel
+
+        Volitelně ?target=min_cost a ?thickness=20 (mm, v rozsahu presetu).
+        Odpovídá z předpočítaného indexu presetů bez dotazu na databázi.
         """
 
         material_type = request.query_params.get('material', None)
@@ -300,22 +744,41 @@ class OptimizationPresetViewSet(viewsets.ReadOnlyModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        # Filtruj presety které obsahují tento materiál
-        presets = self.queryset.filter(
-            suitable_for_materials__contains=[material_type]
-        )
+        target = request.query_params.get('target') or None
+        if target is not None and target not in dict(OptimizationPreset.OPTIMIZATION_TARGETS):
+            return Response(
+                {'error': f'Neznámý cíl "{target}"'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
 
-        serializer = self.get_serializer(presets, many=True)
+        thickness = request.query_params.get('thickness') or None
+        if thickness is not None:
+            try:
+                thickness = float(thickness)
+                if not math.isfinite(thickness):
+                    raise ValueError(thickness)
+            except ValueError:
+                return Response(
+                    {'error': 'Parameter "thickness" must be a number'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+
+        presets = get_preset_index().find(material_type, target=target, thickness=thickness)
 
         return Response({
             'material_type': material_type,
-            'presets': serializer.data
+            'target': target,
+            'thickness': thickness,
+            'presets': presets
         })
 
 
 class CalculationStatisticsView(viewsets.ViewSet):
     """
     API endpoint pro statistiky výpočtů
+
+    Čte z materializovaného rollupu CalculationDailyStatistics (rollups.py),
+    cena dotazu tedy nezávisí na počtu uložených výpočtů.
     """
 
     permission_classes = [AllowAny]
@@ -325,34 +788,44 @@ class CalculationStatisticsView(viewsets.ViewSet):
         """
         Celkové statistiky
         GET /api/statistics/summary/
-        """
-
-        total_calculations = AWJCalculation.objects.count()
-        total_materials = Material.objects.count()
 
-        # Nejpoužívanější materiál
-        from django.db.models import Count
-        top_material = AWJCalculation.objects.values(
-            'material__name'
-        ).annotate(
-            count=Count('id')
-        ).order_by('-count').first()
-
-        # Průměrné hodnoty
-        from django.db.models import Avg
-        averages = AWJCalculation.objects.aggregate(
-            avg_speed=Avg('cutting_speed'),
-            avg_power=Avg('hydraulic_power'),
-            avg_cost=Avg('cost_per_meter')
-        )
+        Query params:
+            days / since / until - časové okno (dny, YYYY-MM-DD)
+            user - 'me' (přihlášený uživatel) nebo id uživatele (jen staff)
+            group_by - day | material | user (user jen staff)
+        """
 
-        return Response({
-            'total_calculations': total_calculations,
-            'total_materials': total_materials,
-            'most_used_material': top_material,
-            'averages': {
-                'cutting_speed': round(averages['avg_speed'] or 0, 2),
-                'hydraulic_power': round(averages['avg_power'] or 0, 2),
-                'cost_per_meter': round(float(averages['avg_cost'] or 0), 2)
-            }
-        })
+        params = StatisticsQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        query = params.validated_data
+
+        rollups = CalculationDailyStatistics.objects.all()
+
+        if 'days' in query:
+            rollups = rollups.filter(date__gt=timezone.localdate() - timedelta(days=query['days']))
+        if 'since' in query:
+            rollups = rollups.filter(date__gte=query['since'])
+        if 'until' in query:
+            rollups = rollups.filter(date__lte=query['until'])
+
+        user = query.get('user')
+        if user == 'me':
+            if not request.user.is_authenticated:
+                return Response({'error': 'Přihlášení je vyžadováno'}, status=status.HTTP_401_UNAUTHORIZED)
+            rollups = rollups.filter(user=request.user)
+        elif user is not None:
+            if not request.user.is_staff:
+                return Response({'error': 'Pouze pro administrátory'}, status=status.HTTP_403_FORBIDDEN)
+            rollups = rollups.filter(user_id=user)
+
+        group_by = query.get('group_by')
+        if group_by == 'user' and not request.user.is_staff:
+            return Response({'error': 'Pouze pro administrátory'}, status=status.HTTP_403_FORBIDDEN)
+
+        data = summarize(rollups)
+        data['total_materials'] = Material.objects.count()
+        if group_by:
+            data['group_by'] = group_by
+            data['breakdown'] = breakdown(rollups, group_by)
+
+        return Response(data)
@@ -0,0 +1,16 @@
+"""
+Celery configuration for AWJ Calculator Pro project.
+
+Worker se spouští příkazem:
+    celery -A backend.core.celery worker -l info
+"""
+
+import os
+
+from celery import Celery
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.core.settings')
+
+app = Celery('awj_calculator')
+app.config_from_object('django.conf:settings', namespace='CELERY')
+app.autodiscover_tasks()
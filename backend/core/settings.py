@@ -172,6 +172,105 @@ AWJ_CALCULATOR = {
     'MAX_PRESSURE': 600,  # MPa
     'MIN_PRESSURE': 100,  # MPa
     'MAX_THICKNESS': 500,  # mm
+    'MAX_BATCH_VARIATIONS': int(os.getenv('MAX_BATCH_VARIATIONS', '10000')),
+    'MAX_BULK_CREATE': int(os.getenv('MAX_BULK_CREATE', '10000')),  # řádků na bulk_create request
+    'BULK_CREATE_BATCH_SIZE': 1000,  # řádků na jeden INSERT
+    'MAX_SWEEP_ROWS': int(os.getenv('MAX_SWEEP_ROWS', '5000000')),
+    'STREAM_CHUNK_SIZE': 2000,  # řádků na blok streamované odpovědi
     'ENABLE_AI_OPTIMIZATION': os.getenv('ENABLE_AI_OPTIMIZATION', 'True') == 'True',
     'ENABLE_CHATBOT': os.getenv('ENABLE_CHATBOT', 'True') == 'True',
+
+    # Cache výsledků quick_calculate ('inprocess' nebo 'django' = sdílená přes CACHES)
+    'RESULT_CACHE': {
+        'BACKEND': os.getenv('RESULT_CACHE_BACKEND', 'inprocess'),
+        'MAX_ENTRIES': int(os.getenv('RESULT_CACHE_MAX_ENTRIES', '1024')),
+        'TTL': int(os.getenv('RESULT_CACHE_TTL', '300')),  # s, 0 = bez expirace (oba backendy)
+        'ALIAS': 'default',
+    },
+
+    # Asynchronní úlohy (jobs.py): 'thread' bez brokeru nebo 'celery'
+    'JOBS': {
+        'BACKEND': os.getenv('JOBS_BACKEND', 'thread'),
+        'MAX_WORKERS': int(os.getenv('JOBS_MAX_WORKERS', '2')),
+        'CHUNK_SIZE': 5000,  # řádků batch výpočtu mezi aktualizacemi průběhu
+        'ASYNC_BATCH_THRESHOLD': int(os.getenv('ASYNC_BATCH_THRESHOLD', '2000')),  # variant
+        # Trvanlivé jsou jen úlohy Celery; úlohy 'thread' po restartu obnoví recover_jobs()
+        'RECOVER_ON_STARTUP': os.getenv('JOBS_RECOVER_ON_STARTUP', 'True') == 'True',
+        'STALE_AFTER': int(os.getenv('JOBS_STALE_AFTER', '3600')),  # s - běžící úloha = přerušená
+    },
+
+    # Snapshot materiálů a katalog abraziv z DB (materials.py) - razítko verze ve sdílené cache
+    'MATERIAL_SNAPSHOT': {
+        'VERSION_CHECK_INTERVAL': 5.0,  # s
+        'CACHE_ALIAS': 'default',
+    },
+
+    # Odložený zápis quick_calculate do historie (history_buffer.py)
+    'HISTORY_BUFFER': {
+        'ENABLED': os.getenv('HISTORY_BUFFER_ENABLED', 'True') == 'True',  # False = synchronní zápis
+        'MAX_SIZE': 500,  # záznamů - po dosažení se buffer hned zapíše
+        'FLUSH_INTERVAL': 2.0,  # s
+        'MAX_PENDING': 50000,  # záznamů - nad limit se zahazují
+    },
+
+    # Rollup statistik (rollups.py): False = jen periodický přepočet
+    # (python manage.py awj_rebuild_statistics / Celery task)
+    'STATISTICS': {
+        'INCREMENTAL': os.getenv('STATISTICS_INCREMENTAL', 'True') == 'True',
+    },
+
+    # Kalibrace koeficientů modelů z naměřených výsledků (calibration.py)
+    # python manage.py awj_calibrate / Celery task calculations.calibrate_models
+    'CALIBRATION': {
+        'CHUNK_SIZE': 20000,  # řádků tabulky výpočtů na blok
+        'MIN_SAMPLES': int(os.getenv('CALIBRATION_MIN_SAMPLES', '20')),  # měření na model a materiál
+        'RIDGE': 1.0,  # regularizace exponentů k současným hodnotám
+    },
+
+    # Inverzní surrogate model doporučených parametrů (ai_optimization/ml_models.py)
+    # python manage.py awj_train_surrogate uloží novou verzi do MODEL_DIR
+    'SURROGATE': {
+        'MODEL_DIR': os.getenv('SURROGATE_MODEL_DIR') or str(BASE_DIR / 'models' / 'surrogate'),
+        # None = nejnovější uložený model
+        'VERSION': int(os.environ['SURROGATE_VERSION']) if os.getenv('SURROGATE_VERSION') else None,
+        'ESTIMATORS': 200,
+        'THICKNESS_POINTS': 40,  # tlouštěk na materiál pro trénink
+        'MIN_SPEED': 50,  # mm/min - min_speed, pro který se trénuje cíl min_cost
+    },
+
+    # Odhad času a nákladů řezu dílu z obrysů DXF / JSON (toolpath.py)
+    'TOOLPATH': {
+        'ACCELERATION': 1000.0,  # mm/s² - rozjezd a brzdění stroje
+        'CORNER_MIN_FACTOR': 0.1,  # nejnižší poměr rychlosti v ostrém rohu
+        'PIERCE_MIN_TIME': 0.5,  # s
+        'PIERCE_FACTOR': 2.0,  # doba průrazu = PIERCE_FACTOR · tloušťka / řezná rychlost
+        'RAPID_SPEED': 10000.0,  # mm/min - přejezdy mezi obrysy
+        'ARC_TOLERANCE': 0.01,  # mm - dělení oblouků na úsečky
+        'MAX_SEGMENTS': 2_000_000,
+        'MAX_UPLOAD_SIZE': 50 * 1024 * 1024,  # B
+    },
+
+    # Plán řezání dílů na více strojích (planner.py)
+    'PLANNER': {
+        'MAX_PARTS': 10000,
+        'MAX_SETTINGS': 50,  # kandidátních nastavení
+        'MAX_MACHINES': 64,
+        'SETUP_TIME': 300.0,  # s - výměna tabule / změna parametrů
+    },
+
+    # Průběhy sil, šířky řezu a drsnosti po hloubce (analysis/services.py)
+    'ANALYSIS': {
+        'MAX_RESOLUTION': 2_000_000,  # bodů gridu hloubky na dotaz
+        'DEFAULT_RESOLUTION': 10_000,
+        'MAX_POINTS': 20_000,  # úseků min/max decimace v odpovědi
+    },
+
+    # Hlídání počtu SQL dotazů list/detail endpointů (querycount.py)
+    'QUERY_BUDGET': {
+        'ENABLED': DEBUG,  # překročení = varování v logu a hlavička X-Query-Count
+    },
 }
+
+# Celery (pouze pro JOBS_BACKEND=celery)
+CELERY_BROKER_URL = os.getenv('REDIS_URL', 'redis://localhost:6379/0')
+CELERY_TASK_SERIALIZER = 'json'
@@ -14,8 +14,8 @@ urlpatterns = [
 
     # API Endpoints
     path('api/', include('backend.apps.calculations.urls')),
-    # path('api/', include('backend.apps.analysis.urls')),  # Přidat později
-    # path('api/', include('backend.apps.ai_optimization.urls')),  # Přidat později
+    path('api/', include('backend.apps.analysis.urls')),
+    path('api/', include('backend.apps.ai_optimization.urls')),
     # path('api/', include('backend.apps.chatbot.urls')),  # Přidat později
 
     # Frontend - Main Page
@@ -0,0 +1,65 @@
+# conftest.py
+import pytest
+from rest_framework.test import APIClient
+
+
+@pytest.fixture
+def user(django_user_model):
+    """Běžný přihlášený uživatel"""
+    return django_user_model.objects.create_user('tester', password='heslo')
+
+
+@pytest.fixture
+def api_client(user):
+    """API klient přihlášeného uživatele (zápis vyžaduje přihlášení)"""
+    client = APIClient()
+    client.force_authenticate(user)
+    return client
+
+
+@pytest.fixture
+def valid_payload():
+    """Platné vstupní parametry rychlého výpočtu"""
+    return {
+        'material_type': 'steel',
+        'thickness': 10.0,
+        'pressure': 380.0,
+        'nozzle_diameter': 0.33,
+        'focus_diameter': 1.0,
+        'abrasive_flow': 8.0,
+        'mesh_size': 80,
+        'standoff_distance': 3.0
+    }
+
+
+@pytest.fixture(autouse=True)
+def _no_job_recovery():
+    """Obnova úloh po restartu nesmí běžet v prvním testovacím požadavku"""
+    from django.core.signals import request_started
+    from backend.apps.calculations.jobs import RECOVERY_DISPATCH_UID
+    request_started.disconnect(dispatch_uid=RECOVERY_DISPATCH_UID)
+
+
+@pytest.fixture
+def calculations(user):
+    """Uložené výpočty uživatele s materiály a abrazivy z databáze"""
+    from backend.apps.calculations.models import Material, AbrasiveMaterial, AWJCalculation
+
+    materials = [
+        Material.objects.create(name=f'Materiál {i}', type='steel', density=7850, tensile_strength=400)
+        for i in range(3)
+    ]
+    abrasives = [
+        AbrasiveMaterial.objects.create(
+            name=f'Abrazivo {i}', type='garnet', mesh_size=80, particle_size=180,
+            hardness=7.5, density=4100, cost_per_kg=25
+        )
+        for i in range(2)
+    ]
+    return [
+        AWJCalculation.objects.create(
+            user=user, material=materials[i % 3], abrasive=abrasives[i % 2],
+            thickness=5 + i, pressure=380, cutting_speed=100, cost_per_meter=2.5
+        )
+        for i in range(12)
+    ]
@@ -0,0 +1,563 @@
+# test_api.py
+import pytest
+from rest_framework import status
+
+pytestmark = pytest.mark.django_db
+
+
+class TestBatchCalculateAPI:
+    """Testy dávkového výpočtu variant"""
+
+    url = '/api/calculations/batch_calculate/'
+
+    def test_nullable_field_only_in_variations(self, api_client, valid_payload):
+        """Nepovinné pole s null v základu nesmí shodit validaci variací"""
+        response = api_client.post(self.url, {
+            'base_parameters': valid_payload,
+            'variations': [{'material_strength': 5}, {'pressure': 300}]
+        }, format='json')
+
+        assert response.status_code == status.HTTP_200_OK, response.data
+        assert len(response.data['results']) == 3  # základ + 2 variace
+
+    def test_null_in_required_field_rejected(self, api_client, valid_payload):
+        """Null v poli bez allow_null zůstává chybou"""
+        response = api_client.post(self.url, {
+            'base_parameters': valid_payload,
+            'variations': [{'pressure': 300}, {'pressure': None}]
+        }, format='json')
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert 'pressure' in response.data['variations']
+
+    def test_base_material_id(self, api_client, valid_payload):
+        """material_id v základu platí i pro variace bez vlastního materiálu"""
+        from backend.apps.calculations.models import Material
+
+        material = Material.objects.create(
+            name='Nerez 304', type='steel', density=8000, tensile_strength=520, k_factor=0.8
+        )
+        response = api_client.post(self.url, {
+            'base_parameters': {**valid_payload, 'thickness': 50, 'material_id': material.pk},
+            'variations': [{'pressure': 300}, {'material_type': 'aluminum'}]
+        }, format='json')
+
+        assert response.status_code == status.HTTP_200_OK, response.data
+        speeds = [variant['results']['cutting_speed'] for variant in response.data['results']]
+        builtin = api_client.post(self.url, {
+            'base_parameters': {**valid_payload, 'thickness': 50}, 'variations': [{'pressure': 300}]
+        }, format='json')
+        assert speeds[0] != builtin.data['results'][0]['results']['cutting_speed']
+
+
+class TestCalculationQueryCount:
+    """Seznam i detail výpočtů = jeden SELECT bez ohledu na počet řádků"""
+
+    url = '/api/calculations/'
+
+    @pytest.mark.parametrize("query", [
+        '',
+        '?fields=id,thickness,results',
+        '?fields=id,material_details,input_parameters',
+    ])
+    def test_list(self, api_client, calculations, django_assert_num_queries, query):
+        """Stránka seznamu nemá N+1 dotazy"""
+        with django_assert_num_queries(1):
+            response = api_client.get(self.url + query)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.data['results']) == len(calculations)
+
+    @pytest.mark.parametrize("query", ['', '?fields=id,abrasive_details,results'])
+    def test_retrieve(self, api_client, calculations, django_assert_num_queries, query):
+        """Detail výpočtu včetně materiálu a abraziva jedním dotazem"""
+        with django_assert_num_queries(1):
+            response = api_client.get(f'{self.url}{calculations[0].pk}/{query}')
+
+        assert response.status_code == status.HTTP_200_OK
+
+    def test_exceeded_budget_only_logged(self, api_client, calculations, settings, monkeypatch, caplog):
+        """Překročený rozpočet request neshodí ani v DEBUG"""
+        from backend.apps.calculations.views import AWJCalculationViewSet
+
+        settings.DEBUG = True
+        settings.AWJ_CALCULATOR = {**settings.AWJ_CALCULATOR, 'QUERY_BUDGET': {'ENABLED': True}}
+        monkeypatch.setattr(AWJCalculationViewSet, 'query_budget', {'list': 0})
+
+        response = api_client.get(self.url)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response['X-Query-Count'] == '1'
+        assert 'rozpočet 0' in caplog.text
+
+
+class TestCalculationCursorPagination:
+    """Kurzorové stránkování historie výpočtů"""
+
+    url = '/api/calculations/'
+
+    def _walk(self, client, url):
+        ids, pages = [], 0
+        while url:
+            response = client.get(url)
+            assert response.status_code == status.HTTP_200_OK
+            assert 'count' not in response.data
+            ids += [row['id'] for row in response.data['results']]
+            url, pages = response.data['next'], pages + 1
+        return ids, pages
+
+    def test_stable_order_with_equal_created_at(self, api_client, calculations):
+        """Shodné created_at: stránky se nepřekrývají ani nevynechají záznam"""
+        from django.utils import timezone
+        from backend.apps.calculations.models import AWJCalculation
+        AWJCalculation.objects.update(created_at=timezone.now())
+
+        ids, pages = self._walk(api_client, self.url + '?page_size=5')
+
+        assert pages == 3
+        assert ids == sorted((c.pk for c in calculations), reverse=True)
+
+    def test_previous_page_matches(self, api_client, calculations):
+        """Návrat přes 'previous' vrátí stejnou stránku"""
+        first = api_client.get(self.url + '?page_size=5')
+        second = api_client.get(first.data['next'])
+        back = api_client.get(second.data['previous'])
+
+        assert [row['id'] for row in back.data['results']] == [row['id'] for row in first.data['results']]
+
+    def test_unknown_fields_rejected(self, api_client, calculations):
+        response = api_client.get(self.url + '?fields=id,neexistuje')
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert 'neexistuje' in str(response.data['fields'])
+
+
+class TestBulkCreateAPI:
+    """Hromadné vytvoření uložených výpočtů"""
+
+    url = '/api/calculations/bulk_create/'
+    RESULT_FIELDS = ['water_flow', 'hydraulic_power', 'cutting_speed', 'cut_depth',
+                     'surface_roughness', 'cost_per_meter', 'extended_results']
+
+    @pytest.fixture
+    def rows(self):
+        from backend.apps.calculations.models import Material, AbrasiveMaterial
+        material = Material.objects.create(name='Nerez', type='stainless', density=8000, tensile_strength=600)
+        abrasive = AbrasiveMaterial.objects.create(
+            name='Granát 120', type='garnet', mesh_size=120, particle_size=125,
+            hardness=7.5, density=4100, cost_per_kg=31
+        )
+        return [
+            {'material': material.pk, 'abrasive': abrasive.pk, 'thickness': 12, 'pressure': 350},
+            {'material': material.pk, 'thickness': 30, 'pressure': 400, 'abrasive_flow': 10},
+            {'material': material.pk, 'abrasive': abrasive.pk, 'thickness': 5, 'pressure': 300,
+             'nozzle_diameter': 0.25, 'focus_diameter': 0.8},
+        ]
+
+    def test_one_invalid_row_creates_nothing(self, api_client, rows):
+        from backend.apps.calculations.models import AWJCalculation, CalculationDailyStatistics
+        rows[1]['pressure'] = 9000
+
+        response = api_client.post(self.url, {'calculations': rows}, format='json')
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert not AWJCalculation.objects.exists()
+        assert not CalculationDailyStatistics.objects.exists()
+
+    def test_failure_while_saving_rolls_back(self, api_client, rows, monkeypatch):
+        """Chyba po bulk_create (rollup) vrátí zpět i vložené řádky"""
+        from backend.apps.calculations import views
+        from backend.apps.calculations.models import AWJCalculation
+
+        def fail(created):
+            raise RuntimeError('rollup selhal')
+
+        monkeypatch.setattr(views, 'record_calculations', fail)
+        with pytest.raises(RuntimeError):
+            api_client.post(self.url, {'calculations': rows}, format='json')
+
+        assert not AWJCalculation.objects.exists()
+
+    def test_rows_match_single_create(self, api_client, rows):
+        from backend.apps.calculations.models import AWJCalculation
+
+        response = api_client.post(self.url, {'calculations': rows}, format='json')
+        assert response.status_code == status.HTTP_201_CREATED, response.data
+        bulk_ids = response.data['ids']
+
+        single_ids = []
+        for row in rows:
+            single = api_client.post('/api/calculations/', row, format='json')
+            assert single.status_code == status.HTTP_201_CREATED, single.data
+            single_ids.append(AWJCalculation.objects.latest('id').pk)
+
+        for bulk_id, single_id in zip(bulk_ids, single_ids):
+            bulk = AWJCalculation.objects.values(*self.RESULT_FIELDS).get(pk=bulk_id)
+            single = AWJCalculation.objects.values(*self.RESULT_FIELDS).get(pk=single_id)
+            assert bulk == single
+
+    def test_rollup_updated(self, api_client, rows, user):
+        from backend.apps.calculations.models import AWJCalculation, CalculationDailyStatistics
+
+        response = api_client.post(self.url, {'calculations': rows}, format='json')
+        assert response.status_code == status.HTTP_201_CREATED
+
+        rollup = CalculationDailyStatistics.objects.get(user=user)
+        speeds = list(AWJCalculation.objects.values_list('cutting_speed', flat=True))
+        assert rollup.calculations == len(rows)
+        assert rollup.material_id == rows[0]['material']
+        assert rollup.speed_count == len(rows)
+        assert rollup.speed_sum == pytest.approx(sum(speeds))
+
+
+class TestEstimateJobAPI:
+    """Odhad času a nákladů řezu dílu"""
+
+    url = '/api/calculations/estimate_job/'
+
+    def test_square(self, api_client, valid_payload):
+        """Čtverec 100 x 100 mm = 400 mm řezu"""
+        response = api_client.post(self.url, {
+            **valid_payload,
+            'contours': [{'points': [[0, 0], [100, 0], [100, 100], [0, 100]], 'closed': True}]
+        }, format='json')
+
+        assert response.status_code == status.HTTP_200_OK, response.data
+        assert response.data['estimate']['cut_length'] == pytest.approx(400)
+
+    def test_huge_coordinates_rejected(self, api_client, valid_payload):
+        """Souřadnice, na kterých přeteče délka segmentu, vrátí 400 místo 500"""
+        response = api_client.post(self.url, {
+            **valid_payload,
+            'contours': [{'points': [[-1e308, 0], [1e308, 0]]}]
+        }, format='json')
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert 'contours' in response.data
+
+
+class TestJobsAPI:
+    """Asynchronní úlohy: vlastnictví, příznak async a SSE stream"""
+
+    @pytest.fixture
+    def other_job(self, django_user_model):
+        from backend.apps.calculations.models import CalculationJob
+        other = django_user_model.objects.create_user('cizi', password='heslo')
+        return CalculationJob.objects.create(kind='optimize', parameters={}, user=other)
+
+    def test_foreign_job_not_found(self, api_client, user, other_job):
+        """Cizí úloha není v seznamu a detail vrátí 404"""
+        from backend.apps.calculations.models import CalculationJob
+        own = CalculationJob.objects.create(kind='optimize', parameters={}, user=user)
+
+        listed = api_client.get('/api/jobs/')
+        ids = [row['id'] for row in listed.data.get('results', listed.data)]
+        assert ids == [str(own.pk)]
+        assert api_client.get(f'/api/jobs/{other_job.pk}/').status_code == status.HTTP_404_NOT_FOUND
+        assert api_client.get(f'/api/jobs/{other_job.pk}/result/').status_code == status.HTTP_404_NOT_FOUND
+
+    def test_anonymous_sees_only_anonymous_jobs(self, other_job):
+        from rest_framework.test import APIClient
+        from backend.apps.calculations.models import CalculationJob
+        anonymous = CalculationJob.objects.create(kind='optimize', parameters={})
+        client = APIClient()
+
+        assert client.get(f'/api/jobs/{other_job.pk}/').status_code == status.HTTP_404_NOT_FOUND
+        assert client.get(f'/api/jobs/{anonymous.pk}/').status_code == status.HTTP_200_OK
+
+    @pytest.mark.parametrize("flag,expected", [
+        (True, status.HTTP_202_ACCEPTED),
+        ('false', status.HTTP_200_OK),
+        ('maybe', status.HTTP_400_BAD_REQUEST),
+    ])
+    def test_optimize_async_flag_validated(self, api_client, flag, expected):
+        response = api_client.post('/api/calculations/optimize/', {
+            'material_type': 'steel', 'thickness': 10, 'async': flag
+        }, format='json')
+
+        assert response.status_code == expected, response.data
+        if expected == status.HTTP_400_BAD_REQUEST:
+            assert 'async' in response.data
+
+    def test_batch_async_flag_validated(self, api_client, valid_payload):
+        response = api_client.post('/api/calculations/batch_calculate/', {
+            'base_parameters': valid_payload, 'variations': [{'pressure': 300}], 'async': 'maybe'
+        }, format='json')
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert 'async' in response.data
+
+    def test_stream_ends_finished_job(self, api_client, user):
+        """Dokončená úloha pošle retry a koncovou událost "end" a spojení skončí"""
+        from backend.apps.calculations.models import CalculationJob
+        job = CalculationJob.objects.create(
+            kind='optimize', parameters={}, user=user, status=CalculationJob.STATUS_SUCCEEDED, progress=100
+        )
+
+        response = api_client.get(f'/api/jobs/{job.pk}/stream/')
+        body = b''.join(response.streaming_content).decode()
+
+        assert body.startswith('retry: ')
+        assert 'event: end\ndata: {"status": "succeeded"' in body
+
+    def test_stream_closes_after_timeout(self, api_client, user, monkeypatch):
+        """Běžící úloha: po STREAM_TIMEOUT se spojení ukončí (klient se připojí znovu)"""
+        from backend.apps.calculations.models import CalculationJob
+        from backend.apps.calculations.views import CalculationJobViewSet
+        monkeypatch.setattr(CalculationJobViewSet, 'STREAM_TIMEOUT', 0)
+        monkeypatch.setattr(CalculationJobViewSet, 'STREAM_POLL_INTERVAL', 0)
+        job = CalculationJob.objects.create(
+            kind='optimize', parameters={}, user=user, status=CalculationJob.STATUS_RUNNING
+        )
+
+        response = api_client.get(f'/api/jobs/{job.pk}/stream/')
+        body = b''.join(response.streaming_content).decode()
+
+        assert body.count('data: ') == 1
+        assert 'event: end' not in body
+
+
+class TestStreamingAPI:
+    """Streamované odpovědi batch výpočtu a sweepu (NDJSON / CSV)"""
+
+    sweep_url = '/api/calculations/sweep/'
+
+    @staticmethod
+    def _body(response):
+        return b''.join(response.streaming_content).decode()
+
+    def _sweep(self, api_client, response_format):
+        return api_client.post(self.sweep_url, {
+            'materials': ['steel', 'glass'],
+            'axes': {
+                'thickness': {'values': [5, 10]},
+                'pressure': {'values': [300, 450]},
+                'nozzle_diameter': {'values': [0.3, 1.2]},
+                'focus_diameter': {'values': [1.0]},
+            },
+            'response_format': response_format,
+        }, format='json')
+
+    def test_batch_ndjson(self, api_client, valid_payload):
+        """Jeden parsovatelný JSON řádek na variantu, popisky jako v records"""
+        import json
+        response = api_client.post('/api/calculations/batch_calculate/', {
+            'base_parameters': valid_payload,
+            'variations': [{'pressure': 300}, {'pressure': 350}],
+            'response_format': 'ndjson',
+        }, format='json')
+
+        lines = self._body(response).splitlines()
+        rows = [json.loads(line) for line in lines]
+        assert response['Content-Type'] == 'application/x-ndjson'
+        assert [row['variant'] for row in rows] == ['base', 'variation_1', 'variation_2']
+        assert rows[2]['parameters']['pressure'] == 350
+
+    def test_batch_csv(self, api_client, valid_payload):
+        """Hlavička a řádek na každou variantu"""
+        import csv
+        response = api_client.post('/api/calculations/batch_calculate/', {
+            'base_parameters': valid_payload,
+            'variations': [{'pressure': 300}],
+            'response_format': 'csv',
+        }, format='json')
+
+        rows = list(csv.reader(self._body(response).splitlines()))
+        assert rows[0][0] == 'variant'
+        assert 'cutting_speed' in rows[0] and 'extended_water_velocity' in rows[0]
+        assert [row[0] for row in rows[1:]] == ['base', 'variation_1']
+
+    def test_sweep_skips_and_reports_invalid(self, api_client):
+        """Tryska >= fokus a sklo nad 400 MPa se přeskočí a jsou uvedeny v hlavičkách"""
+        import json
+        response = self._sweep(api_client, 'ndjson')
+        rows = [json.loads(line) for line in self._body(response).splitlines()]
+
+        # 2 materiály x 2 tloušťky x 2 tlaky x 2 trysky = 16; platná je jen tryska 0.3
+        # a z dvojic materiál / tlak neplatí sklo + 450 MPa
+        assert response['X-Sweep-Combinations'] == '16'
+        assert response['X-Sweep-Skipped'] == str(16 - len(rows))
+        assert len(rows) == 2 * 3
+        assert all(isinstance(row['variant'], str) and row['variant'].startswith('combination_') for row in rows)
+        assert len({row['variant'] for row in rows}) == len(rows)
+        assert not any(
+            row['parameters']['material_type'] == 'glass' and row['parameters']['pressure'] > 400 for row in rows
+        )
+        assert all(row['parameters']['nozzle_diameter'] < row['parameters']['focus_diameter'] for row in rows)
+
+    def test_sweep_csv(self, api_client):
+        import csv
+        response = self._sweep(api_client, 'csv')
+        rows = list(csv.reader(self._body(response).splitlines()))
+
+        assert rows[0][:2] == ['variant', 'material_type']
+        assert len(rows) - 1 == 16 - int(response['X-Sweep-Skipped'])
+
+
+class TestAbrasiveCatalogAPI:
+    """Změna abraziva se projeví po zneplatnění katalogu, bez dotazů na request"""
+
+    url = '/api/calculations/quick_calculate/'
+
+    @pytest.fixture
+    def abrasive(self):
+        from backend.apps.calculations.models import AbrasiveMaterial
+        return AbrasiveMaterial.objects.create(
+            name='Granát 80', type='garnet', mesh_size=80, particle_size=180,
+            hardness=7.5, density=4100, cost_per_kg=25
+        )
+
+    def _post(self, client, valid_payload, abrasive):
+        response = client.post(self.url, {**valid_payload, 'abrasive_id': abrasive.pk}, format='json')
+        assert response.status_code == status.HTTP_200_OK, response.data
+        return response.data
+
+    def test_price_and_mesh_change_visible(self, api_client, valid_payload, abrasive, django_assert_num_queries):
+        first = self._post(api_client, valid_payload, abrasive)
+        assert first['input_parameters']['abrasive_cost_per_kg'] == 25
+        assert first['input_parameters']['mesh_size'] == 80
+
+        # Načtený katalog: další požadavky do databáze nesahají
+        with django_assert_num_queries(0):
+            self._post(api_client, valid_payload, abrasive)
+
+        abrasive.cost_per_kg = 40
+        abrasive.mesh_size = 120
+        abrasive.save()
+
+        changed = self._post(api_client, valid_payload, abrasive)
+        assert changed['input_parameters']['abrasive_cost_per_kg'] == 40
+        assert changed['input_parameters']['mesh_size'] == 120
+        assert changed['results']['cost_per_meter'] > first['results']['cost_per_meter']
+        assert changed['results']['surface_roughness'] != first['results']['surface_roughness']
+
+    def test_other_process_sees_version_bump(self, abrasive):
+        """Katalog jiného procesu se po změně verze ve sdílené cache načte znovu"""
+        from backend.apps.calculations.materials import (
+            ABRASIVE_VERSION_CACHE_KEY, AbrasiveCatalog, MaterialSnapshotCache
+        )
+        other = MaterialSnapshotCache(
+            check_interval=0, loader=AbrasiveCatalog, version_key=ABRASIVE_VERSION_CACHE_KEY
+        )
+        assert other.get().get(abrasive.pk)['cost_per_kg'] == 25
+
+        abrasive.cost_per_kg = 33
+        abrasive.save()
+
+        assert other.get().get(abrasive.pk)['cost_per_kg'] == 33
+        assert other.loads == 2
+
+
+class TestPresetIndexAPI:
+    """Index presetů pro /api/optimization-presets/for_material/"""
+
+    url = '/api/optimization-presets/for_material/'
+
+    @pytest.fixture
+    def presets(self):
+        from backend.apps.calculations.models import OptimizationPreset
+
+        def preset(name, target, low, high, materials=('steel',)):
+            return OptimizationPreset.objects.create(
+                name=name, description='', target=target, recommended_params={},
+                suitable_for_materials=list(materials), min_thickness=low, max_thickness=high
+            )
+
+        return [
+            preset('Tenké', 'max_speed', None, 10),
+            preset('Střední', 'max_speed', 10, 50),
+            preset('Levné', 'min_cost', 5, None),
+            preset('Vše', 'balanced', None, None, materials=('steel', 'glass')),
+        ]
+
+    def _names(self, **params):
+        from rest_framework.test import APIClient
+        response = APIClient().get(self.url, params)
+        assert response.status_code == status.HTTP_200_OK, response.data
+        return [p['name'] for p in response.data['presets']]
+
+    @pytest.mark.parametrize("thickness,expected", [
+        (0, ['Tenké', 'Vše']),
+        (4.999, ['Tenké', 'Vše']),
+        (5, ['Levné', 'Tenké', 'Vše']),
+        (10, ['Levné', 'Střední', 'Tenké', 'Vše']),
+        (10.001, ['Levné', 'Střední', 'Vše']),
+        (50, ['Levné', 'Střední', 'Vše']),
+        (50.5, ['Levné', 'Vše']),
+        (1e6, ['Levné', 'Vše']),
+    ])
+    def test_thickness_edges(self, presets, thickness, expected):
+        """Meze rozsahů platí včetně, prázdná mez = bez omezení (pořadí podle modelu)"""
+        assert self._names(material='steel', thickness=thickness) == expected
+
+    def test_matches_brute_force(self, presets):
+        from backend.apps.calculations.models import OptimizationPreset
+        from backend.apps.calculations.presets import get_preset_index
+
+        index = get_preset_index()
+        for target in [None, 'max_speed', 'min_cost']:
+            for thickness in [None, -1, 0, 2.5, 5, 7, 10, 30, 50, 80]:
+                expected = [
+                    p.name for p in OptimizationPreset.objects.all()
+                    if 'steel' in p.suitable_for_materials
+                    and (target is None or p.target == target)
+                    and (thickness is None or (
+                        (p.min_thickness is None or p.min_thickness <= thickness)
+                        and (p.max_thickness is None or thickness <= p.max_thickness)
+                    ))
+                ]
+                found = index.find('steel', target=target, thickness=thickness)
+                assert [p['name'] for p in found] == expected, (target, thickness)
+
+    def test_rebuilt_on_save_and_delete(self, presets, django_assert_num_queries):
+        assert self._names(material='glass') == ['Vše']
+        with django_assert_num_queries(0):
+            self._names(material='glass')
+
+        presets[0].suitable_for_materials = ['steel', 'glass']
+        presets[0].max_thickness = 3
+        presets[0].save()
+        assert self._names(material='glass') == ['Tenké', 'Vše']
+        assert self._names(material='glass', thickness=4) == ['Vše']
+
+        presets[3].delete()
+        assert self._names(material='glass') == ['Tenké']
+        assert 'Vše' not in self._names(material='steel')
+
+
+class TestProfileAPI:
+    """Průběhy analýzy po hloubce a čase řezu"""
+
+    url = '/api/analysis/profile/'
+
+    def test_time_axis_monotonic(self, api_client, valid_payload):
+        """Osa time po decimaci neklesá a má nejvýše max_points bodů"""
+        response = api_client.post(self.url, {
+            **valid_payload, 'resolution': 5000, 'max_points': 200, 'axis': 'time'
+        }, format='json')
+
+        assert response.status_code == status.HTTP_200_OK, response.data
+        axis = response.data['profile']['axis']
+        assert len(axis) <= 200
+        assert all(a <= b for a, b in zip(axis, axis[1:]))
+        assert 'time' not in response.data['profile']['series']
+
+    def test_material_id(self, api_client, valid_payload):
+        """Materiál z databáze mění průběh proti vestavěnému materiálu"""
+        from backend.apps.calculations.models import Material
+
+        material = Material.objects.create(
+            name='Nerez 304', type='steel', density=8000, tensile_strength=520, k_factor=0.8
+        )
+        options = {'thickness': 50, 'resolution': 500, 'max_points': 50}
+        response = api_client.post(self.url, {**valid_payload, **options, 'material_id': material.pk}, format='json')
+        builtin = api_client.post(self.url, {**valid_payload, **options}, format='json')
+
+        assert response.status_code == status.HTTP_200_OK, response.data
+        assert response.data['results']['cutting_speed'] != builtin.data['results']['cutting_speed']
+
+    def test_max_points_minimum(self, api_client, valid_payload):
+        """Decimace potřebuje aspoň oba krajní body a jeden vnitřní úsek"""
+        response = api_client.post(self.url, {**valid_payload, 'max_points': 2}, format='json')
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert 'max_points' in response.data
@@ -0,0 +1,48 @@
+# test_calculations.py
+import numpy as np
+from backend.apps.calculations.services import AWJCalculationService
+
+
+class TestBatchCalculation:
+    """Testy vektorizovaného výpočtu"""
+
+    def test_batch_matches_scalar(self):
+        """Dávkový výpočet odpovídá skalárnímu bit po bitu"""
+        rng = np.random.default_rng(42)
+        size = 200
+        columns = {
+            'material_type': np.array(
+                rng.choice(list(AWJCalculationService.MATERIAL_PROPERTIES), size),
+                dtype=object
+            ),
+            'thickness': rng.uniform(0.5, 150, size),
+            'pressure': rng.uniform(100, 600, size),
+            'nozzle_diameter': rng.choice([0.25, 0.33, 0.4], size),
+            'focus_diameter': rng.choice([0.8, 1.0, 1.2], size),
+            'abrasive_flow': rng.uniform(1, 20, size),
+            'mesh_size': rng.choice([60, 80, 120], size).astype(float),
+        }
+
+        batch = AWJCalculationService.perform_full_calculation_batch(columns)
+
+        for i in range(size):
+            params = {name: column[i].item() if hasattr(column[i], 'item') else column[i]
+                      for name, column in columns.items()}
+            scalar = AWJCalculationService.perform_full_calculation(params)
+            for key, value in scalar.items():
+                if key == 'extended':
+                    for name, extended in value.items():
+                        assert batch[key][name][i] == extended, f"{name} se liší v řádku {i}"
+                else:
+                    assert batch[key][i] == value, f"{key} se liší v řádku {i}"
+
+    def test_batch_broadcasts_scalars(self):
+        """Skalární vstupy se rozšíří na celou dávku"""
+        batch = AWJCalculationService.perform_full_calculation_batch({
+            'material_type': 'steel',
+            'thickness': np.array([5.0, 10.0, 20.0]),
+            'pressure': 380.0,
+        })
+
+        assert batch['cutting_speed'].shape == (3,)
+        assert batch['cutting_speed'][0] > batch['cutting_speed'][2]
@@ -0,0 +1,78 @@
+# test_models.py
+import pytest
+from django.db import IntegrityError, transaction
+from backend.apps.calculations.models import AWJCalculation, CalculationDailyStatistics
+from backend.apps.calculations.rollups import record_calculations, rebuild_statistics
+
+pytestmark = pytest.mark.django_db
+
+
+def _snapshot():
+    return sorted(CalculationDailyStatistics.objects.values_list(
+        'date', 'material_id', 'user_id', 'calculations', 'speed_count', 'cost_count'
+    ), key=lambda row: tuple(-1 if value is None else value for value in row))
+
+
+class TestDailyStatistics:
+    """Testy inkrementálního rollupu statistik"""
+
+    def test_unique_key_including_nulls(self):
+        """Jeden řádek na (den, materiál, uživatel) i bez materiálu a uživatele"""
+        CalculationDailyStatistics.objects.create(date='2026-01-01', calculations=1)
+
+        with pytest.raises(IntegrityError), transaction.atomic():
+            CalculationDailyStatistics.objects.create(date='2026-01-01', calculations=1)
+
+    def test_incremental_matches_rebuild(self, calculations):
+        """Uložení, úprava a smazání výpočtů udrží rollup shodný s přepočtem"""
+        calculations[0].cutting_speed = None
+        calculations[0].save()
+        calculations[1].delete()
+        calculations[2].material = None
+        calculations[2].save()
+
+        incremental = _snapshot()
+        rebuild_statistics()
+        assert incremental == _snapshot()
+
+    def test_decrement_of_missing_row_is_kept(self, calculations):
+        """Odečet z neexistujícího řádku se uloží záporně a nezahodí se"""
+        CalculationDailyStatistics.objects.all().delete()
+
+        record_calculations([calculations[0]], sign=-1)
+        record_calculations([calculations[0]], sign=1)
+
+        assert CalculationDailyStatistics.objects.count() == 0
+
+    def test_deleted_material_merges_rows(self, calculations):
+        """Smazání materiálu přesune jeho řádky k řádkům bez materiálu"""
+        calculations[0].material = None
+        calculations[0].save()
+
+        calculations[1].material.delete()
+
+        assert AWJCalculation.objects.count() == len(calculations)
+        incremental = _snapshot()
+        rebuild_statistics()
+        assert incremental == _snapshot()
+
+
+class TestHistoryBuffer:
+    """Testy zápisu historie quick_calculate"""
+
+    def test_foreign_keys_only_for_explicit_choices(self, calculations):
+        """Vestavěný typ ani mesh se nepřiřadí náhodnému záznamu z databáze"""
+        from backend.apps.calculations.history_buffer import HistoryWriteBuffer
+        from backend.apps.calculations.materials import material_key
+
+        material = calculations[0].material
+        abrasive = calculations[0].abrasive
+        base = {'user_id': None, 'thickness': 10, 'pressure': 380, 'cutting_speed': 100}
+
+        builtin, chosen = HistoryWriteBuffer._build_instances([
+            {**base, 'material_type': 'steel', 'abrasive_id': None},
+            {**base, 'material_type': material_key(material.pk), 'abrasive_id': abrasive.pk},
+        ])
+
+        assert builtin.material is None and builtin.abrasive is None
+        assert chosen.material == material and chosen.abrasive == abrasive
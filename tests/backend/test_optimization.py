@@ -0,0 +1,273 @@
+# test_optimization.py
+import numpy as np
+import pytest
+from rest_framework import status
+from backend.apps.calculations.optimizer import AWJOptimizationEngine, pareto_front_mask
+from backend.apps.calculations.services import AWJOptimizationService
+
+
+def _brute_force_mask(objectives):
+    """Referenční O(n²) maska nedominovaných bodů (duplicity jen jednou)"""
+    mask = np.zeros(len(objectives), dtype=bool)
+    seen = set()
+    for i, point in enumerate(objectives):
+        dominated = np.any(
+            np.all(objectives <= point, axis=1) & np.any(objectives < point, axis=1)
+        )
+        if not dominated and tuple(point) not in seen:
+            mask[i] = True
+            seen.add(tuple(point))
+    return mask
+
+
+class TestParetoFrontMask:
+    """Testy výběru Pareto fronty"""
+
+    @pytest.mark.parametrize("seed", range(5))
+    def test_matches_brute_force(self, seed):
+        """Sorted-sweep dává stejnou frontu jako párové porovnání"""
+        rng = np.random.default_rng(seed)
+        # Celočíselné hodnoty, aby vznikaly shody v jednotlivých kritériích
+        objectives = rng.integers(0, 12, size=(400, 3)).astype(float)
+
+        mask = pareto_front_mask(objectives)
+        reference = _brute_force_mask(objectives)
+
+        front = {tuple(p) for p in objectives[mask]}
+        assert front == {tuple(p) for p in objectives[reference]}
+        assert mask.sum() == reference.sum()
+
+    def test_empty_input(self):
+        """Prázdný vstup vrátí prázdnou masku"""
+        assert pareto_front_mask(np.empty((0, 3))).shape == (0,)
+
+
+class TestMinSpeedConstraint:
+    """Zaokrouhlený výsledek minimalizace nákladů musí splnit min_speed"""
+
+    # Bod, jehož rychlost po zaokrouhlení parametrů i výsledku klesne pod přesnou hodnotu
+    POINT = np.array([0.537, 0.411, 0.3, 0.8])
+
+    @pytest.fixture
+    def engine(self):
+        return AWJOptimizationEngine('steel', 50)
+
+    def _exact_speed(self, engine, unit):
+        return float(engine._evaluate(engine._to_physical(unit))[0][0])
+
+    def test_optimum_on_constraint_without_fallback(self, engine):
+        """Optimum přesně na omezení, které zaokrouhlení poruší, se nevrátí"""
+        min_speed = self._exact_speed(engine, self.POINT)
+        assert engine._finalize(self.POINT, min_speed=min_speed) is None
+
+    def test_optimum_on_constraint_uses_feasible_fallback(self, engine):
+        """Místo porušeného optima se vrátí náhradní přípustný bod"""
+        min_speed = self._exact_speed(engine, self.POINT)
+        fallback = np.array([1.0, 1.0, 0.0, 1.0])
+        assert self._exact_speed(engine, fallback) > min_speed
+
+        result = engine._finalize(self.POINT, min_speed=min_speed, fallbacks=[fallback])
+        assert result['expected_speed'] >= min_speed
+        assert result['pressure'] == engine.upper[0]
+
+    @pytest.mark.parametrize("min_speed", [1500, 1800, 2500, 4000])
+    def test_minimize_cost_respects_min_speed(self, engine, min_speed):
+        """Aktivní omezení: SLSQP končí na hranici, výsledek ji nesmí podkročit"""
+        result = engine.minimize_cost(min_speed=min_speed)
+        assert result['expected_speed'] >= min_speed
+
+
+class TestParetoFrontCache:
+    """Cachovaná Pareto fronta se nesmí sdílet mezi volajícími"""
+
+    def test_mutating_result_does_not_corrupt_cache(self):
+        first = AWJOptimizationService.pareto_front('steel', 12.5, grid_points=4)
+        expected = [dict(point) for point in first['points']]
+
+        first['points'][0]['cutting_speed'] = -1
+        first['points'].clear()
+        first['optimizer']['front_size'] = 0
+
+        second = AWJOptimizationService.pareto_front('steel', 12.5, grid_points=4)
+        assert second['points'] == expected
+        assert second['optimizer']['front_size'] == len(expected)
+
+
+@pytest.mark.django_db
+class TestOptimizeAPI:
+    """Testy validace vstupů optimalizace"""
+
+    url = '/api/calculations/optimize/'
+
+    def test_optimize_for_speed(self, api_client):
+        """Optimalizace pro rychlost v zadaném rozsahu tlaku"""
+        response = api_client.post(self.url, {
+            'material_type': 'steel',
+            'thickness': 10,
+            'target': 'max_speed',
+            'bounds': {'pressure': [200, 300]}
+        }, format='json')
+
+        assert response.status_code == status.HTTP_200_OK, response.data
+        assert 200 <= response.data['optimized_parameters']['pressure'] <= 300
+
+    @pytest.mark.parametrize("payload,field", [
+        ({'bounds': {'pressure': [700, 800]}}, 'bounds'),
+        ({'bounds': {'pressure': [1]}}, 'bounds'),
+        ({'bounds': {'pressure': [300, 'x']}}, 'bounds'),
+        ({'bounds': {'pressure': [400, 300]}}, 'bounds'),
+        ({'bounds': {'speed': [1, 2]}}, 'bounds'),
+        ({'thickness': 'abc'}, 'thickness'),
+        ({'min_speed': -5}, 'min_speed'),
+        ({'target': 'fastest'}, 'target'),
+    ])
+    def test_invalid_input(self, api_client, payload, field):
+        """Neplatné vstupy vrátí 400 dřív, než se spustí optimalizace"""
+        response = api_client.post(self.url, {'material_type': 'steel', **payload}, format='json')
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert field in response.data
+
+    def test_invalid_input_not_enqueued(self, api_client):
+        """Asynchronní cesta validuje stejně jako synchronní"""
+        response = api_client.post(self.url, {
+            'material_type': 'steel', 'bounds': {'pressure': [700, 800]}, 'async': True
+        }, format='json')
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert 'job_id' not in response.data
+
+
+@pytest.fixture(scope='module')
+def surrogate(django_db_setup, django_db_blocker):
+    """Malý surrogate (3 materiály, 5 stromů) natrénovaný jednou pro modul"""
+    from backend.apps.ai_optimization.ml_models import train_surrogate
+    with django_db_blocker.unblock():
+        return train_surrogate(['steel', 'aluminum', 'glass'], thickness_points=6, estimators=5)
+
+
+@pytest.fixture
+def surrogate_dir(surrogate, tmp_path, settings):
+    """MODEL_DIR s uloženým surrogate; get_surrogate() ho načte znovu"""
+    from backend.apps.ai_optimization.ml_models import reset_surrogate
+    surrogate.save(tmp_path)
+    settings.AWJ_CALCULATOR = {
+        **settings.AWJ_CALCULATOR,
+        'ENABLE_AI_OPTIMIZATION': True,
+        'SURROGATE': {**settings.AWJ_CALCULATOR.get('SURROGATE', {}), 'MODEL_DIR': str(tmp_path), 'VERSION': None},
+    }
+    reset_surrogate()
+    yield tmp_path
+    reset_surrogate()
+
+
+class TestInverseSurrogate:
+    """Trénink, verze artefaktů a predikce surrogate modelu"""
+
+    def test_training(self, surrogate):
+        assert set(surrogate.targets) == {'max_speed', 'min_cost'}
+        assert surrogate.metadata['materials'] == 3
+        assert surrogate.metadata['estimators'] == 5
+        for metrics in surrogate.metadata['metrics'].values():
+            assert set(metrics['mae']) == set(AWJOptimizationEngine.VARIABLES)
+
+    def test_save_load_versions(self, surrogate, tmp_path):
+        from backend.apps.ai_optimization.ml_models import InverseSurrogate
+
+        assert InverseSurrogate.available_versions(tmp_path / 'neni') == []
+        assert InverseSurrogate.load(tmp_path) is None
+
+        first = surrogate.save(tmp_path)
+        second = surrogate.save(tmp_path)
+
+        assert first.name == 'inverse-surrogate-v0001.joblib'
+        assert second.name == 'inverse-surrogate-v0002.joblib'
+        assert first.with_suffix('.json').exists()
+        assert InverseSurrogate.available_versions(tmp_path) == [1, 2]
+        assert InverseSurrogate.load(tmp_path).version == 2
+        assert InverseSurrogate.load(tmp_path, version=1).version == 1
+
+    @pytest.mark.parametrize("material_type", ['steel', 'aluminum', 'glass', 'titanium'])
+    def test_predict_nozzle_narrower_than_focus(self, surrogate, material_type):
+        for thickness in [0.1, 1, 7.5, 40, 200, 500]:
+            for target in surrogate.targets:
+                params = surrogate.predict(material_type, thickness, target)
+                assert params['nozzle_diameter'] < params['focus_diameter'], (thickness, target)
+
+    def test_predict_repairs_overlapping_diameters(self, monkeypatch):
+        """Predikce trysky >= fokusu se opraví na fokus minus krok přesnosti"""
+        from backend.apps.ai_optimization.ml_models import InverseSurrogate
+
+        class Constant:
+            def predict(self, X):
+                return np.tile([300.0, 8.0, 0.9, 0.7], (len(X), 1))
+
+        monkeypatch.setattr(AWJOptimizationEngine, 'DEFAULT_BOUNDS', {
+            **AWJOptimizationEngine.DEFAULT_BOUNDS, 'nozzle_diameter': (0.2, 1.0)
+        })
+        params = InverseSurrogate({'max_speed': Constant()}, {}).predict('steel', 10)
+
+        assert params['focus_diameter'] == 0.7
+        assert params['nozzle_diameter'] == 0.69
+
+
+@pytest.mark.django_db
+class TestRecommendParameters:
+    """Surrogate odpovídá na podporované dotazy, ostatní spadnou na optimalizátor"""
+
+    def test_surrogate_source(self, surrogate_dir):
+        from backend.apps.ai_optimization.ml_models import recommend_parameters
+
+        result = recommend_parameters('steel', 12, target='max_speed')
+
+        assert result['source'] == 'surrogate'
+        assert result['fallback_reason'] is None
+        assert result['model_version'] == 1
+        assert result['parameters']['expected_speed'] > 0
+
+    def test_model_missing(self, tmp_path, settings):
+        from backend.apps.ai_optimization.ml_models import recommend_parameters, reset_surrogate
+        settings.AWJ_CALCULATOR = {
+            **settings.AWJ_CALCULATOR, 'ENABLE_AI_OPTIMIZATION': True, 'SURROGATE': {'MODEL_DIR': str(tmp_path)}
+        }
+        reset_surrogate()
+        try:
+            result = recommend_parameters('steel', 12)
+        finally:
+            reset_surrogate()
+
+        assert (result['source'], result['fallback_reason']) == ('optimizer', 'model_missing')
+
+    @pytest.mark.parametrize("options,reason", [
+        ({'abrasive_cost_per_kg': 99.0}, 'prices_mismatch'),
+        ({'min_speed': 120}, 'min_speed_mismatch'),
+    ])
+    def test_untrained_min_cost_query(self, surrogate_dir, options, reason):
+        from backend.apps.ai_optimization.ml_models import recommend_parameters
+
+        result = recommend_parameters('steel', 12, target='min_cost', **options)
+
+        assert (result['source'], result['fallback_reason']) == ('optimizer', reason)
+        assert result['model_version'] == 1
+
+    def test_calibrated_material(self, surrogate_dir):
+        from backend.apps.ai_optimization.ml_models import recommend_parameters
+        from backend.apps.calculations.materials import material_key
+        from backend.apps.calculations.models import Material, MaterialCalibration
+
+        material = Material.objects.create(name='Kalibrovaná ocel', type='steel', density=7850, tensile_strength=400)
+        MaterialCalibration.objects.create(material=material, coefficients={'pressure_exponent': 1.7})
+
+        result = recommend_parameters(material_key(material.pk), 12)
+
+        assert (result['source'], result['fallback_reason']) == ('optimizer', 'calibrated_material')
+
+    def test_min_speed_violated(self, surrogate_dir):
+        """Doporučení pod min_speed se nahradí výsledkem optimalizátoru"""
+        from backend.apps.ai_optimization.ml_models import get_surrogate, recommend_parameters
+
+        get_surrogate().metadata['min_speed'] = 4000
+        result = recommend_parameters('steel', 100, target='min_cost', min_speed=4000)
+
+        assert (result['source'], result['fallback_reason']) == ('optimizer', 'min_speed_violated')
+        assert result['parameters'] == {}
@@ -0,0 +1,485 @@
+# test_services.py
+import pytest
+from backend.apps.calculations.cache import InProcessResultCache, DjangoResultCache
+
+
+class TestResultCacheTTL:
+    """TTL 0 znamená u obou backendů cache bez expirace"""
+
+    @pytest.mark.parametrize("backend", [InProcessResultCache, DjangoResultCache])
+    def test_zero_ttl_never_expires(self, backend):
+        """Záznam s TTL 0 se uloží a je k dispozici"""
+        cache = backend(ttl=0)
+        cache.clear()
+        cache.set('awj:test:ttl0', {'cutting_speed': 120})
+
+        assert cache.get('awj:test:ttl0') == {'cutting_speed': 120}
+        assert cache.stats()['hits'] == 1
+
+
+@pytest.mark.django_db
+class TestJobRecovery:
+    """Obnova úloh thread backendu po restartu"""
+
+    class RecordingBackend:
+        def __init__(self):
+            self.submitted = []
+
+        def submit(self, job_id):
+            self.submitted.append(job_id)
+
+    def test_recover_jobs(self, monkeypatch):
+        """Čekající úlohy se znovu předají, dlouho běžící se označí jako selhané"""
+        from datetime import timedelta
+        from django.utils import timezone
+        from backend.apps.calculations import jobs
+        from backend.apps.calculations.models import CalculationJob
+
+        backend = self.RecordingBackend()
+        monkeypatch.setattr(jobs, '_job_backend', backend)
+
+        pending = CalculationJob.objects.create(kind='optimize', parameters={})
+        stale = CalculationJob.objects.create(
+            kind='optimize', parameters={}, status=CalculationJob.STATUS_RUNNING,
+            started_at=timezone.now() - timedelta(hours=2)
+        )
+        fresh = CalculationJob.objects.create(
+            kind='optimize', parameters={}, status=CalculationJob.STATUS_RUNNING,
+            started_at=timezone.now()
+        )
+
+        counts = jobs.recover_jobs(stale_after=3600)
+
+        assert counts == {'resubmitted': 1, 'failed': 1}
+        assert backend.submitted == [pending.pk]
+        stale.refresh_from_db()
+        fresh.refresh_from_db()
+        assert stale.status == CalculationJob.STATUS_FAILED
+        assert fresh.status == CalculationJob.STATUS_RUNNING
+
+
+@pytest.mark.django_db
+class TestJobExecution:
+    """Koncový stav úlohy a průběh optimalizace"""
+
+    def _run(self, monkeypatch, handler):
+        from backend.apps.calculations import jobs
+        from backend.apps.calculations.models import CalculationJob
+
+        monkeypatch.setitem(jobs.JOB_HANDLERS, 'batch', handler)
+        job = CalculationJob.objects.create(kind='batch', parameters={})
+        jobs.execute_job(job.pk)
+        job.refresh_from_db()
+        return job
+
+    @pytest.mark.parametrize("status", ['failed', 'cancelled'])
+    @pytest.mark.parametrize("outcome", ['result', 'error'])
+    def test_finished_job_not_overwritten(self, monkeypatch, status, outcome):
+        """Úloha ukončená během běhu (obnova, zrušení) si ponechá svůj stav"""
+        from backend.apps.calculations.models import CalculationJob
+
+        def handler(parameters, progress):
+            CalculationJob.objects.filter(kind='batch').update(status=status, error='obnova')
+            if outcome == 'error':
+                raise RuntimeError('pozdní chyba')
+            return {'late': True}
+
+        job = self._run(monkeypatch, handler)
+
+        assert job.status == status
+        assert job.result is None
+        assert job.error == 'obnova'
+
+    def test_progress_stops_finished_job(self, monkeypatch):
+        """progress() ukončí handler úlohy, kterou mezitím obnova označila jako selhanou"""
+        from backend.apps.calculations.models import CalculationJob
+        reached = []
+
+        def handler(parameters, progress):
+            CalculationJob.objects.filter(kind='batch').update(status=CalculationJob.STATUS_FAILED)
+            progress(0.5)
+            reached.append(True)
+
+        job = self._run(monkeypatch, handler)
+
+        assert job.status == CalculationJob.STATUS_FAILED
+        assert reached == []
+
+    def test_optimize_reports_phases(self):
+        """Optimalizace hlásí průběh po gridu a před každým startem zpřesnění"""
+        from backend.apps.calculations.services import AWJOptimizationService
+        fractions = []
+
+        result = AWJOptimizationService.optimize('steel', 10, target='min_cost', progress=fractions.append)
+
+        assert result['expected_speed'] >= 50
+        assert fractions == [0.25, 0.5, 0.75]
+
+    def test_optimize_cancelled_between_phases(self):
+        """Výjimka z progress (zrušení) ukončí optimalizaci před dalším startem"""
+        from backend.apps.calculations.jobs import JobCancelled
+        from backend.apps.calculations.optimizer import AWJOptimizationEngine
+        calls = []
+
+        def progress(fraction):
+            calls.append(fraction)
+            if len(calls) == 2:
+                raise JobCancelled()
+
+        engine = AWJOptimizationEngine('steel', 10, progress=progress)
+        with pytest.raises(JobCancelled):
+            engine.maximize_speed()
+        assert calls == [0.25, 0.5]
+
+
+class TestSweepRunner:
+    """Testy sweepu přes sdílenou paměť"""
+
+    axes = {
+        'thickness': [5.0, 20.0],
+        'pressure': [300.0, 380.0],
+        'nozzle_diameter': [0.33],
+        'focus_diameter': [1.0],
+        'abrasive_flow': [8.0],
+        'mesh_size': [80.0],
+    }
+
+    def test_grid_matches_batch(self):
+        """Sweep dává stejné výsledky jako perform_full_calculation_batch"""
+        from backend.apps.calculations.services import AWJCalculationService
+        from backend.apps.calculations.sweep import SweepRunner
+
+        sweep = SweepRunner(workers=1).run_grid(self.axes, ['steel', 'glass'])
+        batch = AWJCalculationService.perform_full_calculation_batch(sweep['parameters'])
+
+        assert list(sweep['results']['cutting_speed']) == list(batch['cutting_speed'])
+
+    def test_unknown_material_rejected(self):
+        """Neznámý materiál se nepočítá potichu jako ocel"""
+        from backend.apps.calculations.sweep import SweepRunner
+
+        with pytest.raises(ValueError):
+            SweepRunner(workers=1).run_grid(self.axes, ['steel', 'material:7'])
+
+
+class TestSensitivity:
+    """Analytické elasticity proti konečným diferencím"""
+
+    def test_analytic_matches_finite_differences(self):
+        """V bodech bez aktivního omezení se analytika shoduje s FD"""
+        import numpy as np
+        from backend.apps.calculations.sensitivity import (
+            INPUTS, OUTPUTS, _columns, finite_differences, sensitivity
+        )
+
+        rng = np.random.default_rng(1)
+        params = {
+            'material_type': 'steel',
+            'thickness': rng.uniform(20, 150, 50),
+            'pressure': rng.uniform(150, 400, 50),
+            'abrasive_flow': rng.uniform(3, 15, 50),
+            'focus_diameter': rng.uniform(0.8, 1.4, 50),
+        }
+        result = sensitivity(params)
+        fd, _ = finite_differences('steel', _columns(params))
+
+        for name in INPUTS:
+            analytic = ~result['finite_difference'][name]
+            assert analytic.any(), name
+            for output in OUTPUTS:
+                np.testing.assert_allclose(
+                    result['derivatives'][output][name][analytic], fd[output][name][analytic],
+                    rtol=1e-4, atol=1e-9, err_msg=f"d{output}/d{name}"
+                )
+
+
+@pytest.mark.django_db
+class TestSensitivityAPI:
+    """Citlivost přes API"""
+
+    def test_zero_prices(self, api_client, valid_payload):
+        """Nulové ceny tarifu nevedou na nekonečné elasticity ani chybu 500"""
+        from backend.apps.calculations.models import TariffProfile
+
+        TariffProfile.objects.create(
+            name='zdarma', water_cost_per_m3=0, power_cost_per_kwh=0, abrasive_cost_per_kg=0
+        )
+        response = api_client.post('/api/calculations/sensitivity/', {
+            **valid_payload, 'thickness': 50, 'tariff': 'zdarma'
+        }, format='json')
+
+        assert response.status_code == 200, response.content
+        elasticities = response.json()['elasticities']['cost_per_meter']
+        assert elasticities['power_cost_per_kwh'] == 0
+
+
+@pytest.mark.django_db
+class TestCalibration:
+    """Kalibrace koeficientů z naměřených výsledků"""
+
+    TRUE = {
+        'pressure_exponent': 1.3, 'abrasive_exponent': 0.7, 'thickness_exponent': 1.1,
+        'roughness_speed_exponent': 0.25, 'roughness_abrasive_exponent': 0.5, 'roughness_mesh_exponent': 0.3,
+        'k': 0.8, 'roughness_factor': 1.4, 'depth_factor': 12.0,
+    }
+
+    def test_recovers_known_coefficients(self, settings):
+        """Z dat generovaných známými koeficienty se tyto koeficienty nafitují zpět"""
+        import numpy as np
+        from backend.apps.calculations.calibration import calibrate
+        from backend.apps.calculations.models import AbrasiveMaterial, AWJCalculation, Material
+
+        settings.AWJ_CALCULATOR = {
+            **settings.AWJ_CALCULATOR,
+            'CALIBRATION': {'CHUNK_SIZE': 50, 'MIN_SAMPLES': 20, 'RIDGE': 1e-9},
+        }
+        material = Material.objects.create(name='Ocel S355', type='steel', density=7850, tensile_strength=400)
+        abrasives = [
+            AbrasiveMaterial.objects.create(
+                name=f'Granát {mesh}', type='garnet', mesh_size=mesh, particle_size=180,
+                hardness=7.5, density=4100, cost_per_kg=25
+            )
+            for mesh in (50, 80, 120)
+        ]
+
+        true = self.TRUE
+        rng = np.random.default_rng(7)
+        size = 120
+        thickness = rng.uniform(5, 100, size)
+        pressure = rng.uniform(150, 400, size)
+        abrasive_flow = rng.uniform(3, 15, size)
+        nozzle, focus = 0.33, 1.0
+        mesh_index = rng.integers(0, 3, size)
+        mesh = np.array([a.mesh_size for a in abrasives], dtype=float)[mesh_index]
+
+        # Modely podle docstringu calibration.py (σ^-d s výchozím d = 0.5)
+        correction = 1 + 0.1 * (focus / nozzle - 3.0)
+        speed = (60 * correction * true['k'] * 400 ** -0.5 * pressure ** true['pressure_exponent']
+                 * abrasive_flow ** true['abrasive_exponent'] / thickness ** true['thickness_exponent'])
+        roughness = (2.0 * true['roughness_factor'] * speed ** true['roughness_speed_exponent']
+                     / (abrasive_flow ** true['roughness_abrasive_exponent']
+                        * mesh ** true['roughness_mesh_exponent']))
+        depth = true['depth_factor'] * true['k'] * pressure ** 1.5 * abrasive_flow ** 0.8 / speed ** 0.5
+
+        AWJCalculation.objects.bulk_create([
+            AWJCalculation(
+                material=material, abrasive=abrasives[mesh_index[i]], thickness=thickness[i],
+                pressure=pressure[i], nozzle_diameter=nozzle, focus_diameter=focus,
+                abrasive_flow=abrasive_flow[i], cutting_speed=speed[i], measured_speed=speed[i],
+                measured_roughness=roughness[i], measured_depth=depth[i]
+            )
+            for i in range(size)
+        ])
+
+        result = calibrate(dry_run=True)['materials'][material.pk]
+
+        assert all(m['status'] == 'fitted' for m in result['metrics'].values()), result['metrics']
+        for name, value in true.items():
+            assert result['coefficients'][name] == pytest.approx(value, rel=1e-3), name
+
+
+class TestToolpathCost:
+    """Ceny spotřeby odhadu řezu"""
+
+    def test_default_prices_follow_service(self, monkeypatch):
+        """Bez cen v parametrech se použijí AWJCalculationService.DEFAULT_PRICES"""
+        from backend.apps.calculations.services import AWJCalculationService
+        from backend.apps.calculations.toolpath import consumption_cost
+
+        monkeypatch.setitem(AWJCalculationService.DEFAULT_PRICES, 'water_cost_per_m3', 80.0)
+        cost = consumption_cost({'abrasive_kg': 2.0, 'water_m3': 0.5, 'energy_kwh': 10.0}, {})
+
+        assert cost['water'] == 40.0
+        assert cost['abrasive'] == 2.0 * AWJCalculationService.DEFAULT_PRICES['abrasive_cost_per_kg']
+
+
+class TestDefaultPrices:
+    """Výchozí ceny mají jediný zdroj - AWJCalculationService.DEFAULT_PRICES"""
+
+    def test_cost_per_meter_and_engine_follow_service(self, monkeypatch):
+        from backend.apps.calculations.optimizer import AWJOptimizationEngine
+        from backend.apps.calculations.services import AWJCalculationService
+
+        monkeypatch.setitem(AWJCalculationService.DEFAULT_PRICES, 'abrasive_cost_per_kg', 50.0)
+        kwargs = {'abrasive_flow': 8.0, 'cutting_speed': 100.0, 'water_flow': 3.5, 'hydraulic_power': 20.0}
+        explicit = dict(abrasive_cost_per_kg=50.0, water_cost_per_m3=100.0, power_cost_per_kwh=4.0)
+
+        assert AWJCalculationService.calculate_cost_per_meter(**kwargs) == \
+            AWJCalculationService.calculate_cost_per_meter(**kwargs, **explicit)
+        engine = AWJOptimizationEngine('steel', 10)
+        assert engine.abrasive_cost_per_kg == 50.0
+        assert AWJOptimizationEngine('steel', 10, abrasive_cost_per_kg=0.0).abrasive_cost_per_kg == 0.0
+
+    def test_cache_defaults_follow_service(self):
+        from backend.apps.calculations.cache import DEFAULTS
+        from backend.apps.calculations.services import AWJCalculationService
+
+        for name, value in AWJCalculationService.DEFAULT_PRICES.items():
+            assert DEFAULTS[name] == value
+
+
+class TestBenchmarkCommand:
+    """Smoke test regresní brány awj_benchmark (jeden malý případ)"""
+
+    ARGS = ['--filter', 'service.batch_10', '--max-batch', '10']
+
+    def _run(self, *args):
+        from io import StringIO
+        from django.core.management import call_command
+        stdout, stderr = StringIO(), StringIO()
+        call_command('awj_benchmark', *self.ARGS, *args, stdout=stdout, stderr=stderr)
+        return stdout.getvalue(), stderr.getvalue()
+
+    def test_baseline_comparison(self, tmp_path):
+        from django.core.management.base import CommandError
+        from backend.apps.calculations.benchmarks import load_json, save_json
+
+        path = str(tmp_path / 'baseline.json')
+        stdout, _ = self._run('--save-baseline', path)
+        baseline = load_json(path)
+        assert [r['name'] for r in baseline['results']] == ['service.batch_10']
+        assert 'Baseline uložena' in stdout
+
+        # Pomalejší baseline = bez regrese
+        baseline['results'][0]['median_s'] *= 100
+        save_json(path, baseline)
+        stdout, stderr = self._run('--baseline', path)
+        assert 'Bez regresí vůči baseline' in stdout
+        assert stderr == ''
+
+        # Nereálně rychlá baseline z jiného prostředí = regrese a varování
+        baseline['results'][0]['median_s'] = 1e-12
+        baseline['environment'] = {'python': 'jiný'}
+        save_json(path, baseline)
+        with pytest.raises(CommandError, match='1 případů překročilo práh'):
+            self._run('--baseline', path)
+
+    def test_committed_baseline_covers_default_cases(self):
+        """benchmarks/baseline.json obsahuje všechny výchozí případy"""
+        from pathlib import Path
+        from django.conf import settings
+        from backend.apps.calculations.benchmarks import default_cases, load_json
+
+        baseline = load_json(Path(settings.BASE_DIR) / 'benchmarks' / 'baseline.json')
+        names = {result['name'] for result in baseline['results']}
+        assert names == {case.name for case in default_cases()}
+        assert all(result['median_s'] > 0 for result in baseline['results'])
+
+
+class TestDecimate:
+    """Min/max decimace průběhů analýzy"""
+
+    @staticmethod
+    def _profile(size=1001, max_points=50):
+        import numpy as np
+        from backend.apps.analysis.services import decimate
+
+        axis = np.linspace(0.0, 20.0, size)
+        column = np.sin(axis * 3.0) + 0.01 * axis
+        series = {'force': column, 'index': np.arange(size, dtype=float)}
+        return axis, column, decimate(axis, series, max_points)
+
+    def test_buckets_keep_min_max(self):
+        """Minimum a maximum každého úseku odpovídá jeho řezu vstupem"""
+        _, column, result = self._profile()
+        # Průběh indexů prozradí hranice úseků: min = první, max = poslední index
+        first = [int(value) for value in result['series']['index']['min']]
+        last = [int(value) for value in result['series']['index']['max']]
+
+        assert result['decimated'] is True
+        assert first[0] == 0 and last[-1] == len(column) - 1
+        assert first[1:] == [end + 1 for end in last[:-1]]
+        for start, end, low, high in zip(
+            first, last, result['series']['force']['min'], result['series']['force']['max']
+        ):
+            assert low == column[start:end + 1].min()
+            assert high == column[start:end + 1].max()
+
+    def test_end_points_kept(self):
+        """Osa i průběhy začínají a končí přesně na krajích vstupu"""
+        axis, column, result = self._profile()
+        force = result['series']['force']
+        assert result['axis'][0] == axis[0] and result['axis'][-1] == axis[-1]
+        assert force['min'][0] == force['max'][0] == column[0]
+        assert force['min'][-1] == force['max'][-1] == column[-1]
+
+    @pytest.mark.parametrize("size,max_points", [(1001, 3), (1001, 50), (10, 9), (5, 10)])
+    def test_length_within_limit(self, size, max_points):
+        """Odpověď nemá víc bodů, než bylo požadováno"""
+        _, _, result = self._profile(size, max_points)
+        assert len(result['axis']) == result['buckets'] <= max_points
+        assert len(result['series']['force']['min']) == len(result['axis'])
+
+
+class TestPlannerSchedule:
+    """Rozvrh dávek plánovače na více strojích"""
+
+    @staticmethod
+    def _whole(durations, quantities, groups, machines, setup_time):
+        """Makespan LPT rozvrhu celých dílů (bez dělení)"""
+        from backend.apps.calculations.planner import _assign
+
+        length = durations * quantities
+        _, _, loads = _assign(length, groups, int(groups.max()) + 1, machines, setup_time)
+        return float(loads.max(initial=0.0))
+
+    def test_setup_prevents_unprofitable_split(self):
+        """Dva díly na dvou strojích - přestavba 300 s se dělením nevyplatí"""
+        import numpy as np
+        from backend.apps.calculations.planner import schedule
+
+        durations, quantities, groups = np.array([8.0, 6.0]), np.array([10, 4]), np.array([0, 1])
+        result = schedule(durations, quantities, groups, 2, 300.0)
+
+        assert result['part'].tolist() == [0, 1]
+        assert float(result['load'].max()) == 300.0 + 80.0
+        # Bez přestavby se dlouhý díl dál dělí
+        assert schedule(durations, quantities, groups, 2, 0.0)['part'].size == 3
+
+    def test_plan_not_longer_than_unsplit(self):
+        """Makespan plánu nepřesáhne rozvrh celých dílů"""
+        import numpy as np
+        from backend.apps.calculations.planner import SETTING_DEFAULTS, plan
+
+        parts = {
+            'material_type': np.array(['steel', 'aluminum']),
+            'thickness': np.array([10.0, 5.0]),
+            'cut_length': np.array([400.0, 250.0]),
+            'pierces': np.array([2, 1]),
+            'rapid_length': np.array([100.0, 50.0]),
+            'max_roughness': np.array([np.nan, np.nan]),
+            'quantity': np.array([12, 5]),
+        }
+        candidates = {
+            'pressure': np.array([380.0]),
+            **{name: np.array([value]) for name, value in SETTING_DEFAULTS.items()},
+        }
+        prices = {'abrasive_cost_per_kg': 0.5, 'water_cost_per_m3': 3.0, 'power_cost_per_kwh': 0.15}
+
+        result = plan(parts, candidates, prices, machines=2, setup_time=300.0)
+        unit_time = np.array([part['unit_time'] for part in result['parts']])
+        whole = self._whole(unit_time, parts['quantity'], np.array([1, 0]), 2, 300.0)
+
+        assert result['makespan'] <= round(whole, 3) + 1e-3
+        assert result['makespan'] >= result['lower_bound']
+
+    @pytest.mark.parametrize("machines,setup_time", [(1, 0.0), (3, 0.0), (3, 60.0), (8, 300.0)])
+    def test_makespan_lower_bound(self, machines, setup_time):
+        """Makespan je aspoň průměrné zatížení stroje i nejdelší kus"""
+        import numpy as np
+        from backend.apps.calculations.planner import schedule
+
+        rng = np.random.default_rng(machines)
+        durations = rng.uniform(5.0, 120.0, 20)
+        quantities = rng.integers(1, 30, 20)
+        groups = rng.integers(0, 4, 20)
+        result = schedule(durations, quantities, groups, machines, setup_time)
+        makespan = float(result['load'].max())
+
+        assert makespan >= max((durations * quantities).sum() / machines, durations.max()) - 1e-9
+        assert makespan <= self._whole(durations, quantities, groups, machines, setup_time) + 1e-9
+        # Každý kus je v rozvrhu právě jednou a konce dávek odpovídají zatížení strojů
+        assert np.bincount(result['part'], weights=result['quantity'], minlength=20).tolist() == quantities.tolist()
+        for m in range(machines):
+            ends = result['end'][result['machine'] == m]
+            assert np.isclose(ends.max(initial=0.0), result['load'][m])